@@ -1,17 +1,47 @@
 import os
 import hashlib
 import datetime
-from shutil import copyfile
-from app.db.database_init import DB_PATH, get_data_dir
+import shutil
+import sqlite3
+from app.db.database_init import checkpoint_scheduler, db, get_data_dir, initialize_database
+from app.models.audit_archive import ARCHIVE_DIR, audit_archiver
+from app.models.audit_log_writer import audit_writer
+from app.models.audit_stock_backfill import audit_stock_backfiller
 
 class BackupController:
     BACKUP_DIR = os.path.join(get_data_dir(), "backups")
     HASH_FILE = os.path.join(get_data_dir(), ".last_db_hash")
 
     @classmethod
-    def _calculate_db_hash(cls):
+    def _snapshot(cls, path):
+        # SQLite's online backup copies one consistent state of the database,
+        # including commits still in app.db-wal, while other threads keep
+        # writing and checkpointing. Copying app.db itself could miss those
+        # commits or catch a checkpoint half way through.
+        target = sqlite3.connect(path)
+        try:
+            with db.connection() as conn:
+                conn.backup(target)
+        finally:
+            target.close()
+
+    @classmethod
+    def _archive_path(cls, backup_path):
+        # Archived audit months are kept next to the backup they belong to.
+        return os.path.splitext(backup_path)[0] + "_audit_archive"
+
+    @classmethod
+    def _copy_archive(cls, backup_path):
+        # Runs after the snapshot: the archiver writes a month's file before
+        # deleting its rows, so every row missing from the snapshot is in the
+        # copy. Rows in both are skipped when that month is archived again.
+        if os.path.isdir(ARCHIVE_DIR) and os.listdir(ARCHIVE_DIR):
+            shutil.copytree(ARCHIVE_DIR, cls._archive_path(backup_path))
+
+    @classmethod
+    def _calculate_db_hash(cls, path):
         h = hashlib.sha256()
-        with open(DB_PATH, "rb") as f:
+        with open(path, "rb") as f:
             for chunk in iter(lambda: f.read(4096), b""):
                 h.update(chunk)
         return h.hexdigest()
@@ -39,20 +69,13 @@ class BackupController:
         filename = f"inventory_{ts}.db"
         path = os.path.join(cls.BACKUP_DIR, filename)
 
-        copyfile(DB_PATH, path)
+        cls._snapshot(path)
+        cls._copy_archive(path)
         return path
     
     @classmethod
     def backup_if_changed(cls):
         os.makedirs(get_data_dir(), exist_ok=True)
-        current_hash = cls._calculate_db_hash()
-        last_hash = cls._load_last_hash()
-
-        if current_hash == last_hash:
-            # No DB changes → skip backup
-            return None
-
-        # DB changed → backup
         if not os.path.exists(cls.BACKUP_DIR):
             os.makedirs(cls.BACKUP_DIR)
 
@@ -61,14 +84,69 @@ class BackupController:
             cls.BACKUP_DIR, f"inventory_{ts}.db"
         )
 
-        copyfile(DB_PATH, backup_path)
+        # Hash the snapshot, not the live file: app.db alone does not hold
+        # the commits still in the WAL.
+        tmp = backup_path + ".tmp"
+        cls._snapshot(tmp)
+        current_hash = cls._calculate_db_hash(tmp)
+        last_hash = cls._load_last_hash()
+
+        if current_hash == last_hash:
+            # No DB changes → skip backup
+            os.remove(tmp)
+            return None
+
+        # DB changed → keep the backup
+        os.replace(tmp, backup_path)
+        cls._copy_archive(backup_path)
         cls._save_last_hash(current_hash)
 
         return backup_path
 
     @classmethod
     def restore_backup(cls, backup_path):
-        copyfile(backup_path, DB_PATH)
+        # The background threads stop first, so none writes or checkpoints
+        # while the database is replaced. The backup API then rewrites
+        # app.db in place under SQLite's own locking, so connections other
+        # threads hold stay valid and simply see the restored data. The
+        # archiver and the stock backfill run once per start and are not
+        # restarted; a backfill the restored database needs runs at the next
+        # start.
+        audit_archiver.stop()
+        audit_stock_backfiller.stop()
+        writer_running = audit_writer.is_running()
+        scheduler_running = checkpoint_scheduler.is_running()
+        audit_writer.stop()
+        checkpoint_scheduler.stop(final_checkpoint=False)
+        try:
+            source = sqlite3.connect(backup_path)
+            try:
+                with db.connection() as conn:
+                    source.backup(conn)
+            finally:
+                source.close()
+            # An older backup may predate the current schema.
+            initialize_database()
+            cls._restore_archive(backup_path)
+        finally:
+            if scheduler_running:
+                checkpoint_scheduler.start()
+            if writer_running:
+                audit_writer.start()
+
+    @classmethod
+    def _restore_archive(cls, backup_path):
+        # The archive must match the restored AuditLogs: the restored
+        # database reuses audit ids the current archive may already hold.
+        # The current archive is set aside rather than deleted, as backups
+        # taken before archives were included have none.
+        if os.path.isdir(ARCHIVE_DIR):
+            ts = datetime.datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+            os.replace(ARCHIVE_DIR, f"{ARCHIVE_DIR}_before_restore_{ts}")
+        archive = cls._archive_path(backup_path)
+        if os.path.isdir(archive):
+            # Fresh modification times, so no cached month is reused.
+            shutil.copytree(archive, ARCHIVE_DIR, copy_function=shutil.copy)
 
     # Placeholder for future online backup
     @classmethod
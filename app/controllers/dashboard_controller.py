@@ -1,7 +1,6 @@
 from app.models.shop_model import ShopModel
 from app.models.product_model import ProductModel
-from app.models.purchase_model import PurchaseModel
-from app.models.sale_model import SaleModel
+from app.utils.money import divide_cents
 
 class DashboardController:
     def __init__(self):
@@ -10,17 +9,16 @@ class DashboardController:
     def get_shops(self):
         return ShopModel.get_all()
 
-    def get_products_for_shop(self, shop_id):
-        products = ProductModel.get_by_shop(shop_id)
+    def get_products_for_shop(self, shop_id, product_ids=None):
+        products = ProductModel.get_shop_summary(shop_id, product_ids)
 
         enriched = []
 
         for p in products:
-            pid = p["product_id"]
-
-            avg_cost = PurchaseModel.avg_price(pid, shop_id)
-            last_purchase = PurchaseModel.last_price(pid, shop_id)
-            last_sale = SaleModel.last_price(pid, shop_id)
+            total_qty = p["total_qty"]
+            avg_cost = divide_cents(p["total_cost_cents"], total_qty) if total_qty else None
+            last_purchase = p["last_purchase_cents"]
+            last_sale = p["last_sale_cents"]
 
             if last_purchase is None or last_sale is None:
                 profit = None
@@ -28,13 +26,13 @@ class DashboardController:
                 profit = last_sale - last_purchase
 
             enriched.append({
-                "product_id": pid,
+                "product_id": p["product_id"],
                 "product_name": p["product_name"],
                 "quantity": p["quantity"],
-                "avg_cost": avg_cost,
-                "last_purchase": last_purchase,
-                "last_sale": last_sale,
-                "profit": profit
+                "avg_cost_cents": avg_cost,
+                "last_purchase_cents": last_purchase,
+                "last_sale_cents": last_sale,
+                "profit_cents": profit
             })
 
         return enriched
@@ -0,0 +1,102 @@
+import csv
+import os
+from app.models.sale_model import SaleModel, format_sale_date
+from app.models.profit_report_model import ProfitReportModel
+from app.models.weekly_profit_model import WeeklyProfitModel
+from app.utils.money import format_money
+
+EXPORT_CHUNK_SIZE = 1000
+
+
+class ExportCancelled(Exception):
+    pass
+
+
+class ExportController:
+    # CSV exports read straight from the database for the given filters, not
+    # from what a window is showing. Rows arrive in fetchmany() chunks and are
+    # written as they come, so memory stays bounded by the chunk size however
+    # long the range. progress(written, total) is called after every chunk
+    # (total is None when unknown up front); cancelled() is polled between
+    # chunks and stops the export with ExportCancelled.
+
+    @staticmethod
+    def write_csv(path, header, chunks, format_row, total=None, progress=None, cancelled=None):
+        # Rows go to a sibling .part file that replaces `path` only once
+        # complete, so a failed or cancelled export never leaves a truncated
+        # CSV behind or clobbers an earlier good one.
+        tmp_path = path + ".part"
+        written = 0
+        try:
+            with open(tmp_path, "w", newline="", encoding="utf-8") as f:
+                writer = csv.writer(f)
+                writer.writerow(header)
+                for chunk in chunks:
+                    if cancelled and cancelled():
+                        raise ExportCancelled()
+                    writer.writerows(format_row(row) for row in chunk)
+                    written += len(chunk)
+                    if progress:
+                        progress(written, total)
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+        finally:
+            # Release the cursor now rather than whenever the generator is
+            # collected.
+            chunks.close()
+        return written
+
+    @staticmethod
+    def export_sales(path, shop_id, start_date, end_date, progress=None, cancelled=None):
+        return ExportController.write_csv(
+            path,
+            ["sale_id", "date", "grand_total"],
+            SaleModel.iter_sales(shop_id, start_date, end_date, EXPORT_CHUNK_SIZE),
+            lambda r: (r[0], format_sale_date(r[1]), format_money(r[2])),
+            total=SaleModel.count_sales(shop_id, start_date, end_date),
+            progress=progress,
+            cancelled=cancelled,
+        )
+
+    @staticmethod
+    def export_profit_report(path, shop_id, start_date, end_date, progress=None, cancelled=None):
+        return ExportController.write_csv(
+            path,
+            [
+                "product_id", "product_name", "qty_sold", "sale_total",
+                "purchase_cost", "profit_per_unit", "total_profit"
+            ],
+            ProfitReportModel.iter_profit_report(shop_id, start_date, end_date, EXPORT_CHUNK_SIZE),
+            lambda item: (
+                item["product_id"],
+                item["product_name"],
+                item["qty_sold"],
+                format_money(item["sale_total_cents"]),
+                format_money(item["purchase_cost_cents"]),
+                format_money(item["profit_per_unit_cents"]),
+                format_money(item["total_profit_cents"]),
+            ),
+            progress=progress,
+            cancelled=cancelled,
+        )
+
+    @staticmethod
+    def export_weekly_profit(path, shop_id, start_date, end_date, progress=None, cancelled=None):
+        return ExportController.write_csv(
+            path,
+            ["week", "total_sales", "purchase_cost", "profit"],
+            WeeklyProfitModel.iter_weekly_profit(shop_id, start_date, end_date, EXPORT_CHUNK_SIZE),
+            lambda row: (
+                row["week"],
+                format_money(row["total_sales_cents"]),
+                format_money(row["purchase_cost_cents"]),
+                format_money(row["profit_cents"]),
+            ),
+            progress=progress,
+            cancelled=cancelled,
+        )
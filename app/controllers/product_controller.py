@@ -1,6 +1,9 @@
+from app.db.database_init import db
 from app.models.product_model import ProductModel
 from app.models.shop_model import ShopModel
 from app.models.stock_model import StockModel
+from app.models.audit_log_model import AuditLogModel
+from app.utils.event_bus import bus, PRODUCTS_CREATED, PRODUCT_RENAMED, STOCK_CHANGED
 
 class ProductController:
 
@@ -13,4 +16,37 @@ class ProductController:
         for sid in selected_shop_ids:
             StockModel.create(product_id, sid, 0)
 
+        for sid in selected_shop_ids:
+            bus.publish(PRODUCTS_CREATED, shop_id=sid, product_ids=[product_id])
         return product_id
+
+    def rename_product(self, product_id, name):
+        name = name.strip()
+        if not name:
+            raise ValueError("Product name is required.")
+        if ProductModel.exists_name(name, exclude_product_id=product_id):
+            raise ValueError("A product with this name already exists.")
+
+        ProductModel.update_name(product_id, name)
+        bus.publish(PRODUCT_RENAMED, product_id=product_id, name=name)
+
+    def adjust_stock(self, product_id, shop_id, product_name, new_qty, actor=None):
+        actor = actor or {}
+        with db.transaction(immediate=True) as conn:
+            old_qty = StockModel.get_quantity(product_id, shop_id)
+            StockModel.set_quantity(product_id, shop_id, new_qty)
+            AuditLogModel.create_with_cursor(
+                conn.cursor(),
+                action="STOCK_ADJUST",
+                entity_type="Stock",
+                shop_id=shop_id,
+                product_id=product_id,
+                user_id=actor.get("user_id"),
+                username=actor.get("username"),
+                details=f"{product_name}: {old_qty} -> {new_qty}",
+                stock_before=old_qty,
+                stock_after=new_qty,
+            )
+
+        bus.publish(STOCK_CHANGED, shop_id=shop_id, product_ids=[product_id])
+        return old_qty
@@ -1,17 +1,29 @@
-import sqlite3
 from app.models.shop_model import ShopModel
 from app.models.product_model import ProductModel
 from app.models.stock_model import StockModel
 from app.models.purchase_model import PurchaseModel
 from app.models.audit_log_model import AuditLogModel
-from app.db.database_init import get_connection
+from app.db.database_init import db
+from app.utils.money import format_money
+from app.utils.event_bus import bus, PRODUCTS_CREATED, STOCK_CHANGED, PRICES_CHANGED
 
 class PurchaseController:
+    # Row observers get incremental notifications as the purchase lines
+    # change: row_inserted(row), row_updated(row) and row_removed(row).
+    # A line's price_cents stays None until a price is entered.
 
     def __init__(self, actor=None):
         self.rows = []
+        self._observers = []
         self.actor = actor or {}
 
+    def add_row_observer(self, observer):
+        self._observers.append(observer)
+
+    def _notify(self, event, *args):
+        for observer in self._observers:
+            getattr(observer, event)(*args)
+
     def get_shops(self):
         return ShopModel.get_all()
 
@@ -26,19 +38,29 @@ class PurchaseController:
                 return pid
         return None
 
-    def add_row(self, name, qty, price):
+    def add_row(self, name="", qty=1, price_cents=None):
         self.rows.append({
             "name": name.strip(),
             "qty": qty,
-            "price": price
+            "price_cents": price_cents
         })
+        self._notify("row_inserted", len(self.rows) - 1)
+
+    def update_row(self, index, **fields):
+        if 0 <= index < len(self.rows):
+            self.rows[index].update(fields)
+            self._notify("row_updated", index)
 
     def remove_row(self, index):
         if 0 <= index < len(self.rows):
             self.rows.pop(index)
+            self._notify("row_removed", index)
 
     def calculate_totals(self):
-        return sum(r["qty"] * r["price"] for r in self.rows)
+        return sum(
+            r["qty"] * r["price_cents"]
+            for r in self.rows if r["price_cents"] is not None
+        )
 
     def get_rows(self):
         return self.rows
@@ -47,20 +69,24 @@ class PurchaseController:
         if not self.rows:
             raise ValueError("No purchase rows added.")
 
-        conn = get_connection()
-        cur = conn.cursor()
+        # Products without a Stock row yet are new to this shop's grid.
+        new_in_shop = set()
+        restocked = set()
+        with db.transaction() as conn:
+            cur = conn.cursor()
 
-        try:
             for row in self.rows:
                 name = row["name"].strip()
                 qty = int(row["qty"])
-                price = float(row["price"])
+                if row["price_cents"] is None:
+                    raise ValueError("Price is required.")
+                price_cents = int(row["price_cents"])
 
                 if not name:
                     raise ValueError("Product name is required.")
                 if qty <= 0:
                     raise ValueError("Quantity must be greater than 0.")
-                if price < 0:
+                if price_cents < 0:
                     raise ValueError("Price cannot be negative.")
 
                 cur.execute(
@@ -87,9 +113,10 @@ class PurchaseController:
                 )
                 stock_row = cur.fetchone()
                 old_stock = stock_row[0] if stock_row else 0
+                (new_in_shop if stock_row is None else restocked).add(product_id)
 
                 purchase_id = PurchaseModel.create_with_cursor(
-                    cur, product_id, shop_id, qty, price
+                    cur, product_id, shop_id, qty, price_cents
                 )
                 StockModel.increase_with_cursor(
                     cur, product_id, shop_id, qty
@@ -106,19 +133,19 @@ class PurchaseController:
                     user_id=self.actor.get("user_id"),
                     username=self.actor.get("username"),
                     details=(
-                        f"{name}: qty={qty}, unit_price={price:.2f}, "
+                        f"{name}: qty={qty}, unit_price={format_money(price_cents)}, "
                         f"stock {old_stock} -> {new_stock}"
                     ),
+                    qty=qty,
+                    unit_price_cents=price_cents,
+                    stock_before=old_stock,
+                    stock_after=new_stock,
                 )
 
-            conn.commit()
-        except (ValueError, sqlite3.IntegrityError):
-            conn.rollback()
-            raise
-        except Exception:
-            conn.rollback()
-            raise
-        finally:
-            conn.close()
-
+        restocked -= new_in_shop
+        if new_in_shop:
+            bus.publish(PRODUCTS_CREATED, shop_id=shop_id, product_ids=sorted(new_in_shop))
+        if restocked:
+            bus.publish(STOCK_CHANGED, shop_id=shop_id, product_ids=sorted(restocked))
+            bus.publish(PRICES_CHANGED, shop_id=shop_id, product_ids=sorted(restocked))
         return True
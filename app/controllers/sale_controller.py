@@ -1,68 +1,92 @@
 from app.models.shop_model import ShopModel
 from app.models.product_model import ProductModel
 from app.models.sale_model import SaleModel
-from app.models.stock_model import StockModel
+from app.utils.event_bus import bus, STOCK_CHANGED, PRICES_CHANGED
 from datetime import datetime
 
 
 class SaleController:
+    # Cart observers get incremental notifications as the cart changes:
+    # cart_inserted(row), cart_updated(row), cart_removed(row) and
+    # cart_reset(). Lines are found by product_id through `_line_of`.
+
     def __init__(self, actor=None):
         self.cart = []
+        self._line_of = {}
+        self._total_cents = 0
+        self._observers = []
         self.actor = actor or {}
 
+    def add_cart_observer(self, observer):
+        self._observers.append(observer)
+
+    def _notify(self, event, *args):
+        for observer in self._observers:
+            getattr(observer, event)(*args)
+
     def get_shops(self):
         return ShopModel.get_all()
 
     def get_products_for_shop(self, shop_id):
         return ProductModel.get_by_shop(shop_id)
 
-    def add_to_cart(self, product_id, name, price, qty, stock):
+    def add_to_cart(self, product_id, name, price_cents, qty, stock):
         if qty <= 0:
             raise ValueError("Quantity must be greater than 0")
-        if price <= 0:
+        if price_cents <= 0:
             raise ValueError("Sale price must be greater than 0")
         if qty > stock:
             raise ValueError("Not enough stock")
 
-        for item in self.cart:
-            if item["product_id"] == product_id:
-                new_qty = item["qty"] + qty
-                if new_qty > stock:
-                    raise ValueError("Not enough stock")
-                item["qty"] = new_qty
-                item["subtotal"] = item["qty"] * item["price"]
-                return
+        row = self._line_of.get(product_id)
+        if row is not None:
+            item = self.cart[row]
+            new_qty = item["qty"] + qty
+            if new_qty > stock:
+                raise ValueError("Not enough stock")
+            item["qty"] = new_qty
+            self._total_cents -= item["subtotal_cents"]
+            item["subtotal_cents"] = item["qty"] * item["price_cents"]
+            self._total_cents += item["subtotal_cents"]
+            self._notify("cart_updated", row)
+            return
 
         self.cart.append({
             "product_id": product_id,
             "name": name,
-            "price": price,
+            "price_cents": price_cents,
             "qty": qty,
-            "subtotal": price * qty
+            "subtotal_cents": price_cents * qty
         })
+        self._line_of[product_id] = len(self.cart) - 1
+        self._total_cents += price_cents * qty
+        self._notify("cart_inserted", len(self.cart) - 1)
 
     def remove_from_cart(self, index):
         if 0 <= index < len(self.cart):
-            self.cart.pop(index)
+            item = self.cart.pop(index)
+            del self._line_of[item["product_id"]]
+            for row in range(index, len(self.cart)):
+                self._line_of[self.cart[row]["product_id"]] = row
+            self._total_cents -= item["subtotal_cents"]
+            self._notify("cart_removed", index)
 
     def clear_cart(self):
         self.cart.clear()
+        self._line_of.clear()
+        self._total_cents = 0
+        self._notify("cart_reset")
 
     def get_cart(self):
         return self.cart
 
     def get_total(self):
-        return sum(i["subtotal"] for i in self.cart)
+        return self._total_cents
 
     def save_sale(self, shop_id):
         if not self.cart:
             raise ValueError("Cart is empty")
 
-        for item in self.cart:
-            current = StockModel.get_quantity(item["product_id"], shop_id)
-            if item["qty"] > current:
-                raise ValueError(f"Insufficient stock for {item['name']}")
-
         sale_id = SaleModel.create_sale(
             shop_id=shop_id,
             date=datetime.now().isoformat(),
@@ -70,5 +94,8 @@ class SaleController:
             actor=self.actor,
         )
 
+        product_ids = [item["product_id"] for item in self.cart]
         self.clear_cart()
+        bus.publish(STOCK_CHANGED, shop_id=shop_id, product_ids=product_ids)
+        bus.publish(PRICES_CHANGED, shop_id=shop_id, product_ids=product_ids)
         return sale_id
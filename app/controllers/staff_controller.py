@@ -1,5 +1,5 @@
 from app.models.user_model import UserModel
-from app.models.audit_log_model import AuditLogModel
+from app.models.audit_log_writer import audit_writer
 
 class StaffController:
     def __init__(self, actor=None):
@@ -35,7 +35,7 @@ class StaffController:
             created_user_id,
             UserModel.DEFAULT_STAFF_PERMISSIONS
         )
-        AuditLogModel.log(
+        audit_writer.log(
             action="USER_CREATE",
             entity_type="User",
             entity_id=created_user_id,
@@ -43,7 +43,7 @@ class StaffController:
             username=self._actor_name(),
             details=f"Created staff account '{username}'",
         )
-        AuditLogModel.log(
+        audit_writer.log(
             action="STAFF_PERMISSIONS_UPDATE",
             entity_type="User",
             entity_id=created_user_id,
@@ -65,7 +65,7 @@ class StaffController:
         target = self.model.get_by_id(staff_id)
         self.model.deactivate_user(staff_id)
         target_name = target["username"] if target else f"user_id={staff_id}"
-        AuditLogModel.log(
+        audit_writer.log(
             action="USER_DEACTIVATE",
             entity_type="User",
             entity_id=staff_id,
@@ -81,7 +81,7 @@ class StaffController:
         self.model.update_password(staff_id, hashed)
         target = self.model.get_by_id(staff_id)
         target_name = target["username"] if target else f"user_id={staff_id}"
-        AuditLogModel.log(
+        audit_writer.log(
             action="USER_PASSWORD_RESET",
             entity_type="User",
             entity_id=staff_id,
@@ -107,7 +107,7 @@ class StaffController:
         old = self.model.get_permissions(staff_id)
         updated = self.model.set_permissions(staff_id, permissions)
         target_name = target["username"]
-        AuditLogModel.log(
+        audit_writer.log(
             action="STAFF_PERMISSIONS_UPDATE",
             entity_type="User",
             entity_id=staff_id,
@@ -0,0 +1,63 @@
+import threading
+import time
+
+
+class CheckpointScheduler:
+    # Background WAL maintenance. While the app is busy a PASSIVE checkpoint
+    # runs once the WAL grows past threshold_bytes (it never blocks readers
+    # or writers); after idle_seconds without database activity a TRUNCATE
+    # checkpoint folds the WAL back into app.db and resets it to zero bytes.
+
+    def __init__(self, manager, interval=30, threshold_bytes=4 * 1024 * 1024, idle_seconds=60):
+        self.manager = manager
+        self.interval = interval
+        self.threshold_bytes = threshold_bytes
+        self.idle_seconds = idle_seconds
+        self.last_result = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="wal-checkpoint", daemon=True
+        )
+        self._thread.start()
+
+    def is_running(self):
+        return self._thread is not None
+
+    def stop(self, final_checkpoint=True):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if final_checkpoint and self.manager.is_wal():
+            self.last_result = self.manager.checkpoint("TRUNCATE")
+        self.manager.close_thread()
+
+    def run_once(self):
+        wal_bytes = self.manager.wal_size()
+        if wal_bytes == 0:
+            return None
+
+        idle_for = time.monotonic() - self.manager.last_activity
+        if idle_for >= self.idle_seconds:
+            mode = "TRUNCATE"
+        elif wal_bytes >= self.threshold_bytes:
+            mode = "PASSIVE"
+        else:
+            return None
+
+        self.last_result = self.manager.checkpoint(mode)
+        return self.last_result
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.run_once()
+            except Exception as e:
+                print(f"WAL checkpoint failed: {e}")
+        self.manager.close_thread()
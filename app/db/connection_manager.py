@@ -0,0 +1,209 @@
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from app.db.pragma_profile import apply_pragmas
+
+
+class _ThreadState:
+    __slots__ = ("conn", "generation", "depth", "on_commit", "users")
+
+    def __init__(self, conn, generation):
+        self.conn = conn
+        self.generation = generation
+        self.depth = 0
+        self.on_commit = []
+        self.users = 1
+
+
+class ConnectionManager:
+    # Keeps one long-lived SQLite connection per thread. Connections are keyed
+    # by thread id rather than threading.local so that Qt pool threads, whose
+    # Python thread state can be torn down between tasks, still reuse theirs.
+
+    def __init__(self, db_path, pragmas=None):
+        self.db_path = db_path
+        self.pragmas = dict(pragmas or {})
+        self.last_activity = time.monotonic()
+        self._lock = threading.Lock()
+        self._states = {}
+        self._generation = 0
+        self._opened = 0
+        self._reused = 0
+        self._commits = 0
+        self._rollbacks = 0
+
+    def _open(self):
+        conn = sqlite3.connect(
+            self.db_path,
+            isolation_level=None,
+            check_same_thread=False,
+        )
+        conn.execute("PRAGMA foreign_keys = ON")
+        apply_pragmas(conn, self.pragmas)
+        return conn
+
+    def _state(self, track=True):
+        # The calling thread's connection, marked in use until _release().
+        if track:
+            self.last_activity = time.monotonic()
+        ident = threading.get_ident()
+        with self._lock:
+            state = self._states.get(ident)
+            if state is not None and state.generation == self._generation:
+                self._reused += 1
+                state.users += 1
+                return state
+            generation = self._generation
+
+        conn = self._open()
+        state = _ThreadState(conn, generation)
+        with self._lock:
+            self._states[ident] = state
+            self._opened += 1
+        return state
+
+    def _release(self, state):
+        # A connection close_all() skipped because it was in use is closed
+        # by its own thread once that thread is done with it.
+        with self._lock:
+            state.users -= 1
+            stale = state.users == 0 and state.generation != self._generation
+        if stale:
+            state.conn.close()
+
+    @contextmanager
+    def connection(self, row_factory=None):
+        state = self._state()
+        conn = state.conn
+        previous = conn.row_factory
+        conn.row_factory = row_factory
+        try:
+            yield conn
+        finally:
+            conn.row_factory = previous
+            self._release(state)
+
+    @contextmanager
+    def transaction(self, row_factory=None, immediate=True):
+        # Transactions take the write lock up front (BEGIN IMMEDIATE), where
+        # busy_timeout applies. A deferred BEGIN that reads and then writes
+        # fails at once with "database is locked" under WAL if another
+        # connection committed in between, whatever the timeout. Pass
+        # immediate=False only for read-only transactions.
+        state = self._state()
+        conn = state.conn
+        previous = conn.row_factory
+        conn.row_factory = row_factory
+
+        try:
+            if state.depth == 0:
+                conn.execute("BEGIN IMMEDIATE" if immediate else "BEGIN")
+                state.on_commit = []
+            else:
+                conn.execute(f"SAVEPOINT sp_{state.depth}")
+        except BaseException:
+            conn.row_factory = previous
+            self._release(state)
+            raise
+        state.depth += 1
+        pending = len(state.on_commit)
+
+        try:
+            yield conn
+        except BaseException:
+            state.depth -= 1
+            del state.on_commit[pending:]
+            if state.depth == 0:
+                conn.rollback()
+                with self._lock:
+                    self._rollbacks += 1
+            else:
+                conn.execute(f"ROLLBACK TO sp_{state.depth}")
+                conn.execute(f"RELEASE sp_{state.depth}")
+            raise
+        else:
+            state.depth -= 1
+            if state.depth == 0:
+                callbacks, state.on_commit = state.on_commit, []
+                conn.commit()
+                with self._lock:
+                    self._commits += 1
+                for callback in callbacks:
+                    callback()
+            else:
+                conn.execute(f"RELEASE sp_{state.depth}")
+        finally:
+            conn.row_factory = previous
+            self._release(state)
+
+    def after_commit(self, callback):
+        # Runs callback once this thread's transaction commits (at once
+        # outside a transaction). It is dropped if the transaction, or the
+        # savepoint it was registered in, rolls back.
+        with self._lock:
+            state = self._states.get(threading.get_ident())
+        if state is not None and state.depth:
+            state.on_commit.append(callback)
+        else:
+            callback()
+
+    def wal_path(self):
+        return self.db_path + "-wal"
+
+    def wal_size(self):
+        try:
+            return os.path.getsize(self.wal_path())
+        except OSError:
+            return 0
+
+    def is_wal(self):
+        return str(self.pragmas.get("journal_mode", "")).upper() == "WAL"
+
+    def checkpoint(self, mode="PASSIVE"):
+        state = self._state(track=False)
+        try:
+            busy, log_frames, checkpointed = state.conn.execute(
+                f"PRAGMA wal_checkpoint({mode})"
+            ).fetchone()
+        finally:
+            self._release(state)
+        return {
+            "mode": mode,
+            "busy": bool(busy),
+            "wal_frames": log_frames,
+            "checkpointed_frames": checkpointed,
+            "wal_bytes": self.wal_size(),
+        }
+
+    def stats(self):
+        with self._lock:
+            return {
+                "opened": self._opened,
+                "reused": self._reused,
+                "open_now": len(self._states),
+                "commits": self._commits,
+                "rollbacks": self._rollbacks,
+                "wal_bytes": self.wal_size(),
+            }
+
+    def close_thread(self):
+        with self._lock:
+            state = self._states.pop(threading.get_ident(), None)
+        if state is not None:
+            state.conn.close()
+
+    def close_all(self):
+        # Bumping the generation makes every thread reconnect on next use.
+        # Connections another thread is using right now are left to that
+        # thread, which closes its own once it is done with it.
+        with self._lock:
+            states = [state for state in self._states.values() if not state.users]
+            self._states.clear()
+            self._generation += 1
+        for state in states:
+            try:
+                state.conn.close()
+            except sqlite3.ProgrammingError:
+                pass
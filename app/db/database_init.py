@@ -1,8 +1,11 @@
-import sqlite3
 import os
 import sys
 import hashlib
 import secrets
+from app.db.connection_manager import ConnectionManager
+from app.db.checkpoint_scheduler import CheckpointScheduler
+from app.db.migrations import migrate
+from app.db.pragma_profile import get_pragma_profile
 
 # EXE-safe base path
 def get_base_path():
@@ -33,198 +36,17 @@ def hash_password(password: str) -> str:
     return f"pbkdf2_sha256${PBKDF2_ITERATIONS}${salt}${dk.hex()}"
 
 
-def get_connection(row_factory=None):
-    conn = sqlite3.connect(DB_PATH)
-    conn.execute("PRAGMA foreign_keys = ON")
-    if row_factory is not None:
-        conn.row_factory = row_factory
-    return conn
+db = ConnectionManager(DB_PATH, pragmas=get_pragma_profile())
+checkpoint_scheduler = CheckpointScheduler(db)
+
 
 def initialize_database():
     data_dir = get_data_dir()
     os.makedirs(data_dir, exist_ok=True)
     os.makedirs(DB_DIR, exist_ok=True)
-    conn = get_connection()
-    cursor = conn.cursor()
-
-    # Shops
-    cursor.execute("""
-    CREATE TABLE IF NOT EXISTS Shops (
-        shop_id INTEGER PRIMARY KEY AUTOINCREMENT,
-        shop_name TEXT NOT NULL
-    )
-    """)
-
-    # Users
-    cursor.execute("""
-    CREATE TABLE IF NOT EXISTS Users (
-        user_id INTEGER PRIMARY KEY AUTOINCREMENT,
-        username TEXT UNIQUE NOT NULL,
-        password_hash TEXT NOT NULL,
-        role TEXT NOT NULL,
-        status TEXT DEFAULT 'active'
-    )
-    """)
-
-    # Products (master)
-    cursor.execute("""
-    CREATE TABLE IF NOT EXISTS Products (
-        product_id INTEGER PRIMARY KEY AUTOINCREMENT,
-        name TEXT NOT NULL
-    )
-    """)
-
-    # Stock (per shop)
-    cursor.execute("""
-    CREATE TABLE IF NOT EXISTS Stock (
-        stock_id INTEGER PRIMARY KEY AUTOINCREMENT,
-        product_id INTEGER NOT NULL,
-        shop_id INTEGER NOT NULL,
-        quantity INTEGER NOT NULL DEFAULT 0,
-        FOREIGN KEY(product_id) REFERENCES Products(product_id),
-        FOREIGN KEY(shop_id) REFERENCES Shops(shop_id)
-    )
-    """)
-    cursor.execute("""
-    CREATE UNIQUE INDEX IF NOT EXISTS idx_stock_product_shop
-    ON Stock(product_id, shop_id)
-    """)
-
-    # Sales (invoice header)
-    cursor.execute("""
-    CREATE TABLE IF NOT EXISTS Sales (
-        sale_id INTEGER PRIMARY KEY AUTOINCREMENT,
-        shop_id INTEGER NOT NULL,
-        date TEXT NOT NULL,
-        grand_total REAL NOT NULL,
-        FOREIGN KEY(shop_id) REFERENCES Shops(shop_id)
-    )
-    """)
-
-    # SaleItems (invoice lines)
-    cursor.execute("""
-    CREATE TABLE IF NOT EXISTS SaleItems (
-        sale_item_id INTEGER PRIMARY KEY AUTOINCREMENT,
-        sale_id INTEGER NOT NULL,
-        product_id INTEGER NOT NULL,
-        quantity INTEGER NOT NULL,
-        price_per_unit REAL NOT NULL,
-        line_total REAL NOT NULL,
-        FOREIGN KEY(sale_id) REFERENCES Sales(sale_id),
-        FOREIGN KEY(product_id) REFERENCES Products(product_id)
-    )
-    """)
-
-    # Purchases
-    cursor.execute("""
-    CREATE TABLE IF NOT EXISTS Purchases (
-        purchase_id INTEGER PRIMARY KEY AUTOINCREMENT,
-        product_id INTEGER NOT NULL,
-        shop_id INTEGER NOT NULL,
-        quantity INTEGER NOT NULL,
-        price REAL NOT NULL,
-        total REAL NOT NULL,
-        date TEXT NOT NULL,
-        FOREIGN KEY(product_id) REFERENCES Products(product_id),
-        FOREIGN KEY(shop_id) REFERENCES Shops(shop_id)
-    )
-    """)
-
-    # Receipts (paths for generated receipts)
-    cursor.execute("""
-    CREATE TABLE IF NOT EXISTS Receipts (
-        receipt_id INTEGER PRIMARY KEY AUTOINCREMENT,
-        sale_id INTEGER NOT NULL,
-        file_path TEXT NOT NULL,
-        date TEXT NOT NULL,
-        FOREIGN KEY(sale_id) REFERENCES Sales(sale_id)
-    )
-    """)
-
-    # Audit logs
-    cursor.execute("""
-    CREATE TABLE IF NOT EXISTS AuditLogs (
-        audit_id INTEGER PRIMARY KEY AUTOINCREMENT,
-        user_id INTEGER,
-        username TEXT,
-        action TEXT NOT NULL,
-        entity_type TEXT NOT NULL,
-        entity_id INTEGER,
-        shop_id INTEGER,
-        product_id INTEGER,
-        details TEXT,
-        created_at TEXT NOT NULL,
-        FOREIGN KEY(user_id) REFERENCES Users(user_id)
-    )
-    """)
-    cursor.execute("""
-    CREATE INDEX IF NOT EXISTS idx_auditlogs_created_at
-    ON AuditLogs(created_at DESC)
-    """)
-    cursor.execute("""
-    CREATE INDEX IF NOT EXISTS idx_auditlogs_action
-    ON AuditLogs(action)
-    """)
-
-    # Staff permissions
-    cursor.execute("""
-    CREATE TABLE IF NOT EXISTS StaffPermissions (
-        permission_id INTEGER PRIMARY KEY AUTOINCREMENT,
-        user_id INTEGER NOT NULL,
-        permission_key TEXT NOT NULL,
-        UNIQUE(user_id, permission_key),
-        FOREIGN KEY(user_id) REFERENCES Users(user_id)
-    )
-    """)
-    cursor.execute("""
-    CREATE INDEX IF NOT EXISTS idx_staff_permissions_user
-    ON StaffPermissions(user_id)
-    """)
-
-    conn.commit()
-
-    # default admin
-    cursor.execute("SELECT * FROM Users WHERE username='admin'")
-    if cursor.fetchone() is None:
-        password = "admin123"
-        password_hash = hash_password(password)
-        cursor.execute("INSERT INTO Users (username, password_hash, role) VALUES (?, ?, ?)",
-                       ("admin", password_hash, "admin"))
-        conn.commit()
-
-    # default shops
-    cursor.execute("SELECT COUNT(*) FROM Shops")
-    row = cursor.fetchone()
-    if row is None or row[0] == 0:
-        default_shops = ["Shop 1", "Shop 2", "Shop 3", "Shop 4"]
-        for s in default_shops:
-            cursor.execute("INSERT INTO Shops (shop_name) VALUES (?)", (s,))
-        conn.commit()
-
-    # backfill default staff permissions for existing staff users
-    cursor.execute("""
-        SELECT u.user_id
-        FROM Users u
-        LEFT JOIN StaffPermissions sp ON sp.user_id = u.user_id
-        WHERE u.role = 'staff'
-        GROUP BY u.user_id
-        HAVING COUNT(sp.permission_id) = 0
-    """)
-    staff_without_permissions = [r[0] for r in cursor.fetchall()]
-    for user_id in staff_without_permissions:
-        cursor.execute(
-            "INSERT OR IGNORE INTO StaffPermissions (user_id, permission_key) VALUES (?, ?)",
-            (user_id, "add_sale")
-        )
-        cursor.execute(
-            "INSERT OR IGNORE INTO StaffPermissions (user_id, permission_key) VALUES (?, ?)",
-            (user_id, "show_sales")
-        )
-    if staff_without_permissions:
-        conn.commit()
+    if migrate(db):
+        print("Database initialized successfully!")
 
-    conn.close()
-    print("Database initialized successfully!")
 
 if __name__ == "__main__":
     initialize_database()
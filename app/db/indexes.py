@@ -0,0 +1,36 @@
+# Secondary indexes, grouped by the release that introduced them. Each set
+# is created by a schema migration (app/db/migrations.py); a set that
+# replaces an older index drops it in its own migration.
+INDEX_SETS = (
+    (1, (
+        "CREATE UNIQUE INDEX IF NOT EXISTS idx_stock_product_shop ON Stock(product_id, shop_id)",
+        "CREATE INDEX IF NOT EXISTS idx_auditlogs_created_at ON AuditLogs(created_at DESC)",
+        "CREATE INDEX IF NOT EXISTS idx_auditlogs_action ON AuditLogs(action)",
+        "CREATE INDEX IF NOT EXISTS idx_staff_permissions_user ON StaffPermissions(user_id)",
+    )),
+    (2, (
+        "CREATE INDEX IF NOT EXISTS idx_stock_shop ON Stock(shop_id)",
+        "CREATE INDEX IF NOT EXISTS idx_sales_shop_date ON Sales(shop_id, date)",
+        "CREATE INDEX IF NOT EXISTS idx_saleitems_sale ON SaleItems(sale_id)",
+        "CREATE INDEX IF NOT EXISTS idx_saleitems_product ON SaleItems(product_id)",
+        "CREATE INDEX IF NOT EXISTS idx_purchases_product_shop_date ON Purchases(product_id, shop_id, date)",
+        "CREATE INDEX IF NOT EXISTS idx_purchases_shop_date ON Purchases(shop_id, date)",
+    )),
+    (3, (
+        "CREATE INDEX IF NOT EXISTS idx_auditlogs_username ON AuditLogs(username)",
+    )),
+    (4, (
+        "CREATE INDEX IF NOT EXISTS idx_auditlogs_stock_movements "
+        "ON AuditLogs(shop_id, product_id, created_at, action, qty, unit_price_cents, "
+        "stock_before, stock_after) WHERE stock_after IS NOT NULL",
+    )),
+)
+
+
+def create_index_set(cursor, version):
+    for set_version, statements in INDEX_SETS:
+        if set_version == version:
+            for sql in statements:
+                cursor.execute(sql)
+            return
+    raise ValueError(f"Unknown index set: {version}")
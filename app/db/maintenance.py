@@ -0,0 +1,68 @@
+import argparse
+import os
+import time
+from app.db.database_init import initialize_database
+
+
+def rebuild_price_summary():
+    from app.models.price_summary_model import PriceSummaryModel
+
+    start = time.perf_counter()
+    rows = PriceSummaryModel.rebuild()
+    elapsed = time.perf_counter() - start
+    print(f"Rebuilt ProductPriceSummary: {rows} rows in {elapsed:.2f}s")
+
+
+def rebuild_audit_search():
+    from app.models.audit_log_model import AuditLogModel
+
+    start = time.perf_counter()
+    rows = AuditLogModel.rebuild_search_index()
+    elapsed = time.perf_counter() - start
+    print(f"Rebuilt AuditLogSearch: {rows} rows in {elapsed:.2f}s")
+
+
+def archive_audit_logs():
+    from app.db.database_init import DB_PATH, db
+    from app.models.audit_archive import ARCHIVE_DIR, AuditArchive, retention_days
+
+    if retention_days() <= 0:
+        print("Audit log retention is off: set INVENTORY_AUDIT_RETENTION_DAYS "
+              "to the number of days to keep in app.db.")
+        return
+
+    start = time.perf_counter()
+    rows = AuditArchive.archive_expired()
+    elapsed = time.perf_counter() - start
+    print(f"Archived {rows} audit log rows older than {retention_days()} days "
+          f"to {ARCHIVE_DIR} in {elapsed:.2f}s")
+    if rows:
+        # Deleted rows only free pages for reuse; VACUUM gives them back.
+        before = os.path.getsize(DB_PATH)
+        with db.connection() as conn:
+            conn.execute("VACUUM")
+        db.checkpoint("TRUNCATE")
+        print(f"Compacted app.db: {before / 1e6:.1f} MB -> {os.path.getsize(DB_PATH) / 1e6:.1f} MB")
+
+
+COMMANDS = {
+    "rebuild-price-summary": rebuild_price_summary,
+    "rebuild-audit-search": rebuild_audit_search,
+    "archive-audit-logs": archive_audit_logs,
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m app.db.maintenance",
+        description="Database maintenance commands for app.db",
+    )
+    parser.add_argument("command", choices=sorted(COMMANDS))
+    args = parser.parse_args(argv)
+
+    initialize_database()
+    COMMANDS[args.command]()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,414 @@
+import time
+from app.db.indexes import create_index_set
+
+# Ordered schema migrations. The schema version lives in PRAGMA user_version,
+# so an up-to-date database costs a single integer read at start-up. Append
+# new migrations at the end and never edit one that has shipped: databases
+# in the field have already applied it.
+#
+# Migrations use fixed SQL rather than calling model code, so a later change
+# to a model cannot change how an old database is upgraded.
+#
+# Migration 1 is the schema as it stood before versioning. It keeps the
+# IF NOT EXISTS guards so databases created by older releases (which all sit
+# at user_version 0) adopt it without losing data.
+
+
+def _baseline(cursor):
+    from app.db.database_init import hash_password
+
+    # Shops
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS Shops (
+        shop_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        shop_name TEXT NOT NULL
+    )
+    """)
+
+    # Users
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS Users (
+        user_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        username TEXT UNIQUE NOT NULL,
+        password_hash TEXT NOT NULL,
+        role TEXT NOT NULL,
+        status TEXT DEFAULT 'active'
+    )
+    """)
+
+    # Products (master)
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS Products (
+        product_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT NOT NULL
+    )
+    """)
+
+    # Stock (per shop)
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS Stock (
+        stock_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        product_id INTEGER NOT NULL,
+        shop_id INTEGER NOT NULL,
+        quantity INTEGER NOT NULL DEFAULT 0,
+        FOREIGN KEY(product_id) REFERENCES Products(product_id),
+        FOREIGN KEY(shop_id) REFERENCES Shops(shop_id)
+    )
+    """)
+
+    # Sales (invoice header)
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS Sales (
+        sale_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        shop_id INTEGER NOT NULL,
+        date TEXT NOT NULL,
+        grand_total REAL NOT NULL,
+        FOREIGN KEY(shop_id) REFERENCES Shops(shop_id)
+    )
+    """)
+
+    # SaleItems (invoice lines)
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS SaleItems (
+        sale_item_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        sale_id INTEGER NOT NULL,
+        product_id INTEGER NOT NULL,
+        quantity INTEGER NOT NULL,
+        price_per_unit REAL NOT NULL,
+        line_total REAL NOT NULL,
+        FOREIGN KEY(sale_id) REFERENCES Sales(sale_id),
+        FOREIGN KEY(product_id) REFERENCES Products(product_id)
+    )
+    """)
+
+    # Purchases
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS Purchases (
+        purchase_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        product_id INTEGER NOT NULL,
+        shop_id INTEGER NOT NULL,
+        quantity INTEGER NOT NULL,
+        price REAL NOT NULL,
+        total REAL NOT NULL,
+        date TEXT NOT NULL,
+        FOREIGN KEY(product_id) REFERENCES Products(product_id),
+        FOREIGN KEY(shop_id) REFERENCES Shops(shop_id)
+    )
+    """)
+
+    # Receipts (paths for generated receipts)
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS Receipts (
+        receipt_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        sale_id INTEGER NOT NULL,
+        file_path TEXT NOT NULL,
+        date TEXT NOT NULL,
+        FOREIGN KEY(sale_id) REFERENCES Sales(sale_id)
+    )
+    """)
+
+    # Audit logs
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS AuditLogs (
+        audit_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER,
+        username TEXT,
+        action TEXT NOT NULL,
+        entity_type TEXT NOT NULL,
+        entity_id INTEGER,
+        shop_id INTEGER,
+        product_id INTEGER,
+        details TEXT,
+        created_at TEXT NOT NULL,
+        FOREIGN KEY(user_id) REFERENCES Users(user_id)
+    )
+    """)
+
+    # Staff permissions
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS StaffPermissions (
+        permission_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER NOT NULL,
+        permission_key TEXT NOT NULL,
+        UNIQUE(user_id, permission_key),
+        FOREIGN KEY(user_id) REFERENCES Users(user_id)
+    )
+    """)
+
+    create_index_set(cursor, 1)
+
+    # default admin
+    cursor.execute("SELECT * FROM Users WHERE username='admin'")
+    if cursor.fetchone() is None:
+        password = "admin123"
+        password_hash = hash_password(password)
+        cursor.execute("INSERT INTO Users (username, password_hash, role) VALUES (?, ?, ?)",
+                       ("admin", password_hash, "admin"))
+
+    # default shops
+    cursor.execute("SELECT COUNT(*) FROM Shops")
+    row = cursor.fetchone()
+    if row is None or row[0] == 0:
+        default_shops = ["Shop 1", "Shop 2", "Shop 3", "Shop 4"]
+        for s in default_shops:
+            cursor.execute("INSERT INTO Shops (shop_name) VALUES (?)", (s,))
+
+    # backfill default staff permissions for existing staff users
+    cursor.execute("""
+        SELECT u.user_id
+        FROM Users u
+        LEFT JOIN StaffPermissions sp ON sp.user_id = u.user_id
+        WHERE u.role = 'staff'
+        GROUP BY u.user_id
+        HAVING COUNT(sp.permission_id) = 0
+    """)
+    staff_without_permissions = [r[0] for r in cursor.fetchall()]
+    for user_id in staff_without_permissions:
+        cursor.execute(
+            "INSERT OR IGNORE INTO StaffPermissions (user_id, permission_key) VALUES (?, ?)",
+            (user_id, "add_sale")
+        )
+        cursor.execute(
+            "INSERT OR IGNORE INTO StaffPermissions (user_id, permission_key) VALUES (?, ?)",
+            (user_id, "show_sales")
+        )
+
+
+# Fills an empty ProductPriceSummary from the full purchase and sale history.
+# Money columns carry the "{cents}" suffix: "" for the REAL schema of
+# migration 2, "_cents" from migration 4 on. Both migrations use it, so it
+# must not change; PriceSummaryModel.rebuild_with_cursor uses the "_cents"
+# form and needs SQL of its own if the summary ever changes.
+PRICE_SUMMARY_FILL = """
+    WITH purchase_stats AS (
+        SELECT
+            product_id,
+            shop_id,
+            SUM(quantity * price{cents}) AS total_cost{cents},
+            SUM(quantity) AS total_qty,
+            MAX(purchase_id) AS last_purchase_id,
+            MAX(date) AS last_purchase_at
+        FROM Purchases
+        GROUP BY product_id, shop_id
+    ),
+    sale_stats AS (
+        SELECT
+            si.product_id,
+            s.shop_id,
+            MAX(si.sale_item_id) AS last_sale_item_id,
+            MAX(s.date) AS last_sale_at
+        FROM SaleItems si
+        JOIN Sales s ON s.sale_id = si.sale_id
+        GROUP BY si.product_id, s.shop_id
+    ),
+    summary_keys AS (
+        SELECT product_id, shop_id FROM purchase_stats
+        UNION
+        SELECT product_id, shop_id FROM sale_stats
+    )
+    INSERT INTO ProductPriceSummary
+    (product_id, shop_id, total_cost{cents}, total_qty,
+     last_purchase_price{cents}, last_sale_price{cents}, last_movement_at)
+    SELECT
+        k.product_id,
+        k.shop_id,
+        COALESCE(ps.total_cost{cents}, 0),
+        COALESCE(ps.total_qty, 0),
+        lp.price{cents},
+        ls.price_per_unit{cents},
+        NULLIF(MAX(
+            COALESCE(ps.last_purchase_at, ''),
+            COALESCE(ss.last_sale_at, '')
+        ), '')
+    FROM summary_keys k
+    LEFT JOIN purchase_stats ps
+        ON ps.product_id = k.product_id AND ps.shop_id = k.shop_id
+    LEFT JOIN Purchases lp ON lp.purchase_id = ps.last_purchase_id
+    LEFT JOIN sale_stats ss
+        ON ss.product_id = k.product_id AND ss.shop_id = k.shop_id
+    LEFT JOIN SaleItems ls ON ls.sale_item_id = ss.last_sale_item_id
+"""
+
+
+def _price_summary(cursor):
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS ProductPriceSummary (
+        product_id INTEGER NOT NULL,
+        shop_id INTEGER NOT NULL,
+        total_cost REAL NOT NULL DEFAULT 0,
+        total_qty INTEGER NOT NULL DEFAULT 0,
+        last_purchase_price REAL,
+        last_sale_price REAL,
+        last_movement_at TEXT,
+        PRIMARY KEY(product_id, shop_id),
+        FOREIGN KEY(product_id) REFERENCES Products(product_id),
+        FOREIGN KEY(shop_id) REFERENCES Shops(shop_id)
+    ) WITHOUT ROWID
+    """)
+    cursor.execute(PRICE_SUMMARY_FILL.format(cents=""))
+
+
+def _report_indexes(cursor):
+    create_index_set(cursor, 2)
+
+
+MONEY_COLUMNS = (
+    ("Sales", "grand_total"),
+    ("SaleItems", "price_per_unit"),
+    ("SaleItems", "line_total"),
+    ("Purchases", "price"),
+    ("Purchases", "total"),
+)
+
+
+def _integer_cents(cursor):
+    # REAL money columns become INTEGER cents. A column's type cannot be
+    # altered in place, so each gets an *_cents twin that is filled and then
+    # replaces it.
+    for table, column in MONEY_COLUMNS:
+        cursor.execute(
+            f"ALTER TABLE {table} ADD COLUMN {column}_cents INTEGER NOT NULL DEFAULT 0"
+        )
+        cursor.execute(
+            f"UPDATE {table} SET {column}_cents = CAST(ROUND({column} * 100) AS INTEGER)"
+        )
+        cursor.execute(f"ALTER TABLE {table} DROP COLUMN {column}")
+
+    # The summary is derived data: recreate it with cents columns and refill.
+    cursor.execute("DROP TABLE IF EXISTS ProductPriceSummary")
+    cursor.execute("""
+    CREATE TABLE ProductPriceSummary (
+        product_id INTEGER NOT NULL,
+        shop_id INTEGER NOT NULL,
+        total_cost_cents INTEGER NOT NULL DEFAULT 0,
+        total_qty INTEGER NOT NULL DEFAULT 0,
+        last_purchase_price_cents INTEGER,
+        last_sale_price_cents INTEGER,
+        last_movement_at TEXT,
+        PRIMARY KEY(product_id, shop_id),
+        FOREIGN KEY(product_id) REFERENCES Products(product_id),
+        FOREIGN KEY(shop_id) REFERENCES Shops(shop_id)
+    ) WITHOUT ROWID
+    """)
+    cursor.execute(PRICE_SUMMARY_FILL.format(cents="_cents"))
+
+
+def _audit_search(cursor):
+    # Full-text index over the searchable audit columns. It stores no copy
+    # of the text (content=AuditLogs), and triggers keep it in step with
+    # every insert, update and delete.
+    cursor.execute("""
+    CREATE VIRTUAL TABLE AuditLogSearch USING fts5(
+        action, entity_type, details,
+        content='AuditLogs', content_rowid='audit_id'
+    )
+    """)
+    cursor.execute("""
+    CREATE TRIGGER AuditLogSearch_insert AFTER INSERT ON AuditLogs BEGIN
+        INSERT INTO AuditLogSearch (rowid, action, entity_type, details)
+        VALUES (new.audit_id, new.action, new.entity_type, new.details);
+    END
+    """)
+    cursor.execute("""
+    CREATE TRIGGER AuditLogSearch_delete AFTER DELETE ON AuditLogs BEGIN
+        INSERT INTO AuditLogSearch (AuditLogSearch, rowid, action, entity_type, details)
+        VALUES ('delete', old.audit_id, old.action, old.entity_type, old.details);
+    END
+    """)
+    cursor.execute("""
+    CREATE TRIGGER AuditLogSearch_update AFTER UPDATE ON AuditLogs BEGIN
+        INSERT INTO AuditLogSearch (AuditLogSearch, rowid, action, entity_type, details)
+        VALUES ('delete', old.audit_id, old.action, old.entity_type, old.details);
+        INSERT INTO AuditLogSearch (rowid, action, entity_type, details)
+        VALUES (new.audit_id, new.action, new.entity_type, new.details);
+    END
+    """)
+    cursor.execute("INSERT INTO AuditLogSearch (AuditLogSearch) VALUES ('rebuild')")
+
+
+def _audit_facet_indexes(cursor):
+    create_index_set(cursor, 3)
+
+
+# The details formats stock entries were written in before migration 7.
+def _audit_stock_fields(cursor):
+    # Typed stock movement columns on audit entries. Existing entries only
+    # have these values in their details text; parsing every one here would
+    # hold up start-up, so their audit_id range is recorded instead and the
+    # app fills it in the background (app/models/audit_stock_backfill.py).
+    for column in ("qty", "unit_price_cents", "stock_before", "stock_after"):
+        cursor.execute(f"ALTER TABLE AuditLogs ADD COLUMN {column} INTEGER")
+
+    # Only the indexed text columns need re-indexing on update, so the
+    # backfill (and any later update of other columns) skips the FTS index.
+    cursor.execute("DROP TRIGGER AuditLogSearch_update")
+    cursor.execute("""
+    CREATE TRIGGER AuditLogSearch_update
+    AFTER UPDATE OF action, entity_type, details ON AuditLogs BEGIN
+        INSERT INTO AuditLogSearch (AuditLogSearch, rowid, action, entity_type, details)
+        VALUES ('delete', old.audit_id, old.action, old.entity_type, old.details);
+        INSERT INTO AuditLogSearch (rowid, action, entity_type, details)
+        VALUES (new.audit_id, new.action, new.entity_type, new.details);
+    END
+    """)
+
+    cursor.execute("""
+    CREATE TABLE AuditStockBackfill (
+        next_id INTEGER NOT NULL,
+        end_id INTEGER NOT NULL
+    )
+    """)
+    cursor.execute("""
+    INSERT INTO AuditStockBackfill (next_id, end_id)
+    SELECT MIN(audit_id), MAX(audit_id) FROM AuditLogs
+    WHERE action IN ('SALE_ADD', 'PURCHASE_ADD', 'STOCK_ADJUST')
+    HAVING COUNT(*) > 0
+    """)
+    create_index_set(cursor, 4)
+
+
+MIGRATIONS = (
+    (1, "baseline schema", _baseline),
+    (2, "product price summary", _price_summary),
+    (3, "report indexes", _report_indexes),
+    (4, "integer cents money columns", _integer_cents),
+    (5, "audit log search index", _audit_search),
+    (6, "audit log facet indexes", _audit_facet_indexes),
+    (7, "audit log stock fields", _audit_stock_fields),
+)
+
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+
+def get_schema_version(conn):
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(manager, verbose=True):
+    with manager.connection() as conn:
+        if get_schema_version(conn) == SCHEMA_VERSION:
+            return []
+
+    applied = []
+    with manager.transaction(immediate=True) as conn:
+        # Re-read under the write lock in case another process migrated first.
+        current = get_schema_version(conn)
+        if current > SCHEMA_VERSION:
+            raise RuntimeError(
+                f"Database schema version {current} is newer than this "
+                f"application supports ({SCHEMA_VERSION})"
+            )
+        cursor = conn.cursor()
+        for version, description, apply in MIGRATIONS:
+            if version <= current:
+                continue
+            start = time.perf_counter()
+            apply(cursor)
+            elapsed = time.perf_counter() - start
+            applied.append((version, description, elapsed))
+            if verbose:
+                print(f"Migration {version} ({description}): {elapsed * 1000:.1f} ms")
+        # user_version is part of the database header, so it commits or
+        # rolls back together with the migrations above.
+        cursor.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    return applied
@@ -0,0 +1,40 @@
+import os
+
+# cache_size is negative => KiB, per SQLite convention.
+PRAGMA_PROFILES = {
+    "production": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -16000,
+        "mmap_size": 128 * 1024 * 1024,
+        "temp_store": "MEMORY",
+        "busy_timeout": 5000,
+        "wal_autocheckpoint": 1000,
+    },
+    "safe": {
+        "journal_mode": "DELETE",
+        "synchronous": "FULL",
+        "cache_size": -2000,
+        "mmap_size": 0,
+        "temp_store": "DEFAULT",
+        "busy_timeout": 5000,
+    },
+}
+
+DEFAULT_PROFILE = "production"
+PROFILE_ENV_VAR = "INVENTORY_DB_PROFILE"
+
+
+def get_pragma_profile(name=None):
+    name = name or os.environ.get(PROFILE_ENV_VAR) or DEFAULT_PROFILE
+    if name not in PRAGMA_PROFILES:
+        raise ValueError(f"Unknown database PRAGMA profile: {name}")
+    return dict(PRAGMA_PROFILES[name])
+
+
+def apply_pragmas(conn, pragmas):
+    # journal_mode must run first: it cannot change inside a transaction and
+    # other settings (wal_autocheckpoint) only matter once it is set.
+    ordered = sorted(pragmas.items(), key=lambda kv: kv[0] != "journal_mode")
+    for key, value in ordered:
+        conn.execute(f"PRAGMA {key} = {value}")
@@ -1,17 +1,26 @@
+from app.utils.startup_timing import StartupTimer
+
+startup = StartupTimer()
+
 import sys
 import atexit
 from PyQt5.QtWidgets import QApplication
-from app.db.database_init import initialize_database
+from app.db.database_init import initialize_database, checkpoint_scheduler
 from app.views.login_window import LoginWindow
-from app.views.admin_dashboard import AdminDashboard
-from app.views.staff_dashboard import StaffDashboard
+from app.views.theme import apply_theme
+from app.views.window_registry import window_class
 from app.controllers.backup_controller import BackupController
+from app.models.audit_archive import audit_archiver
+from app.models.audit_log_writer import audit_writer
+from app.models.audit_stock_backfill import audit_stock_backfiller
+
+startup.mark("imports")
 
 app_state = {}
 
 def main():
-    initialize_database()
     app = QApplication(sys.argv)
+    apply_theme(app)
 
     def on_login_success(user_info):
         app_state["login"].close()
@@ -19,11 +28,11 @@ def main():
         role = user_info.get("role")
 
         if role == "admin":
-            app_state["admin"] = AdminDashboard(user_info)
+            app_state["admin"] = window_class("admin_dashboard")(user_info)
             app_state["admin"].show()
 
         elif role == "staff":
-            app_state["staff"] = StaffDashboard(user_info)
+            app_state["staff"] = window_class("staff_dashboard")(user_info)
             app_state["staff"].show()
 
         else:
@@ -31,8 +40,25 @@ def main():
 
     app_state["login"] = LoginWindow(on_login_success)
     app_state["login"].show()
+    # Paint the login window before touching the database, so the user
+    # sees it while migrations / the schema check run.
+    app.processEvents()
+    startup.mark("login window painted")
+
+    initialize_database()
+    checkpoint_scheduler.start()
+    audit_writer.start()
+    audit_archiver.start()
+    audit_stock_backfiller.start()
+    startup.mark("database ready")
+    print(startup.report())
 
-    sys.exit(app.exec_())
+    exit_code = app.exec_()
+    audit_stock_backfiller.stop()
+    audit_archiver.stop()
+    audit_writer.stop()
+    checkpoint_scheduler.stop()
+    sys.exit(exit_code)
 
 atexit.register(lambda: BackupController.backup_if_changed())
 
@@ -0,0 +1,291 @@
+import gzip
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+
+from app.db.database_init import db, get_data_dir
+from app.models.audit_log_model import (
+    FACET_COLUMNS, HIGHLIGHT_END, HIGHLIGHT_START, LOG_COLUMNS, AuditLogModel,
+    search_words,
+)
+
+# Audit rows older than the retention period are moved out of AuditLogs into
+# one gzip-compressed JSON-lines file per month, so app.db only carries
+# recent history. Whole months are archived: a month moves once its last day
+# is older than the retention period, so each file is written once.
+# Archiving is opt-in; backups copy ARCHIVE_DIR along with app.db.
+ARCHIVE_DIR = os.path.join(get_data_dir(), "audit_archive")
+RETENTION_ENV_VAR = "INVENTORY_AUDIT_RETENTION_DAYS"
+DEFAULT_RETENTION_DAYS = 0
+DELETE_BATCH = 5000
+
+_MONTH_FILE_RE = re.compile(r"^audit-(\d{4}-\d{2})\.jsonl\.gz$")
+# FTS5's unicode61 tokenizer splits on anything that is not a letter or digit.
+_TOKEN_RE = re.compile(r"[^\W_]+")
+
+logger = logging.getLogger(__name__)
+
+
+def retention_days():
+    # 0 keeps everything in app.db.
+    value = os.environ.get(RETENTION_ENV_VAR)
+    return int(value) if value else DEFAULT_RETENTION_DAYS
+
+
+def _month_path(month):
+    return os.path.join(ARCHIVE_DIR, f"audit-{month}.jsonl.gz")
+
+
+def _next_month(month):
+    year, mon = int(month[:4]), int(month[5:7])
+    year, mon = (year + 1, 1) if mon == 12 else (year, mon + 1)
+    return f"{year:04d}-{mon:02d}-01"
+
+
+def _read_file(path):
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def _write_month(month, rows):
+    # Merges rows into the month's file. Rows already in it are skipped, so
+    # re-archiving after an interrupted run cannot duplicate entries. The
+    # file is replaced atomically and synced before the caller deletes the
+    # rows from AuditLogs.
+    os.makedirs(ARCHIVE_DIR, exist_ok=True)
+    path = _month_path(month)
+    existing = _read_file(path) if os.path.exists(path) else []
+    known = {row["audit_id"] for row in existing}
+    merged = existing + [row for row in rows if row["audit_id"] not in known]
+    merged.sort(key=lambda row: row["audit_id"])
+
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as raw:
+        with gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=6) as f:
+            for row in merged:
+                f.write(json.dumps(row, separators=(",", ":")).encode("utf-8") + b"\n")
+        raw.flush()
+        os.fsync(raw.fileno())
+    os.replace(tmp, path)
+
+
+class _MonthCache:
+    # The most recently read archive month, newest first. Filtering the
+    # viewer's results re-reads nothing until another month is opened or
+    # the file changes.
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._key = None
+        self._rows = None
+
+    def rows(self, month):
+        path = _month_path(month)
+        key = (path, os.stat(path).st_mtime_ns)
+        with self._lock:
+            if self._key == key:
+                return self._rows
+        rows = _read_file(path)
+        rows.reverse()
+        with self._lock:
+            self._key, self._rows = key, rows
+        return rows
+
+
+_months = _MonthCache()
+
+
+def _phrase_at(tokens, phrase, prefix):
+    # Start indexes where the phrase's tokens occur consecutively.
+    n = len(phrase)
+    starts = []
+    for i in range(len(tokens) - n + 1):
+        if tokens[i:i + n - 1] != phrase[:-1]:
+            continue
+        last = tokens[i + n - 1]
+        if last == phrase[-1] or (prefix and last.startswith(phrase[-1])):
+            starts.append(i)
+    return starts
+
+
+class AuditArchive:
+    @staticmethod
+    def months():
+        # Archived months ("YYYY-MM"), newest first.
+        if not os.path.isdir(ARCHIVE_DIR):
+            return []
+        return sorted(
+            (m.group(1) for m in map(_MONTH_FILE_RE.match, os.listdir(ARCHIVE_DIR)) if m),
+            reverse=True,
+        )
+
+    @staticmethod
+    def archive_expired(should_stop=None):
+        days = retention_days()
+        if days <= 0:
+            return 0
+        oldest_kept = datetime.now() - timedelta(days=days)
+        return AuditArchive.archive_before(oldest_kept.strftime("%Y-%m-01"), should_stop)
+
+    @staticmethod
+    def archive_before(cutoff, should_stop=None):
+        # Moves rows created before cutoff (an ISO date) to their month's
+        # archive file, one month at a time. Returns the number of rows moved.
+        archived = 0
+        while not (should_stop and should_stop()):
+            with db.connection() as conn:
+                oldest = conn.execute(
+                    "SELECT MIN(created_at) FROM AuditLogs WHERE created_at < ?",
+                    (cutoff,),
+                ).fetchone()[0]
+            if oldest is None:
+                break
+
+            month = oldest[:7]
+            with db.connection(sqlite3.Row) as conn:
+                rows = [
+                    dict(row) for row in conn.execute(
+                        f"""
+                        SELECT {LOG_COLUMNS}
+                        FROM AuditLogs a
+                        WHERE a.created_at >= ? AND a.created_at < ?
+                        ORDER BY a.audit_id
+                        """,
+                        (oldest, min(_next_month(month), cutoff)),
+                    )
+                ]
+            _write_month(month, rows)
+
+            # Short transactions, so live writers wait at most one batch.
+            ids = [(row["audit_id"],) for row in rows]
+            for start in range(0, len(ids), DELETE_BATCH):
+                with db.transaction() as conn:
+                    conn.executemany(
+                        "DELETE FROM AuditLogs WHERE audit_id = ?",
+                        ids[start:start + DELETE_BATCH],
+                    )
+            archived += len(rows)
+
+        if archived:
+            AuditLogModel.merge_search_index(should_stop)
+        return archived
+
+    @staticmethod
+    def get_logs(month, limit=500, username=None, action=None, query=None):
+        # AuditLogModel.get_logs over one archived month: the same filters
+        # and word matching, newest first, with details_highlight marked the
+        # same way.
+        words = search_words(query) if query else []
+        phrases = []
+        for word, prefix in words:
+            tokens = [t.casefold() for t in _TOKEN_RE.findall(word)]
+            if tokens:
+                phrases.append((tokens, prefix))
+        like = query.casefold() if query and not phrases else None
+
+        results = []
+        for row in _months.rows(month):
+            if username and row["username"] != username:
+                continue
+            if action and row["action"] != action:
+                continue
+            highlight = None
+            if phrases:
+                highlight = AuditArchive._match(row, phrases)
+                if highlight is None:
+                    continue
+            elif like and not any(
+                like in (row[column] or "").casefold()
+                for column in ("details", "entity_type", "action")
+            ):
+                continue
+            results.append({**row, "details_highlight": highlight or None})
+            if len(results) >= limit:
+                break
+        return results
+
+    @staticmethod
+    def _match(row, phrases):
+        # None unless every phrase occurs in the action, entity type or
+        # details; otherwise the details text with matched words marked.
+        text = " ".join(row[c] or "" for c in ("action", "entity_type", "details")).casefold()
+        if any(phrase[0] not in text for phrase, _ in phrases):
+            return None
+
+        details = row["details"] or ""
+        spans = [(m.start(), m.end()) for m in _TOKEN_RE.finditer(details)]
+        detail_tokens = [details[s:e].casefold() for s, e in spans]
+        other_tokens = [
+            t.casefold() for c in ("action", "entity_type")
+            for t in _TOKEN_RE.findall(row[c] or "")
+        ]
+        marked = set()
+        for phrase, prefix in phrases:
+            starts = _phrase_at(detail_tokens, phrase, prefix)
+            if not starts and not _phrase_at(other_tokens, phrase, prefix):
+                return None
+            for i in starts:
+                marked.update(range(i, i + len(phrase)))
+
+        if not marked:
+            return ""
+        out = []
+        pos = 0
+        for i in sorted(marked):
+            s, e = spans[i]
+            out.append(details[pos:s] + HIGHLIGHT_START + details[s:e] + HIGHLIGHT_END)
+            pos = e
+        out.append(details[pos:])
+        return "".join(out)
+
+    @staticmethod
+    def get_facets(month):
+        # Same shape as AuditLogModel.get_facets, for one archived month.
+        values = {column: set() for column in FACET_COLUMNS}
+        for row in _months.rows(month):
+            for column in FACET_COLUMNS:
+                if row[column]:
+                    values[column].add(row[column])
+        return {column: sorted(found) for column, found in values.items()}
+
+
+class AuditArchiver:
+    # Applies the retention policy once per run of the app, on a background
+    # thread so start-up does not wait for it. stop() lets the current month
+    # finish (an interrupted month is completed on the next run).
+
+    def __init__(self, manager):
+        self.manager = manager
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="audit-archiver", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        try:
+            archived = AuditArchive.archive_expired(self._stop.is_set)
+            if archived:
+                print(f"Archived {archived} audit log rows to {ARCHIVE_DIR}")
+        except Exception:
+            logger.exception("Audit log archival failed")
+        self.manager.close_thread()
+
+
+audit_archiver = AuditArchiver(db)
@@ -1,6 +1,104 @@
 from datetime import datetime
+import re
 import sqlite3
-from app.db.database_init import get_connection
+import threading
+from app.db.database_init import db
+from app.utils.date_range import day_bounds
+
+LOG_COLUMNS = """
+    a.audit_id,
+    a.user_id,
+    a.username,
+    a.action,
+    a.entity_type,
+    a.entity_id,
+    a.shop_id,
+    a.product_id,
+    a.details,
+    a.created_at,
+    a.qty,
+    a.unit_price_cents,
+    a.stock_before,
+    a.stock_after
+"""
+
+# Control characters cannot appear in typed details, so they are safe to
+# mark matches with and the view can swap them for its own markup.
+HIGHLIGHT_START = "\x02"
+HIGHLIGHT_END = "\x03"
+
+_SEARCH_WORD_RE = re.compile(r"\w+")
+
+
+def search_words(text):
+    # [(word, is_prefix)] for the search box: every word typed must appear in
+    # the action, entity type or details. The last word may be a prefix, as
+    # it is often still being typed, unless it is too short to narrow much
+    # ("3*" would expand to every number).
+    words = _SEARCH_WORD_RE.findall(text)
+    return [
+        (word, i == len(words) - 1 and len(word) >= 3)
+        for i, word in enumerate(words)
+    ]
+
+
+def search_expression(text):
+    # FTS5 query for search_words(text). Quoting each word keeps FTS5
+    # operators out of user input.
+    return " ".join(
+        f'"{word}"' + ("*" if prefix else "") for word, prefix in search_words(text)
+    )
+
+
+FACET_COLUMNS = ("username", "action")
+
+
+class _FacetCache:
+    # Distinct usernames and actions for the audit viewer's filters. Every
+    # write through this module adds its values here once its transaction
+    # commits, so the cache never needs invalidating in this process and
+    # never lists a value whose rows were rolled back. A refresh reloads
+    # both lists, picking up rows written by other processes and dropping
+    # values whose rows were deleted or archived. Values noted while a load
+    # runs are kept, as the load may have read the table before they were.
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._values = {column: set() for column in FACET_COLUMNS}
+        self._loads = []
+        self._loaded = False
+
+    def note(self, entries):
+        with self._lock:
+            for entry in entries:
+                for column in FACET_COLUMNS:
+                    if entry.get(column):
+                        self._values[column].add(entry[column])
+                        for noted in self._loads:
+                            noted[column].add(entry[column])
+
+    def get(self, load, refresh=False):
+        noted = {column: set() for column in FACET_COLUMNS}
+        with self._lock:
+            if self._loaded and not refresh:
+                return self._snapshot()
+            self._loads.append(noted)
+        try:
+            loaded = load()
+        finally:
+            with self._lock:
+                self._loads.remove(noted)
+        with self._lock:
+            for column in FACET_COLUMNS:
+                self._values[column] = set(loaded[column]) | noted[column]
+            self._loaded = True
+            return self._snapshot()
+
+    def _snapshot(self):
+        return {column: sorted(values) for column, values in self._values.items()}
+
+
+_facets = _FacetCache()
 
 
 class AuditLogModel:
@@ -14,29 +112,27 @@ class AuditLogModel:
         user_id=None,
         username=None,
         details=None,
+        qty=None,
+        unit_price_cents=None,
+        stock_before=None,
+        stock_after=None,
     ):
-        conn = get_connection()
-        cur = conn.cursor()
-        cur.execute(
-            """
-            INSERT INTO AuditLogs
-            (user_id, username, action, entity_type, entity_id, shop_id, product_id, details, created_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                user_id,
-                username,
+        with db.transaction() as conn:
+            AuditLogModel.create_with_cursor(
+                conn.cursor(),
                 action,
                 entity_type,
-                entity_id,
-                shop_id,
-                product_id,
-                details,
-                datetime.now().isoformat(timespec="seconds"),
-            ),
-        )
-        conn.commit()
-        conn.close()
+                entity_id=entity_id,
+                shop_id=shop_id,
+                product_id=product_id,
+                user_id=user_id,
+                username=username,
+                details=details,
+                qty=qty,
+                unit_price_cents=unit_price_cents,
+                stock_before=stock_before,
+                stock_after=stock_after,
+            )
 
     @staticmethod
     def create_with_cursor(
@@ -49,12 +145,17 @@ class AuditLogModel:
         user_id=None,
         username=None,
         details=None,
+        qty=None,
+        unit_price_cents=None,
+        stock_before=None,
+        stock_after=None,
     ):
         cursor.execute(
             """
             INSERT INTO AuditLogs
-            (user_id, username, action, entity_type, entity_id, shop_id, product_id, details, created_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            (user_id, username, action, entity_type, entity_id, shop_id, product_id, details, created_at,
+             qty, unit_price_cents, stock_before, stock_after)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             """,
             (
                 user_id,
@@ -66,48 +167,225 @@ class AuditLogModel:
                 product_id,
                 details,
                 datetime.now().isoformat(timespec="seconds"),
+                qty,
+                unit_price_cents,
+                stock_before,
+                stock_after,
             ),
         )
+        db.after_commit(lambda: _facets.note([{"username": username, "action": action}]))
 
     @staticmethod
-    def get_logs(limit=500, username=None, action=None, query=None):
-        conn = get_connection(sqlite3.Row)
-        cur = conn.cursor()
+    def create_many_with_cursor(cursor, entries):
+        # entries: dicts with the keyword arguments of create_with_cursor,
+        # plus an optional created_at (default: now).
+        created_at = datetime.now().isoformat(timespec="seconds")
+        cursor.executemany(
+            """
+            INSERT INTO AuditLogs
+            (user_id, username, action, entity_type, entity_id, shop_id, product_id, details, created_at,
+             qty, unit_price_cents, stock_before, stock_after)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            [
+                (
+                    e.get("user_id"),
+                    e.get("username"),
+                    e["action"],
+                    e["entity_type"],
+                    e.get("entity_id"),
+                    e.get("shop_id"),
+                    e.get("product_id"),
+                    e.get("details"),
+                    e.get("created_at") or created_at,
+                    e.get("qty"),
+                    e.get("unit_price_cents"),
+                    e.get("stock_before"),
+                    e.get("stock_after"),
+                )
+                for e in entries
+            ],
+        )
+        db.after_commit(lambda: _facets.note(entries))
 
-        sql = """
-            SELECT
-                audit_id,
-                user_id,
-                username,
-                action,
-                entity_type,
-                entity_id,
-                shop_id,
-                product_id,
-                details,
-                created_at
-            FROM AuditLogs
-            WHERE 1=1
-        """
+    @staticmethod
+    def get_logs(limit=500, username=None, action=None, query=None):
+        # Without a query: newest first. With one: the newest `limit`
+        # matches, best match first, with details_highlight holding the
+        # details text with each matched word wrapped in HIGHLIGHT_START /
+        # HIGHLIGHT_END (NULL otherwise).
+        filters = ""
         params = []
 
         if username:
-            sql += " AND username = ?"
+            filters += " AND a.username = ?"
             params.append(username)
 
         if action:
-            sql += " AND action = ?"
+            filters += " AND a.action = ?"
             params.append(action)
 
-        if query:
-            sql += " AND (details LIKE ? OR entity_type LIKE ? OR action LIKE ?)"
-            like = f"%{query}%"
-            params.extend([like, like, like])
+        match = search_expression(query) if query else None
+        if match:
+            # Ranking and highlighting cost a little per row, so only the
+            # rows that will be shown are scored, not every row containing
+            # a word as common as "stock".
+            sql = f"""
+                SELECT * FROM (
+                    SELECT
+                        {LOG_COLUMNS},
+                        highlight(AuditLogSearch, 2, ?, ?) AS details_highlight,
+                        AuditLogSearch.rank AS search_rank
+                    FROM AuditLogSearch
+                    JOIN AuditLogs a ON a.audit_id = AuditLogSearch.rowid
+                    WHERE AuditLogSearch MATCH ?{filters}
+                    ORDER BY AuditLogSearch.rowid DESC
+                    LIMIT ?
+                )
+                ORDER BY search_rank, audit_id DESC
+            """
+            params = [HIGHLIGHT_START, HIGHLIGHT_END, match, *params, limit]
+        else:
+            if query:
+                # Nothing the index can look up (punctuation only).
+                filters += " AND (a.details LIKE ? OR a.entity_type LIKE ? OR a.action LIKE ?)"
+                like = f"%{query}%"
+                params.extend([like, like, like])
+            sql = f"""
+                SELECT
+                    {LOG_COLUMNS},
+                    NULL AS details_highlight
+                FROM AuditLogs a
+                WHERE 1=1{filters}
+                ORDER BY a.audit_id DESC
+                LIMIT ?
+            """
+            params.append(limit)
+
+        with db.connection(sqlite3.Row) as conn:
+            cur = conn.cursor()
+            cur.execute(sql, params)
+            return cur.fetchall()
+
+    @staticmethod
+    def get_stock_movements(shop_id, product_id=None, start_date=None, end_date=None):
+        # Every logged stock change in a shop (optionally one product, within
+        # an inclusive day range), per product in time order. stock_change is
+        # negative for sales; qty and unit_price_cents are NULL for manual
+        # adjustments.
+        start, end_before = day_bounds(start_date, end_date)
+        filters = ""
+        params = [shop_id]
+        if product_id is not None:
+            filters = " AND a.product_id = ?"
+            params.append(product_id)
+        params.extend([start, end_before])
+
+        with db.connection(sqlite3.Row) as conn:
+            cur = conn.cursor()
+            cur.execute(
+                f"""
+                SELECT
+                    a.audit_id,
+                    a.created_at,
+                    a.action,
+                    a.entity_id,
+                    a.product_id,
+                    a.username,
+                    a.qty,
+                    a.unit_price_cents,
+                    a.stock_before,
+                    a.stock_after,
+                    a.stock_after - a.stock_before AS stock_change
+                FROM AuditLogs a
+                WHERE a.shop_id = ?{filters}
+                  AND a.stock_after IS NOT NULL
+                  AND a.created_at >= ? AND a.created_at < ?
+                ORDER BY a.product_id, a.created_at, a.audit_id
+                """,
+                params,
+            )
+            return cur.fetchall()
+
+    @staticmethod
+    def get_stock_movement_totals(shop_id, start_date=None, end_date=None):
+        # Per product in a shop: units sold, units purchased, the net effect
+        # of manual adjustments and the overall net change, over an inclusive
+        # day range. Reads only idx_auditlogs_stock_movements.
+        start, end_before = day_bounds(start_date, end_date)
+        with db.connection(sqlite3.Row) as conn:
+            cur = conn.cursor()
+            cur.execute(
+                """
+                SELECT
+                    a.product_id,
+                    COUNT(*) AS movements,
+                    COALESCE(SUM(CASE WHEN a.action = 'SALE_ADD' THEN a.qty END), 0) AS sold_qty,
+                    COALESCE(SUM(CASE WHEN a.action = 'PURCHASE_ADD' THEN a.qty END), 0) AS purchased_qty,
+                    COALESCE(SUM(CASE WHEN a.action = 'STOCK_ADJUST'
+                                      THEN a.stock_after - a.stock_before END), 0) AS adjusted_qty,
+                    SUM(a.stock_after - a.stock_before) AS net_change
+                FROM AuditLogs a
+                WHERE a.shop_id = ?
+                  AND a.stock_after IS NOT NULL
+                  AND a.created_at >= ? AND a.created_at < ?
+                GROUP BY a.product_id
+                ORDER BY a.product_id
+                """,
+                (shop_id, start, end_before),
+            )
+            return cur.fetchall()
+
+    @staticmethod
+    def get_facets(refresh=False):
+        # {"username": [...], "action": [...]}: every value in the table,
+        # sorted, for the viewer's filter combos.
+        return _facets.get(AuditLogModel._load_facets, refresh)
 
-        sql += " ORDER BY audit_id DESC LIMIT ?"
-        params.append(limit)
+    @staticmethod
+    def _load_facets():
+        # A loose index scan: one seek on idx_auditlogs_username /
+        # idx_auditlogs_action per distinct value, instead of a DISTINCT
+        # that reads every row.
+        with db.connection() as conn:
+            return {
+                column: [
+                    row[0] for row in conn.execute(f"""
+                        WITH RECURSIVE facet AS (
+                            SELECT MIN({column}) AS value FROM AuditLogs
+                            UNION ALL
+                            SELECT (
+                                SELECT MIN({column}) FROM AuditLogs
+                                WHERE {column} > facet.value
+                            )
+                            FROM facet
+                            WHERE facet.value IS NOT NULL
+                        )
+                        SELECT value FROM facet WHERE value IS NOT NULL AND value != ''
+                    """)
+                ]
+                for column in FACET_COLUMNS
+            }
 
-        cur.execute(sql, params)
-        rows = cur.fetchall()
-        conn.close()
-        return rows
+    @staticmethod
+    def rebuild_search_index():
+        # Re-derives AuditLogSearch from AuditLogs and merges its segments.
+        with db.transaction() as conn:
+            conn.execute("INSERT INTO AuditLogSearch (AuditLogSearch) VALUES ('rebuild')")
+            conn.execute("INSERT INTO AuditLogSearch (AuditLogSearch) VALUES ('optimize')")
+            return conn.execute("SELECT COUNT(*) FROM AuditLogs").fetchone()[0]
+
+    @staticmethod
+    def merge_search_index(should_stop=None, pages=500):
+        # After bulk deletes: merges AuditLogSearch's segments (dropping the
+        # entries of deleted rows) a few hundred pages per transaction, so
+        # live writers never wait long, unlike a single 'optimize'.
+        while not (should_stop and should_stop()):
+            with db.transaction() as conn:
+                before = conn.total_changes
+                conn.execute(
+                    "INSERT INTO AuditLogSearch (AuditLogSearch, rank) VALUES ('merge', ?)",
+                    (-pages,),
+                )
+                if conn.total_changes - before < 2:
+                    return
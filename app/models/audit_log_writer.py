@@ -0,0 +1,127 @@
+import atexit
+import queue
+import threading
+import time
+from datetime import datetime
+
+from app.db.database_init import db
+from app.models.audit_log_model import AuditLogModel
+
+_STOP = object()
+
+
+class AuditLogWriter:
+    # Takes audit entries off the caller's thread. While started, log() only
+    # queues the entry; a background thread writes everything that has
+    # queued up in one transaction, so a burst of entries costs one commit.
+    # While stopped (the default, e.g. in scripts) log() writes synchronously
+    # like AuditLogModel.log. Callers that already hold a transaction use
+    # AuditLogModel.create_with_cursor instead, so the entry commits or rolls
+    # back with their change.
+
+    def __init__(self, manager, max_batch=500, retry_delay=1.0, attempts_at_stop=3):
+        self.manager = manager
+        self.max_batch = max_batch
+        self.retry_delay = retry_delay
+        self.attempts_at_stop = attempts_at_stop
+        self._queue = queue.Queue()
+        self._state = threading.Condition()
+        self._accepting = False
+        self._queued = 0
+        self._settled = 0
+        self._thread = None
+        self._atexit_registered = False
+
+    def start(self):
+        with self._state:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(
+                target=self._run, name="audit-writer", daemon=True
+            )
+            self._thread.start()
+            self._accepting = True
+        if not self._atexit_registered:
+            # Runs before the daemon thread is abandoned at interpreter exit.
+            atexit.register(self.stop)
+            self._atexit_registered = True
+
+    def is_running(self):
+        with self._state:
+            return self._accepting
+
+    def stop(self):
+        # Writes everything queued so far, then ends the thread.
+        with self._state:
+            if not self._accepting:
+                return
+            self._accepting = False
+            thread = self._thread
+        self._queue.put(_STOP)
+        thread.join()
+        with self._state:
+            self._thread = None
+
+    def flush(self, timeout=None):
+        # Waits until every entry queued before the call has been written.
+        with self._state:
+            target = self._queued
+            return self._state.wait_for(lambda: self._settled >= target, timeout)
+
+    def log(self, action, entity_type, **fields):
+        # Same arguments as AuditLogModel.log. A queued entry keeps the time
+        # it was logged, not the time it is written.
+        with self._state:
+            if self._accepting:
+                self._queued += 1
+                self._queue.put({
+                    "action": action,
+                    "entity_type": entity_type,
+                    "created_at": datetime.now().isoformat(timespec="seconds"),
+                    **fields,
+                })
+                return
+        AuditLogModel.log(action, entity_type, **fields)
+
+    def _run(self):
+        batch = []
+        stopping = False
+        failures = 0
+        while batch or not stopping:
+            if not stopping:
+                # Block only while there is nothing to write.
+                block = not batch
+                try:
+                    while len(batch) < self.max_batch:
+                        item = self._queue.get(block=block)
+                        block = False
+                        if item is _STOP:
+                            stopping = True
+                            break
+                        batch.append(item)
+                except queue.Empty:
+                    pass
+
+            if not batch:
+                continue
+            try:
+                with self.manager.transaction() as conn:
+                    AuditLogModel.create_many_with_cursor(conn.cursor(), batch)
+            except Exception as e:
+                failures += 1
+                if stopping and failures >= self.attempts_at_stop:
+                    # Give up so shutdown can finish; flush() treats them as done.
+                    print(f"Audit log: {len(batch)} entries could not be written: {e}")
+                else:
+                    print(f"Audit log write failed, retrying: {e}")
+                    time.sleep(self.retry_delay)
+                    continue
+            failures = 0
+            with self._state:
+                self._settled += len(batch)
+                self._state.notify_all()
+            batch = []
+        self.manager.close_thread()
+
+
+audit_writer = AuditLogWriter(db)
@@ -0,0 +1,130 @@
+import logging
+import re
+import threading
+
+from app.db.database_init import db
+
+# Entries written before the typed stock columns existed carry their
+# quantities only in the details text. Migration 7 does not parse them at
+# start-up; it records their audit_id range in AuditStockBackfill, and the
+# backfiller fills that range in the background, one short transaction per
+# batch, deleting the row once it is done. Until then stock movement queries
+# miss the older entries not yet filled, which pending() reports.
+BATCH = 5000
+
+STOCK_DETAILS_PATTERNS = {
+    "SALE_ADD": re.compile(r": qty=(\d+), sale_price=(-?\d+\.\d{2}), stock (-?\d+) -> (-?\d+)$"),
+    "PURCHASE_ADD": re.compile(r": qty=(\d+), unit_price=(-?\d+\.\d{2}), stock (-?\d+) -> (-?\d+)$"),
+    "STOCK_ADJUST": re.compile(r": (-?\d+) -> (-?\d+)$"),
+}
+
+logger = logging.getLogger(__name__)
+
+
+def parse_stock_details(action, details):
+    # (qty, unit_price_cents, stock_before, stock_after) from a stock entry's
+    # details text, or None if it does not have one of the formats above.
+    pattern = STOCK_DETAILS_PATTERNS.get(action)
+    match = pattern.search(details or "") if pattern else None
+    if not match:
+        return None
+    if action == "STOCK_ADJUST":
+        return (None, None, int(match.group(1)), int(match.group(2)))
+    qty, price, before, after = match.groups()
+    return (int(qty), int(price.replace(".", "")), int(before), int(after))
+
+
+class AuditStockBackfill:
+    @staticmethod
+    def pending():
+        # (next_id, end_id): the audit_ids still to fill, or None when done.
+        with db.connection() as conn:
+            return conn.execute("SELECT next_id, end_id FROM AuditStockBackfill").fetchone()
+
+    @staticmethod
+    def fill_batch(batch=BATCH):
+        # Fills the next batch of entries. Returns how many got typed
+        # columns, or None once nothing is left.
+        actions = tuple(STOCK_DETAILS_PATTERNS)
+        placeholders = ",".join("?" * len(actions))
+        with db.transaction() as conn:
+            marker = conn.execute("SELECT next_id, end_id FROM AuditStockBackfill").fetchone()
+            if marker is None:
+                return None
+            next_id, end_id = marker
+            rows = conn.execute(
+                f"""
+                SELECT audit_id, action, details FROM AuditLogs
+                WHERE audit_id >= ? AND audit_id <= ? AND action IN ({placeholders})
+                ORDER BY audit_id
+                LIMIT ?
+                """,
+                (next_id, end_id, *actions, batch),
+            ).fetchall()
+
+            updates = []
+            for audit_id, action, details in rows:
+                fields = parse_stock_details(action, details)
+                if fields:
+                    updates.append((*fields, audit_id))
+            conn.executemany(
+                """
+                UPDATE AuditLogs
+                SET qty = ?, unit_price_cents = ?, stock_before = ?, stock_after = ?
+                WHERE audit_id = ?
+                """,
+                updates,
+            )
+
+            if len(rows) < batch:
+                conn.execute("DELETE FROM AuditStockBackfill")
+            else:
+                conn.execute("UPDATE AuditStockBackfill SET next_id = ?", (rows[-1][0] + 1,))
+            return len(updates)
+
+    @staticmethod
+    def fill_all(should_stop=None):
+        # Returns the number of entries filled.
+        filled = 0
+        while not (should_stop and should_stop()):
+            count = AuditStockBackfill.fill_batch()
+            if count is None:
+                break
+            filled += count
+        return filled
+
+
+class AuditStockBackfiller:
+    # Runs the backfill once per run of the app, on a background thread so
+    # start-up does not wait for it. stop() ends it after the current batch;
+    # the next run carries on from there.
+
+    def __init__(self, manager):
+        self.manager = manager
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="audit-stock-backfill", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        try:
+            AuditStockBackfill.fill_all(self._stop.is_set)
+        except Exception:
+            logger.exception("Audit stock backfill failed")
+        self.manager.close_thread()
+
+
+audit_stock_backfiller = AuditStockBackfiller(db)
@@ -0,0 +1,80 @@
+import sqlite3
+from datetime import datetime
+from app.db.database_init import db
+from app.db.migrations import PRICE_SUMMARY_FILL
+
+
+class PriceSummaryModel:
+    # ProductPriceSummary holds one row per (product, shop) with running
+    # purchase totals and the latest purchase/sale prices. It is updated in
+    # the same transaction as every Purchases/SaleItems insert, so reads are
+    # primary-key lookups instead of scans over the full history.
+
+    @staticmethod
+    def record_purchase_with_cursor(cursor, product_id, shop_id, qty, price_cents, moved_at=None):
+        cursor.execute(
+            """
+            INSERT INTO ProductPriceSummary
+            (product_id, shop_id, total_cost_cents, total_qty,
+             last_purchase_price_cents, last_movement_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT(product_id, shop_id) DO UPDATE SET
+                total_cost_cents = total_cost_cents + excluded.total_cost_cents,
+                total_qty = total_qty + excluded.total_qty,
+                last_purchase_price_cents = excluded.last_purchase_price_cents,
+                last_movement_at = excluded.last_movement_at
+            """,
+            (
+                product_id,
+                shop_id,
+                qty * price_cents,
+                qty,
+                price_cents,
+                moved_at or datetime.now().isoformat(timespec="seconds"),
+            ),
+        )
+
+    @staticmethod
+    def record_sales_with_cursor(cursor, shop_id, lines, moved_at=None):
+        # lines: (product_id, price_cents) in sale order; the last line of a
+        # product wins.
+        moved_at = moved_at or datetime.now().isoformat(timespec="seconds")
+        cursor.executemany(
+            """
+            INSERT INTO ProductPriceSummary
+            (product_id, shop_id, last_sale_price_cents, last_movement_at)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT(product_id, shop_id) DO UPDATE SET
+                last_sale_price_cents = excluded.last_sale_price_cents,
+                last_movement_at = excluded.last_movement_at
+            """,
+            [(product_id, shop_id, price_cents, moved_at) for product_id, price_cents in lines],
+        )
+
+    @staticmethod
+    def get(product_id, shop_id):
+        with db.connection(sqlite3.Row) as conn:
+            cur = conn.cursor()
+            cur.execute(
+                """
+                SELECT product_id, shop_id, total_cost_cents, total_qty,
+                       last_purchase_price_cents, last_sale_price_cents,
+                       last_movement_at
+                FROM ProductPriceSummary
+                WHERE product_id = ? AND shop_id = ?
+                """,
+                (product_id, shop_id),
+            )
+            return cur.fetchone()
+
+    @staticmethod
+    def rebuild_with_cursor(cursor):
+        cursor.execute("DELETE FROM ProductPriceSummary")
+        cursor.execute(PRICE_SUMMARY_FILL.format(cents="_cents"))
+        cursor.execute("SELECT COUNT(*) FROM ProductPriceSummary")
+        return cursor.fetchone()[0]
+
+    @staticmethod
+    def rebuild():
+        with db.transaction() as conn:
+            return PriceSummaryModel.rebuild_with_cursor(conn.cursor())
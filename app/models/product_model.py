@@ -1,98 +1,120 @@
 import sqlite3
-from app.db.database_init import get_connection
+from app.db.database_init import db
 
 class ProductModel:
 
     @staticmethod
     def create(name):
-        conn = get_connection()
-        c = conn.cursor()
-        c.execute("INSERT INTO Products (name) VALUES (?)", (name,))
-        product_id = c.lastrowid
-        conn.commit()
-        conn.close()
-        return product_id
+        with db.transaction() as conn:
+            c = conn.cursor()
+            c.execute("INSERT INTO Products (name) VALUES (?)", (name,))
+            return c.lastrowid
 
     @staticmethod
     def get_all():
-        conn = get_connection()
-        c = conn.cursor()
-        c.execute("SELECT product_id, name FROM Products ORDER BY name")
-        rows = c.fetchall()
-        conn.close()
-        return rows
+        with db.connection() as conn:
+            c = conn.cursor()
+            c.execute("SELECT product_id, name FROM Products ORDER BY name")
+            return c.fetchall()
 
     @staticmethod
     def find_by_name(name):
-        conn = get_connection()
-        c = conn.cursor()
-        c.execute(
-            "SELECT product_id FROM Products WHERE LOWER(name)=?",
-            (name.lower(),)
-        )
-        row = c.fetchone()
-        conn.close()
+        with db.connection() as conn:
+            c = conn.cursor()
+            c.execute(
+                "SELECT product_id FROM Products WHERE LOWER(name)=?",
+                (name.lower(),)
+            )
+            row = c.fetchone()
         return row[0] if row else None
 
     @staticmethod
     def exists_name(name, exclude_product_id=None):
-        conn = get_connection()
-        c = conn.cursor()
-        if exclude_product_id is None:
-            c.execute(
-                "SELECT 1 FROM Products WHERE LOWER(name)=?",
-                (name.lower(),)
-            )
-        else:
-            c.execute(
-                "SELECT 1 FROM Products WHERE LOWER(name)=? AND product_id != ?",
-                (name.lower(), exclude_product_id)
-            )
-        exists = c.fetchone() is not None
-        conn.close()
-        return exists
+        with db.connection() as conn:
+            c = conn.cursor()
+            if exclude_product_id is None:
+                c.execute(
+                    "SELECT 1 FROM Products WHERE LOWER(name)=?",
+                    (name.lower(),)
+                )
+            else:
+                c.execute(
+                    "SELECT 1 FROM Products WHERE LOWER(name)=? AND product_id != ?",
+                    (name.lower(), exclude_product_id)
+                )
+            return c.fetchone() is not None
     
     @staticmethod
     def get_by_shop(shop_id):
-        conn = get_connection(sqlite3.Row)
-        cur = conn.cursor()
+        with db.connection(sqlite3.Row) as conn:
+            cur = conn.cursor()
 
-        cur.execute("""
-            SELECT
-                p.product_id,
-                p.name AS product_name,
-                s.quantity
-            FROM Products p
-            JOIN Stock s ON p.product_id = s.product_id
-            WHERE s.shop_id = ?
-            ORDER BY product_name COLLATE NOCASE ASC
-        """, (shop_id,))
+            cur.execute("""
+                SELECT
+                    p.product_id,
+                    p.name AS product_name,
+                    s.quantity
+                FROM Products p
+                JOIN Stock s ON p.product_id = s.product_id
+                WHERE s.shop_id = ?
+                ORDER BY product_name COLLATE NOCASE ASC
+            """, (shop_id,))
 
-        rows = cur.fetchall()
-        conn.close()
-        return rows
+            return cur.fetchall()
     
+    @staticmethod
+    def get_shop_summary(shop_id, product_ids=None):
+        # Stock plus the maintained price summary for every product in the
+        # shop (or just `product_ids`) in one round trip.
+        params = [shop_id]
+        product_filter = ""
+        if product_ids is not None:
+            product_ids = list(product_ids)
+            if not product_ids:
+                return []
+            placeholders = ",".join("?" * len(product_ids))
+            product_filter = f"AND st.product_id IN ({placeholders})"
+            params.extend(product_ids)
+
+        with db.connection(sqlite3.Row) as conn:
+            cur = conn.cursor()
+
+            cur.execute(f"""
+                SELECT
+                    p.product_id,
+                    p.name AS product_name,
+                    st.quantity,
+                    ps.total_cost_cents,
+                    ps.total_qty,
+                    ps.last_purchase_price_cents AS last_purchase_cents,
+                    ps.last_sale_price_cents AS last_sale_cents
+                FROM Stock st
+                JOIN Products p ON p.product_id = st.product_id
+                LEFT JOIN ProductPriceSummary ps
+                    ON ps.product_id = st.product_id AND ps.shop_id = st.shop_id
+                WHERE st.shop_id = ? {product_filter}
+                ORDER BY product_name COLLATE NOCASE ASC
+            """, params)
+
+            return cur.fetchall()
+
     @staticmethod
     def get_by_id(product_id):
-        conn = get_connection(sqlite3.Row)
-        cur = conn.cursor()
+        with db.connection(sqlite3.Row) as conn:
+            cur = conn.cursor()
 
-        cur.execute(
-            "SELECT product_id, name FROM Products WHERE product_id=?",
-            (product_id,)
-        )
-        row = cur.fetchone()
-        conn.close()
-        return row
+            cur.execute(
+                "SELECT product_id, name FROM Products WHERE product_id=?",
+                (product_id,)
+            )
+            return cur.fetchone()
 
     @staticmethod
     def update_name(product_id, name):
-        conn = get_connection()
-        cur = conn.cursor()
+        with db.transaction() as conn:
+            cur = conn.cursor()
 
-        cur.execute(
-            "UPDATE Products SET name=? WHERE product_id=?",
-            (name, product_id)
-        )
-        conn.commit()
-        conn.close()
+            cur.execute(
+                "UPDATE Products SET name=? WHERE product_id=?",
+                (name, product_id)
+            )
@@ -1,57 +1,37 @@
-import sqlite3
-from app.db.database_init import get_connection
+from app.db.database_init import db
+from app.models.price_summary_model import PriceSummaryModel
+from app.utils.money import divide_cents
 
 class PurchaseModel:
 
     @staticmethod
-    def create(product_id, shop_id, qty, price):
-        total = qty * price
-        conn = get_connection()
-        cur = conn.cursor()
-        cur.execute("""
-            INSERT INTO Purchases (product_id, shop_id, quantity, price, total, date)
-            VALUES (?, ?, ?, ?, ?, date('now'))
-        """, (product_id, shop_id, qty, price, total))
-        purchase_id = cur.lastrowid
-        conn.commit()
-        conn.close()
-        return purchase_id
+    def create(product_id, shop_id, qty, price_cents):
+        with db.transaction() as conn:
+            return PurchaseModel.create_with_cursor(
+                conn.cursor(), product_id, shop_id, qty, price_cents
+            )
 
     @staticmethod
-    def create_with_cursor(cur, product_id, shop_id, qty, price):
-        total = qty * price
+    def create_with_cursor(cur, product_id, shop_id, qty, price_cents):
+        total_cents = qty * price_cents
         cur.execute("""
-            INSERT INTO Purchases (product_id, shop_id, quantity, price, total, date)
+            INSERT INTO Purchases (product_id, shop_id, quantity, price_cents, total_cents, date)
             VALUES (?, ?, ?, ?, ?, date('now'))
-        """, (product_id, shop_id, qty, price, total))
-        return cur.lastrowid
+        """, (product_id, shop_id, qty, price_cents, total_cents))
+        purchase_id = cur.lastrowid
+        PriceSummaryModel.record_purchase_with_cursor(
+            cur, product_id, shop_id, qty, price_cents
+        )
+        return purchase_id
 
     @staticmethod
     def last_price(product_id, shop_id):
-        conn = get_connection(sqlite3.Row)
-        cur = conn.cursor()
-        cur.execute("""
-            SELECT price FROM Purchases
-            WHERE product_id=? AND shop_id=?
-            ORDER BY purchase_id DESC
-            LIMIT 1
-        """, (product_id, shop_id))
-        row = cur.fetchone()
-        conn.close()
-        return row["price"] if row else None
+        row = PriceSummaryModel.get(product_id, shop_id)
+        return row["last_purchase_price_cents"] if row else None
 
     @staticmethod
     def avg_price(product_id, shop_id):
-        conn = get_connection(sqlite3.Row)
-        cur = conn.cursor()
-        cur.execute("""
-            SELECT SUM(quantity * price) AS total_cost,
-                   SUM(quantity) AS total_qty
-            FROM Purchases
-            WHERE product_id=? AND shop_id=?
-        """, (product_id, shop_id))
-        row = cur.fetchone()
-        conn.close()
+        row = PriceSummaryModel.get(product_id, shop_id)
         if row and row["total_qty"]:
-            return row["total_cost"] / row["total_qty"]
+            return divide_cents(row["total_cost_cents"], row["total_qty"])
         return None
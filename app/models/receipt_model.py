@@ -1,20 +1,17 @@
 from datetime import datetime
-from app.db.database_init import get_connection
+from app.db.database_init import db
 
 
 class ReceiptModel:
     @staticmethod
     def create(sale_id, file_path):
-        conn = get_connection()
-        cur = conn.cursor()
-        cur.execute(
-            """
-            INSERT INTO Receipts (sale_id, file_path, date)
-            VALUES (?, ?, ?)
-            """,
-            (sale_id, file_path, datetime.now().isoformat(timespec="seconds")),
-        )
-        receipt_id = cur.lastrowid
-        conn.commit()
-        conn.close()
-        return receipt_id
+        with db.transaction() as conn:
+            cur = conn.cursor()
+            cur.execute(
+                """
+                INSERT INTO Receipts (sale_id, file_path, date)
+                VALUES (?, ?, ?)
+                """,
+                (sale_id, file_path, datetime.now().isoformat(timespec="seconds")),
+            )
+            return cur.lastrowid
@@ -0,0 +1,106 @@
+import sqlite3
+from app.db.database_init import db
+from app.utils.date_range import day_bounds
+
+# As-of purchase cost for every sale line of a shop: the price of the latest
+# purchase of that product in that shop dated on or before the sale day
+# (ties on the same day go to the highest purchase_id).
+#
+# Instead of a correlated "latest purchase" subquery per sale line, purchases
+# and sale lines are merged into one stream per product ordered by
+# (day, purchases-before-sales, id). A running COUNT of purchases numbers the
+# segments, so every sale line shares its segment with exactly one purchase:
+# the one in effect on that day. One sort, one pass.
+SALE_ITEM_COSTS_CTE = """
+    WITH movements AS (
+        SELECT
+            p.product_id,
+            date(p.date) AS day,
+            0 AS kind,
+            p.purchase_id AS seq,
+            p.price_cents AS purchase_price_cents,
+            NULL AS sale_item_id
+        FROM Purchases p
+        WHERE p.shop_id = :shop_id
+          AND p.date < :end_before
+        UNION ALL
+        SELECT
+            si.product_id,
+            date(s.date) AS day,
+            1 AS kind,
+            si.sale_item_id AS seq,
+            NULL AS purchase_price_cents,
+            si.sale_item_id
+        FROM SaleItems si
+        JOIN Sales s ON s.sale_id = si.sale_id
+        WHERE s.shop_id = :shop_id
+          AND s.date >= :start
+          AND s.date < :end_before
+    ),
+    segmented AS (
+        SELECT
+            product_id,
+            sale_item_id,
+            purchase_price_cents,
+            COUNT(purchase_price_cents) OVER (
+                PARTITION BY product_id
+                ORDER BY day, kind, seq
+                ROWS UNBOUNDED PRECEDING
+            ) AS segment
+        FROM movements
+    ),
+    sale_item_costs AS (
+        SELECT sale_item_id, purchase_price_cents
+        FROM (
+            SELECT
+                sale_item_id,
+                MAX(purchase_price_cents) OVER (
+                    PARTITION BY product_id, segment
+                ) AS purchase_price_cents
+            FROM segmented
+        )
+        WHERE sale_item_id IS NOT NULL
+    )
+"""
+
+
+class SaleCostModel:
+
+    @staticmethod
+    def _params(shop_id, start_date, end_date):
+        # Open-ended ranges use sentinel bounds so the date filters stay
+        # sargable.
+        start, end_before = day_bounds(start_date, end_date)
+        return {
+            "shop_id": shop_id,
+            "start": start,
+            "end_before": end_before,
+        }
+
+    @staticmethod
+    def query(select_sql, shop_id, start_date=None, end_date=None):
+        # select_sql may read from the sale_item_costs CTE
+        # (sale_item_id, purchase_price_cents); purchase_price_cents is NULL
+        # when no purchase preceded the sale.
+        params = SaleCostModel._params(shop_id, start_date, end_date)
+        with db.connection(sqlite3.Row) as conn:
+            cur = conn.cursor()
+            cur.execute(SALE_ITEM_COSTS_CTE + select_sql, params)
+            return cur.fetchall()
+
+    @staticmethod
+    def iter_query(select_sql, shop_id, start_date=None, end_date=None, chunk_size=1000):
+        # Like query(), but yields the rows in fetchmany() chunks so callers
+        # never hold the whole result. Consume it on one thread.
+        params = SaleCostModel._params(shop_id, start_date, end_date)
+        with db.connection(sqlite3.Row) as conn:
+            cur = conn.cursor()
+            try:
+                cur.execute(SALE_ITEM_COSTS_CTE + select_sql, params)
+                while True:
+                    rows = cur.fetchmany(chunk_size)
+                    if not rows:
+                        return
+                    yield rows
+            finally:
+                cur.close()
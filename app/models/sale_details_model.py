@@ -1,23 +1,22 @@
 import sqlite3
 from datetime import datetime
-from app.db.database_init import get_connection
+from app.db.database_init import db
 
 class SaleDetailsModel:
 
     @staticmethod
     def get_sale_header(sale_id):
-        conn = get_connection(sqlite3.Row)
-        cur = conn.cursor()
+        with db.connection(sqlite3.Row) as conn:
+            cur = conn.cursor()
 
-        cur.execute("""
-            SELECT s.sale_id, s.shop_id, sh.shop_name, s.date, s.grand_total
-            FROM Sales s
-            JOIN Shops sh ON sh.shop_id = s.shop_id
-            WHERE sale_id = ?
-        """, (sale_id,))
+            cur.execute("""
+                SELECT s.sale_id, s.shop_id, sh.shop_name, s.date, s.grand_total_cents
+                FROM Sales s
+                JOIN Shops sh ON sh.shop_id = s.shop_id
+                WHERE sale_id = ?
+            """, (sale_id,))
 
-        row = cur.fetchone()
-        conn.close()
+            row = cur.fetchone()
 
         if not row:
             return None
@@ -29,27 +28,25 @@ class SaleDetailsModel:
             "shop_id": row["shop_id"],
             "shop_name": row["shop_name"],
             "date": dt.strftime("%B %d, %Y %I:%M %p"),
-            "grand_total": row["grand_total"]
+            "grand_total_cents": row["grand_total_cents"]
         }
 
     @staticmethod
     def get_sale_items(sale_id):
-        conn = get_connection(sqlite3.Row)
-        cur = conn.cursor()
-
-        cur.execute("""
-            SELECT 
-                si.product_id,
-                p.name AS product_name,
-                si.quantity,
-                si.price_per_unit,
-                si.line_total
-            FROM SaleItems si
-            JOIN Products p ON p.product_id = si.product_id
-            WHERE si.sale_id = ?
-            ORDER BY p.name
-        """, (sale_id,))
-
-        rows = cur.fetchall()
-        conn.close()
-        return rows
+        with db.connection(sqlite3.Row) as conn:
+            cur = conn.cursor()
+
+            cur.execute("""
+                SELECT 
+                    si.product_id,
+                    p.name AS product_name,
+                    si.quantity,
+                    si.price_per_unit_cents,
+                    si.line_total_cents
+                FROM SaleItems si
+                JOIN Products p ON p.product_id = si.product_id
+                WHERE si.sale_id = ?
+                ORDER BY p.name
+            """, (sale_id,))
+
+            return cur.fetchall()
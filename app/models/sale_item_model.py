@@ -1,15 +1,13 @@
 import sqlite3
-from app.db.database_init import get_connection
+from app.db.database_init import db
 
 class SaleItemModel:
 
     @staticmethod
-    def create(sale_id, product_id, qty, price, subtotal):
-        conn = get_connection()
-        c = conn.cursor()
-        c.execute("""
-            INSERT INTO SaleItems (sale_id, product_id, quantity, price_per_unit, line_total)
-            VALUES (?, ?, ?, ?, ?)
-        """, (sale_id, product_id, qty, price, subtotal))
-        conn.commit()
-        conn.close()
+    def create(sale_id, product_id, qty, price_cents, subtotal_cents):
+        with db.transaction() as conn:
+            c = conn.cursor()
+            c.execute("""
+                INSERT INTO SaleItems (sale_id, product_id, quantity, price_per_unit_cents, line_total_cents)
+                VALUES (?, ?, ?, ?, ?)
+            """, (sale_id, product_id, qty, price_cents, subtotal_cents))
@@ -1,125 +1,227 @@
 import sqlite3
 from datetime import datetime
-from app.db.database_init import get_connection
+from functools import lru_cache
+from app.db.database_init import db
 from app.models.audit_log_model import AuditLogModel
+from app.models.price_summary_model import PriceSummaryModel
+from app.models.stock_model import StockModel
+from app.utils.date_range import day_bounds
+from app.utils.money import format_money
+
+SALE_DATE_FORMAT = "%B %d, %Y %I:%M %p"
+SALES_PAGE_SIZE = 200
+
+
+@lru_cache(maxsize=4096)
+def format_sale_date(iso_date):
+    return datetime.fromisoformat(iso_date).strftime(SALE_DATE_FORMAT)
+
 
 class SaleModel:
 
     @staticmethod
-    def create(shop_id, total, date):
-        conn = get_connection()
-        c = conn.cursor()
-        c.execute(
-            "INSERT INTO Sales (shop_id, date, grand_total) VALUES (?, ?, ?)",
-            (shop_id, date, total)
-        )
-        sale_id = c.lastrowid
-        conn.commit()
-        conn.close()
-        return sale_id
+    def create(shop_id, total_cents, date):
+        with db.transaction() as conn:
+            c = conn.cursor()
+            c.execute(
+                "INSERT INTO Sales (shop_id, date, grand_total_cents) VALUES (?, ?, ?)",
+                (shop_id, date, total_cents)
+            )
+            return c.lastrowid
     
     @staticmethod
     def last_price(product_id, shop_id):
-        conn = get_connection(sqlite3.Row)
-        cur = conn.cursor()
-        cur.execute("""
-            SELECT si.price_per_unit
-            FROM SaleItems si
-            JOIN Sales s ON s.sale_id = si.sale_id
-            WHERE si.product_id=? AND s.shop_id=?
-            ORDER BY si.sale_item_id DESC
-            LIMIT 1
-        """, (product_id, shop_id))
-        row = cur.fetchone()
-        conn.close()
-        return row["price_per_unit"] if row else None
+        row = PriceSummaryModel.get(product_id, shop_id)
+        return row["last_sale_price_cents"] if row else None
     
     @staticmethod
     def get_sales_by_shop_and_date(shop_id, start_date, end_date):
-        conn = get_connection(sqlite3.Row)
-        cur = conn.cursor()
-
-        cur.execute("""
-            SELECT sale_id, date, grand_total
-            FROM Sales
-            WHERE shop_id = ?
-              AND date(date) BETWEEN date(?) AND date(?)
-            ORDER BY sale_id DESC
-        """, (shop_id, start_date, end_date))
-
-        rows = cur.fetchall()
-        conn.close()
+        start, end_before = day_bounds(start_date, end_date)
+        with db.connection(sqlite3.Row) as conn:
+            cur = conn.cursor()
+
+            cur.execute("""
+                SELECT sale_id, date, grand_total_cents
+                FROM Sales
+                WHERE shop_id = ?
+                  AND date >= ? AND date < ?
+                ORDER BY date DESC, sale_id DESC
+            """, (shop_id, start, end_before))
+
+            rows = cur.fetchall()
+
         formatted = []
         for r in rows:
-            dt = datetime.fromisoformat(r["date"])
             formatted.append({
                 "sale_id": r["sale_id"],
-                "date": dt.strftime("%B %d, %Y %I:%M %p"),
-                "grand_total": r["grand_total"]
+                "date": format_sale_date(r["date"]),
+                "grand_total_cents": r["grand_total_cents"]
             })
 
         return formatted
+
+    @staticmethod
+    def count_sales(shop_id, start_date, end_date):
+        start, end_before = day_bounds(start_date, end_date)
+        with db.connection() as conn:
+            cur = conn.cursor()
+            cur.execute("""
+                SELECT COUNT(*)
+                FROM Sales
+                WHERE shop_id = ?
+                  AND date >= ? AND date < ?
+            """, (shop_id, start, end_before))
+            return cur.fetchone()[0]
+
+    @staticmethod
+    def iter_sales(shop_id, start_date, end_date, chunk_size=1000):
+        # The rows of get_sales_by_shop_and_date as raw (sale_id, iso_date,
+        # grand_total_cents) tuples, in fetchmany() chunks, for exports that
+        # must not hold the whole range. Consume it on one thread.
+        start, end_before = day_bounds(start_date, end_date)
+        with db.connection() as conn:
+            cur = conn.cursor()
+            try:
+                cur.execute("""
+                    SELECT sale_id, date, grand_total_cents
+                    FROM Sales
+                    WHERE shop_id = ?
+                      AND date >= ? AND date < ?
+                    ORDER BY date DESC, sale_id DESC
+                """, (shop_id, start, end_before))
+                while True:
+                    rows = cur.fetchmany(chunk_size)
+                    if not rows:
+                        return
+                    yield rows
+            finally:
+                cur.close()
+
+    @staticmethod
+    def get_sales_page(shop_id, start_date, end_date, after=None, limit=SALES_PAGE_SIZE):
+        # One keyset page of the shop's sales in the range, newest first, as
+        # raw (sale_id, iso_date, grand_total_cents) tuples. `after` is the
+        # (date, sale_id) of the previous page's last row. The cursor replaces
+        # the range's upper bound so idx_sales_shop_date (which carries the
+        # rowid) seeks straight to it and every page costs the same.
+        start, end_before = day_bounds(start_date, end_date)
+        with db.connection() as conn:
+            cur = conn.cursor()
+            if after is None:
+                cur.execute("""
+                    SELECT sale_id, date, grand_total_cents
+                    FROM Sales
+                    WHERE shop_id = ?
+                      AND date >= ? AND date < ?
+                    ORDER BY date DESC, sale_id DESC
+                    LIMIT ?
+                """, (shop_id, start, end_before, limit))
+            else:
+                after_date, after_sale_id = after
+                cur.execute("""
+                    SELECT sale_id, date, grand_total_cents
+                    FROM Sales
+                    WHERE shop_id = ?
+                      AND date >= ? AND (date, sale_id) < (?, ?)
+                    ORDER BY date DESC, sale_id DESC
+                    LIMIT ?
+                """, (shop_id, start, after_date, after_sale_id, limit))
+            return cur.fetchall()
     
     @staticmethod
     def create_sale(shop_id, date, items, actor=None):
-        conn = get_connection()
-        cur = conn.cursor()
+        # One IMMEDIATE transaction: the write lock is taken up front, stock
+        # is validated with a single query and every row type is written
+        # with one executemany, so the statement count does not grow with
+        # the number of lines. The stock read happens under the write lock
+        # and the decrement is guarded as well, so concurrent tills cannot
+        # oversell.
         actor = actor or {}
+        if not items:
+            raise ValueError("Cart is empty")
 
-        grand_total = sum(i["subtotal"] for i in items)
+        needed = {}
+        names = {}
+        for item in items:
+            pid = item["product_id"]
+            needed[pid] = needed.get(pid, 0) + item["qty"]
+            names.setdefault(pid, item["name"])
 
-        cur.execute(
-            "INSERT INTO Sales (shop_id, date, grand_total) VALUES (?, ?, ?)",
-            (shop_id, date, grand_total)
-        )
-        sale_id = cur.lastrowid
+        grand_total_cents = sum(i["subtotal_cents"] for i in items)
 
-        for item in items:
+        with db.transaction(immediate=True) as conn:
+            cur = conn.cursor()
+
+            placeholders = ",".join("?" * len(needed))
             cur.execute(
-                """
-                SELECT quantity
+                f"""
+                SELECT product_id, quantity
                 FROM Stock
-                WHERE product_id = ? AND shop_id = ?
+                WHERE shop_id = ? AND product_id IN ({placeholders})
                 """,
-                (item["product_id"], shop_id)
+                (shop_id, *needed)
             )
-            stock_row = cur.fetchone()
-            old_stock = stock_row[0] if stock_row else 0
+            stock = dict(cur.fetchall())
 
-            cur.execute("""
+            for pid, qty in needed.items():
+                if qty > stock.get(pid, 0):
+                    raise ValueError(f"Insufficient stock for {names[pid]}")
+
+            cur.execute(
+                "INSERT INTO Sales (shop_id, date, grand_total_cents) VALUES (?, ?, ?)",
+                (shop_id, date, grand_total_cents)
+            )
+            sale_id = cur.lastrowid
+
+            cur.executemany("""
                 INSERT INTO SaleItems
-                (sale_id, product_id, quantity, price_per_unit, line_total)
+                (sale_id, product_id, quantity, price_per_unit_cents, line_total_cents)
                 VALUES (?, ?, ?, ?, ?)
-            """, (
-                sale_id,
-                item["product_id"],
-                item["qty"],
-                item["price"],
-                item["subtotal"]
-            ))
+            """, [
+                (
+                    sale_id,
+                    item["product_id"],
+                    item["qty"],
+                    item["price_cents"],
+                    item["subtotal_cents"]
+                )
+                for item in items
+            ])
 
-            cur.execute("""
-                UPDATE Stock
-                SET quantity = quantity - ?
-                WHERE product_id = ? AND shop_id = ?
-            """, (item["qty"], item["product_id"], shop_id))
-
-            new_stock = old_stock - item["qty"]
-            AuditLogModel.create_with_cursor(
-                cursor=cur,
-                action="SALE_ADD",
-                entity_type="Sale",
-                entity_id=sale_id,
-                shop_id=shop_id,
-                product_id=item["product_id"],
-                user_id=actor.get("user_id"),
-                username=actor.get("username"),
-                details=(
-                    f"{item['name']}: qty={item['qty']}, sale_price={item['price']:.2f}, "
-                    f"stock {old_stock} -> {new_stock}"
-                ),
+            if not StockModel.reduce_many_with_cursor(cur, shop_id, needed.items()):
+                raise ValueError("Stock changed while saving the sale, please retry")
+
+            PriceSummaryModel.record_sales_with_cursor(
+                cur,
+                shop_id,
+                [(item["product_id"], item["price_cents"]) for item in items],
+                moved_at=date,
             )
 
-        conn.commit()
-        conn.close()
+            audit_entries = []
+            for item in items:
+                pid = item["product_id"]
+                old_stock = stock[pid]
+                new_stock = old_stock - item["qty"]
+                stock[pid] = new_stock
+                audit_entries.append({
+                    "action": "SALE_ADD",
+                    "entity_type": "Sale",
+                    "entity_id": sale_id,
+                    "shop_id": shop_id,
+                    "product_id": pid,
+                    "user_id": actor.get("user_id"),
+                    "username": actor.get("username"),
+                    "details": (
+                        f"{item['name']}: qty={item['qty']}, "
+                        f"sale_price={format_money(item['price_cents'])}, "
+                        f"stock {old_stock} -> {new_stock}"
+                    ),
+                    "qty": item["qty"],
+                    "unit_price_cents": item["price_cents"],
+                    "stock_before": old_stock,
+                    "stock_after": new_stock,
+                })
+            AuditLogModel.create_many_with_cursor(cur, audit_entries)
+
         return sale_id
@@ -1,84 +1,74 @@
 import sqlite3
-from app.db.database_init import get_connection
+from app.db.database_init import db
 
 class ShopModel:
     @staticmethod
     def get_all():
-        conn = get_connection(sqlite3.Row)
-        cur = conn.cursor()
-        cur.execute("SELECT shop_id, shop_name FROM Shops ORDER BY shop_name")
-        rows = cur.fetchall()
-        conn.close()
-        return rows
+        with db.connection(sqlite3.Row) as conn:
+            cur = conn.cursor()
+            cur.execute("SELECT shop_id, shop_name FROM Shops ORDER BY shop_name")
+            return cur.fetchall()
 
     @staticmethod
     def exists_name(name, exclude_shop_id=None):
-        conn = get_connection()
-        cur = conn.cursor()
-        if exclude_shop_id is None:
-            cur.execute(
-                "SELECT 1 FROM Shops WHERE LOWER(shop_name)=?",
-                (name.lower(),)
-            )
-        else:
-            cur.execute(
-                "SELECT 1 FROM Shops WHERE LOWER(shop_name)=? AND shop_id != ?",
-                (name.lower(), exclude_shop_id)
-            )
-        exists = cur.fetchone() is not None
-        conn.close()
-        return exists
+        with db.connection() as conn:
+            cur = conn.cursor()
+            if exclude_shop_id is None:
+                cur.execute(
+                    "SELECT 1 FROM Shops WHERE LOWER(shop_name)=?",
+                    (name.lower(),)
+                )
+            else:
+                cur.execute(
+                    "SELECT 1 FROM Shops WHERE LOWER(shop_name)=? AND shop_id != ?",
+                    (name.lower(), exclude_shop_id)
+                )
+            return cur.fetchone() is not None
 
     @staticmethod
     def create(name):
-        conn = get_connection()
-        cur = conn.cursor()
-        cur.execute("INSERT INTO Shops (shop_name) VALUES (?)", (name,))
-        shop_id = cur.lastrowid
+        with db.transaction() as conn:
+            cur = conn.cursor()
+            cur.execute("INSERT INTO Shops (shop_name) VALUES (?)", (name,))
+            shop_id = cur.lastrowid
 
-        cur.execute("SELECT product_id FROM Products")
-        product_rows = cur.fetchall()
-        for (product_id,) in product_rows:
-            cur.execute(
-                """
-                INSERT INTO Stock (product_id, shop_id, quantity)
-                VALUES (?, ?, 0)
-                ON CONFLICT(product_id, shop_id) DO UPDATE
-                SET quantity = excluded.quantity
-                """,
-                (product_id, shop_id)
-            )
+            cur.execute("SELECT product_id FROM Products")
+            product_rows = cur.fetchall()
+            for (product_id,) in product_rows:
+                cur.execute(
+                    """
+                    INSERT INTO Stock (product_id, shop_id, quantity)
+                    VALUES (?, ?, 0)
+                    ON CONFLICT(product_id, shop_id) DO UPDATE
+                    SET quantity = excluded.quantity
+                    """,
+                    (product_id, shop_id)
+                )
 
-        conn.commit()
-        conn.close()
         return shop_id
 
     @staticmethod
     def update_name(shop_id, name):
-        conn = get_connection()
-        cur = conn.cursor()
-        cur.execute(
-            "UPDATE Shops SET shop_name=? WHERE shop_id=?",
-            (name, shop_id)
-        )
-        conn.commit()
-        conn.close()
+        with db.transaction() as conn:
+            cur = conn.cursor()
+            cur.execute(
+                "UPDATE Shops SET shop_name=? WHERE shop_id=?",
+                (name, shop_id)
+            )
 
     @staticmethod
     def get_delete_blockers(shop_id):
-        conn = get_connection()
-        cur = conn.cursor()
-
-        cur.execute("SELECT COUNT(*) FROM Sales WHERE shop_id=?", (shop_id,))
-        sales_count = cur.fetchone()[0]
+        with db.connection() as conn:
+            cur = conn.cursor()
 
-        cur.execute("SELECT COUNT(*) FROM Purchases WHERE shop_id=?", (shop_id,))
-        purchases_count = cur.fetchone()[0]
+            cur.execute("SELECT COUNT(*) FROM Sales WHERE shop_id=?", (shop_id,))
+            sales_count = cur.fetchone()[0]
 
-        cur.execute("SELECT COALESCE(SUM(quantity), 0) FROM Stock WHERE shop_id=?", (shop_id,))
-        stock_qty = cur.fetchone()[0]
+            cur.execute("SELECT COUNT(*) FROM Purchases WHERE shop_id=?", (shop_id,))
+            purchases_count = cur.fetchone()[0]
 
-        conn.close()
+            cur.execute("SELECT COALESCE(SUM(quantity), 0) FROM Stock WHERE shop_id=?", (shop_id,))
+            stock_qty = cur.fetchone()[0]
 
         reasons = []
         if sales_count > 0:
@@ -91,9 +81,7 @@ class ShopModel:
 
     @staticmethod
     def delete(shop_id):
-        conn = get_connection()
-        cur = conn.cursor()
-        cur.execute("DELETE FROM Stock WHERE shop_id=?", (shop_id,))
-        cur.execute("DELETE FROM Shops WHERE shop_id=?", (shop_id,))
-        conn.commit()
-        conn.close()
+        with db.transaction() as conn:
+            cur = conn.cursor()
+            cur.execute("DELETE FROM Stock WHERE shop_id=?", (shop_id,))
+            cur.execute("DELETE FROM Shops WHERE shop_id=?", (shop_id,))
@@ -1,39 +1,28 @@
 import sqlite3
-from app.db.database_init import get_connection
+from app.db.database_init import db
 
 class StockModel:
 
     @staticmethod
     def create(product_id, shop_id, quantity=0):
-        conn = get_connection()
-        c = conn.cursor()
-        c.execute(
-            """
-            INSERT INTO Stock (product_id, shop_id, quantity)
-            VALUES (?, ?, ?)
-            ON CONFLICT(product_id, shop_id) DO UPDATE
-            SET quantity = excluded.quantity
-            """,
-            (product_id, shop_id, quantity)
-        )
-        conn.commit()
-        conn.close()
+        with db.transaction() as conn:
+            c = conn.cursor()
+            c.execute(
+                """
+                INSERT INTO Stock (product_id, shop_id, quantity)
+                VALUES (?, ?, ?)
+                ON CONFLICT(product_id, shop_id) DO UPDATE
+                SET quantity = excluded.quantity
+                """,
+                (product_id, shop_id, quantity)
+            )
 
     @staticmethod
     def increase(product_id, shop_id, qty):
-        conn = get_connection()
-        c = conn.cursor()
-        c.execute(
-            """
-            INSERT INTO Stock (product_id, shop_id, quantity)
-            VALUES (?, ?, ?)
-            ON CONFLICT(product_id, shop_id) DO UPDATE
-            SET quantity = quantity + excluded.quantity
-            """,
-            (product_id, shop_id, qty)
-        )
-        conn.commit()
-        conn.close()
+        with db.transaction() as conn:
+            StockModel.increase_with_cursor(
+                conn.cursor(), product_id, shop_id, qty
+            )
 
     @staticmethod
     def increase_with_cursor(cursor, product_id, shop_id, qty):
@@ -49,67 +38,67 @@ class StockModel:
 
     @staticmethod
     def get_for_product(product_id, shop_id):
-        conn = get_connection()
-        c = conn.cursor()
-        c.execute(
-            "SELECT quantity FROM Stock WHERE product_id=? AND shop_id=?",
-            (product_id, shop_id)
-        )
-        row = c.fetchone()
-        conn.close()
-        return row[0] if row else 0
+        return StockModel.get_quantity(product_id, shop_id)
 
     @staticmethod
     def reduce(product_id, shop_id, qty):
-        conn = get_connection()
-        c = conn.cursor()
-        c.execute(
-            "UPDATE Stock SET quantity = quantity - ? WHERE product_id=? AND shop_id=?",
-            (qty, product_id, shop_id)
+        with db.transaction(immediate=True) as conn:
+            if not StockModel.reduce_many_with_cursor(
+                conn.cursor(), shop_id, [(product_id, qty)]
+            ):
+                raise ValueError("Not enough stock")
+
+    @staticmethod
+    def reduce_many_with_cursor(cursor, shop_id, deltas):
+        # Conditional decrement: a row only changes while it still holds
+        # enough stock, so quantity can never go below zero no matter what
+        # was read earlier. Returns False if any product fell short; the
+        # caller must then roll back, as the other rows were decremented.
+        deltas = list(deltas)
+        cursor.executemany(
+            """
+            UPDATE Stock
+            SET quantity = quantity - ?
+            WHERE product_id = ? AND shop_id = ? AND quantity >= ?
+            """,
+            [(qty, product_id, shop_id, qty) for product_id, qty in deltas]
         )
-        conn.commit()
-        conn.close()
+        return cursor.rowcount == len(deltas)
 
     @staticmethod
     def get_products_for_shop(shop_id):
-        conn = get_connection()
-        c = conn.cursor()
-        c.execute("""
-            SELECT p.product_id, p.name, s.quantity
-            FROM Products p
-            JOIN Stock s ON p.product_id = s.product_id
-            WHERE s.shop_id = ?
-            ORDER BY p.name
-        """, (shop_id,))
-        rows = c.fetchall()
-        conn.close()
-        return rows
+        with db.connection() as conn:
+            c = conn.cursor()
+            c.execute("""
+                SELECT p.product_id, p.name, s.quantity
+                FROM Products p
+                JOIN Stock s ON p.product_id = s.product_id
+                WHERE s.shop_id = ?
+                ORDER BY p.name
+            """, (shop_id,))
+            return c.fetchall()
     
     @staticmethod
     def get_quantity(product_id, shop_id):
-        conn = get_connection()
-        c = conn.cursor()
-        c.execute(
-            "SELECT quantity FROM Stock WHERE product_id=? AND shop_id=?",
-            (product_id, shop_id)
-        )
-        row = c.fetchone()
-        conn.close()
+        with db.connection() as conn:
+            c = conn.cursor()
+            c.execute(
+                "SELECT quantity FROM Stock WHERE product_id=? AND shop_id=?",
+                (product_id, shop_id)
+            )
+            row = c.fetchone()
         return row[0] if row else 0
 
     @staticmethod
     def set_quantity(product_id, shop_id, quantity):
-        conn = get_connection()
-        c = conn.cursor()
-        c.execute(
-            """
-            INSERT INTO Stock (product_id, shop_id, quantity)
-            VALUES (?, ?, ?)
-            ON CONFLICT(product_id, shop_id) DO UPDATE
-            SET quantity = excluded.quantity
-            """,
-            (product_id, shop_id, quantity)
-        )
-
-        conn.commit()
-        conn.close()
+        with db.transaction() as conn:
+            c = conn.cursor()
+            c.execute(
+                """
+                INSERT INTO Stock (product_id, shop_id, quantity)
+                VALUES (?, ?, ?)
+                ON CONFLICT(product_id, shop_id) DO UPDATE
+                SET quantity = excluded.quantity
+                """,
+                (product_id, shop_id, quantity)
+            )
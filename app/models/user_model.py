@@ -2,7 +2,7 @@ import sqlite3
 import hashlib
 import secrets
 import hmac
-from app.db.database_init import get_connection
+from app.db.database_init import db
 
 PBKDF2_ALGO = "pbkdf2_sha256"
 PBKDF2_ITERATIONS = 200_000
@@ -56,30 +56,23 @@ class UserModel:
         if not username or not password:
             return None
 
-        conn = get_connection(sqlite3.Row)
-        cur = conn.cursor()
+        with db.connection(sqlite3.Row) as conn:
+            cur = conn.cursor()
 
-        cur.execute("""
-            SELECT user_id, username, role, status, password_hash
-            FROM Users
-            WHERE username = ?
-              AND status = 'active'
-        """, (username,))
+            cur.execute("""
+                SELECT user_id, username, role, status, password_hash
+                FROM Users
+                WHERE username = ?
+                  AND status = 'active'
+            """, (username,))
 
-        row = cur.fetchone()
+            row = cur.fetchone()
         if not row or not UserModel.verify_password(password, row["password_hash"]):
-            conn.close()
             return None
 
         if not row["password_hash"].startswith(f"{PBKDF2_ALGO}$"):
             upgraded_hash = UserModel.hash_password(password)
-            cur.execute(
-                "UPDATE Users SET password_hash = ? WHERE user_id = ?",
-                (upgraded_hash, row["user_id"])
-            )
-            conn.commit()
-
-        conn.close()
+            UserModel.update_password(row["user_id"], upgraded_hash)
 
         result = {
             "user_id": row["user_id"],
@@ -93,47 +86,40 @@ class UserModel:
 
     @staticmethod
     def create(username, password_hash, role):
-        conn = get_connection()
-        cur = conn.cursor()
+        with db.transaction() as conn:
+            cur = conn.cursor()
 
-        cur.execute("""
-            INSERT INTO Users (username, password_hash, role, status)
-            VALUES (?, ?, ?, 'active')
-        """, (username, password_hash, role))
+            cur.execute("""
+                INSERT INTO Users (username, password_hash, role, status)
+                VALUES (?, ?, ?, 'active')
+            """, (username, password_hash, role))
 
-        user_id = cur.lastrowid
-        conn.commit()
-        conn.close()
-        return user_id
+            return cur.lastrowid
 
     @staticmethod
     def exists(username):
-        conn = get_connection()
-        cur = conn.cursor()
+        with db.connection() as conn:
+            cur = conn.cursor()
 
-        cur.execute(
-            "SELECT 1 FROM Users WHERE username = ?",
-            (username,)
-        )
-        exists = cur.fetchone() is not None
-
-        conn.close()
-        return exists
+            cur.execute(
+                "SELECT 1 FROM Users WHERE username = ?",
+                (username,)
+            )
+            return cur.fetchone() is not None
 
     @staticmethod
     def get_all_staff():
-        conn = get_connection(sqlite3.Row)
-        cur = conn.cursor()
+        with db.connection(sqlite3.Row) as conn:
+            cur = conn.cursor()
 
-        cur.execute("""
-            SELECT user_id, username, role, status
-            FROM Users
-            WHERE role = 'staff'
-            ORDER BY username
-        """)
+            cur.execute("""
+                SELECT user_id, username, role, status
+                FROM Users
+                WHERE role = 'staff'
+                ORDER BY username
+            """)
 
-        rows = cur.fetchall()
-        conn.close()
+            rows = cur.fetchall()
 
         return [
             {
@@ -147,60 +133,50 @@ class UserModel:
 
     @staticmethod
     def deactivate_user(user_id):
-        conn = get_connection()
-        cur = conn.cursor()
-
-        cur.execute("""
-            UPDATE Users
-            SET status = 'inactive'
-            WHERE user_id = ?
-        """, (user_id,))
+        with db.transaction() as conn:
+            cur = conn.cursor()
 
-        conn.commit()
-        conn.close()
+            cur.execute("""
+                UPDATE Users
+                SET status = 'inactive'
+                WHERE user_id = ?
+            """, (user_id,))
 
     @staticmethod
     def update_password(user_id, password_hash):
-        conn = get_connection()
-        cur = conn.cursor()
-
-        cur.execute("""
-            UPDATE Users
-            SET password_hash = ?
-            WHERE user_id = ?
-        """, (password_hash, user_id))
+        with db.transaction() as conn:
+            cur = conn.cursor()
 
-        conn.commit()
-        conn.close()
+            cur.execute("""
+                UPDATE Users
+                SET password_hash = ?
+                WHERE user_id = ?
+            """, (password_hash, user_id))
 
     @staticmethod
     def get_by_id(user_id):
-        conn = get_connection(sqlite3.Row)
-        cur = conn.cursor()
-        cur.execute(
-            "SELECT user_id, username, role, status FROM Users WHERE user_id = ?",
-            (user_id,)
-        )
-        row = cur.fetchone()
-        conn.close()
-        return row
+        with db.connection(sqlite3.Row) as conn:
+            cur = conn.cursor()
+            cur.execute(
+                "SELECT user_id, username, role, status FROM Users WHERE user_id = ?",
+                (user_id,)
+            )
+            return cur.fetchone()
 
     @staticmethod
     def get_permissions(user_id):
-        conn = get_connection()
-        cur = conn.cursor()
-        cur.execute(
-            """
-            SELECT permission_key
-            FROM StaffPermissions
-            WHERE user_id = ?
-            ORDER BY permission_key
-            """,
-            (user_id,)
-        )
-        rows = [r[0] for r in cur.fetchall()]
-        conn.close()
-        return rows
+        with db.connection() as conn:
+            cur = conn.cursor()
+            cur.execute(
+                """
+                SELECT permission_key
+                FROM StaffPermissions
+                WHERE user_id = ?
+                ORDER BY permission_key
+                """,
+                (user_id,)
+            )
+            return [r[0] for r in cur.fetchall()]
 
     @staticmethod
     def set_permissions(user_id, permissions):
@@ -208,20 +184,18 @@ class UserModel:
             p for p in permissions
             if p in STAFF_PERMISSION_KEYS
         ))
-        conn = get_connection()
-        cur = conn.cursor()
-        cur.execute(
-            "DELETE FROM StaffPermissions WHERE user_id = ?",
-            (user_id,)
-        )
-        if valid:
-            cur.executemany(
-                """
-                INSERT INTO StaffPermissions (user_id, permission_key)
-                VALUES (?, ?)
-                """,
-                [(user_id, p) for p in valid]
+        with db.transaction() as conn:
+            cur = conn.cursor()
+            cur.execute(
+                "DELETE FROM StaffPermissions WHERE user_id = ?",
+                (user_id,)
             )
-        conn.commit()
-        conn.close()
+            if valid:
+                cur.executemany(
+                    """
+                    INSERT INTO StaffPermissions (user_id, permission_key)
+                    VALUES (?, ?)
+                    """,
+                    [(user_id, p) for p in valid]
+                )
         return valid
@@ -0,0 +1,17 @@
+from datetime import date, timedelta
+
+OPEN_START = ""
+OPEN_END = "9999-12-31"
+
+
+def day_bounds(start_date=None, end_date=None):
+    # Turns an inclusive 'YYYY-MM-DD' day range into a half-open
+    # [start, end_before) pair that can be compared directly against ISO
+    # date/timestamp TEXT columns, so filters stay index-friendly instead of
+    # wrapping the column in date(...).
+    start = start_date[:10] if start_date else OPEN_START
+    if end_date:
+        end_before = (date.fromisoformat(end_date[:10]) + timedelta(days=1)).isoformat()
+    else:
+        end_before = OPEN_END
+    return start, end_before
@@ -0,0 +1,53 @@
+import traceback
+from weakref import WeakMethod
+
+# Domain events, published by controllers after their transaction commits.
+# Payloads are keyword arguments:
+#   STOCK_CHANGED      shop_id, product_ids
+#   PRICES_CHANGED     shop_id, product_ids
+#   PRODUCTS_CREATED   shop_id, product_ids
+#   PRODUCT_RENAMED    product_id, name
+STOCK_CHANGED = "stock_changed"
+PRICES_CHANGED = "prices_changed"
+PRODUCTS_CREATED = "products_created"
+PRODUCT_RENAMED = "product_renamed"
+
+
+class EventBus:
+    # Handlers run synchronously on the publishing thread. Bound methods are
+    # held weakly, so a closed window drops out without unsubscribing. A
+    # failing handler is reported and skipped: the change it announces has
+    # already been committed.
+
+    def __init__(self):
+        self._handlers = {}
+
+    def subscribe(self, event, handler):
+        if hasattr(handler, "__self__"):
+            ref = WeakMethod(handler)
+        else:
+            ref = lambda: handler
+        self._handlers.setdefault(event, []).append(ref)
+
+    def unsubscribe(self, event, handler):
+        self._handlers[event] = [
+            ref for ref in self._handlers.get(event, ()) if ref() not in (None, handler)
+        ]
+
+    def publish(self, event, **payload):
+        refs = self._handlers.get(event)
+        if not refs:
+            return
+        live = [ref for ref in refs if ref() is not None]
+        self._handlers[event] = live
+        for ref in live:
+            handler = ref()
+            if handler is None:
+                continue
+            try:
+                handler(**payload)
+            except Exception:
+                traceback.print_exc()
+
+
+bus = EventBus()
@@ -0,0 +1,32 @@
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+
+# Money is stored and passed around as an int number of cents (minor units).
+# Sums and differences stay exact; only user input and display go through
+# the helpers below.
+CENTS_PER_UNIT = 100
+
+
+def to_cents(value):
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value * CENTS_PER_UNIT
+    try:
+        amount = Decimal(str(value).strip())
+    except InvalidOperation:
+        raise ValueError(f"Invalid amount: {value!r}")
+    if not amount.is_finite():
+        raise ValueError(f"Invalid amount: {value!r}")
+    return int((amount * CENTS_PER_UNIT).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+
+
+def divide_cents(cents, count):
+    # Integer division rounded half away from zero, e.g. an average unit cost.
+    quotient, remainder = divmod(abs(cents), count)
+    if remainder * 2 >= count:
+        quotient += 1
+    return -quotient if cents < 0 else quotient
+
+
+def format_money(cents):
+    sign = "-" if cents < 0 else ""
+    units, minor = divmod(abs(cents), CENTS_PER_UNIT)
+    return f"{sign}{units}.{minor:02d}"
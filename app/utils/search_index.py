@@ -0,0 +1,57 @@
+class SearchIndex:
+    # Case-insensitive substring search over (key, text) pairs.
+    #
+    # Texts are lower-cased once and every trigram maps to the keys whose
+    # text contains it, so a query of 3+ characters only verifies the keys
+    # in its rarest trigram's posting list. A query that contains the
+    # previous one (the user kept typing) narrows the previous result
+    # instead of starting over. Queries shorter than a trigram scan all
+    # texts, which is still a single pass over pre-lowered strings.
+
+    GRAM = 3
+
+    def __init__(self, items):
+        self.texts = {}
+        self.grams = {}
+        for key, text in items:
+            text = text.lower()
+            self.texts[key] = text
+            for gram in {text[i:i + self.GRAM] for i in range(len(text) - self.GRAM + 1)}:
+                postings = self.grams.get(gram)
+                if postings is None:
+                    self.grams[gram] = [key]
+                else:
+                    postings.append(key)
+        self._last_query = ""
+        self._last_keys = None
+
+    def __len__(self):
+        return len(self.texts)
+
+    def search(self, query):
+        # Returns the matching keys in insertion order, or None when the
+        # query is empty (everything matches).
+        query = query.strip().lower()
+        if not query:
+            self._last_query = ""
+            self._last_keys = None
+            return None
+
+        if self._last_keys is not None and self._last_query in query:
+            candidates = self._last_keys
+        elif len(query) >= self.GRAM:
+            candidates = min(
+                (
+                    self.grams.get(query[i:i + self.GRAM], ())
+                    for i in range(len(query) - self.GRAM + 1)
+                ),
+                key=len,
+            )
+        else:
+            candidates = self.texts
+
+        texts = self.texts
+        keys = [key for key in candidates if query in texts[key]]
+        self._last_query = query
+        self._last_keys = keys
+        return keys
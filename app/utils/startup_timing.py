@@ -0,0 +1,24 @@
+import time
+
+
+class StartupTimer:
+    # Milestones of one app start (imports, first paint, database ready),
+    # each reported with its own duration and the time since start.
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.marks = []
+
+    def mark(self, label):
+        self.marks.append((label, time.perf_counter()))
+
+    def report(self):
+        lines = ["Startup timing:"]
+        previous = self.started
+        for label, at in self.marks:
+            lines.append(
+                f"  {label:<24} {(at - previous) * 1000:8.1f} ms"
+                f"   (at {(at - self.started) * 1000:.1f} ms)"
+            )
+            previous = at
+        return "\n".join(lines)
@@ -1,12 +1,155 @@
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QComboBox, QLabel, QPushButton,
-    QTableWidget, QSpinBox, QLineEdit, QMessageBox, QFrame,
-    QGraphicsDropShadowEffect, QHeaderView
+    QTableView, QSpinBox, QLineEdit, QMessageBox, QHeaderView,
+    QStyledItemDelegate
 )
-from PyQt5.QtCore import Qt
-from PyQt5.QtGui import QFont, QColor
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, QRegExp
+from PyQt5.QtGui import QFont, QRegExpValidator, QStandardItem, QStandardItemModel
 
 from app.controllers.purchase_controller import PurchaseController
+from app.utils.money import format_money, to_cents
+from app.views import theme
+from app.views.remove_button_delegate import RemoveButtonDelegate
+
+PURCHASE_COLUMNS = ("Product", "Quantity", "Price", "Remove")
+
+PRODUCT_COLUMN, QTY_COLUMN, PRICE_COLUMN, REMOVE_COLUMN = range(4)
+
+# Non-negative amounts with at most two decimal places.
+PRICE_PATTERN = r"\d{0,9}(\.\d{0,2})?"
+
+
+class PurchaseLinesModel(QAbstractTableModel):
+    # Mirrors a PurchaseController's rows as one of its row observers. Edits
+    # go back through the controller, which reports them as row updates.
+
+    def __init__(self, controller, parent=None):
+        super().__init__(parent)
+        self.controller = controller
+        self._rows = list(controller.get_rows())
+        controller.add_row_observer(self)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(PURCHASE_COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return PURCHASE_COLUMNS[section]
+        return None
+
+    def flags(self, index):
+        flags = super().flags(index)
+        if index.column() != REMOVE_COLUMN:
+            flags |= Qt.ItemIsEditable
+        return flags
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or role not in (Qt.DisplayRole, Qt.EditRole):
+            return None
+        item = self._rows[index.row()]
+        col = index.column()
+
+        if col == PRODUCT_COLUMN:
+            return item["name"]
+        if col == QTY_COLUMN:
+            return item["qty"]
+        if col == PRICE_COLUMN:
+            if item["price_cents"] is None:
+                return ""
+            return format_money(item["price_cents"])
+        return "✕"
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if not index.isValid() or role != Qt.EditRole:
+            return False
+        col = index.column()
+
+        if col == PRODUCT_COLUMN:
+            fields = {"name": value.strip()}
+        elif col == QTY_COLUMN:
+            fields = {"qty": int(value)}
+        elif col == PRICE_COLUMN:
+            value = value.strip()
+            try:
+                fields = {"price_cents": to_cents(value) if value else None}
+            except ValueError:
+                return False
+        else:
+            return False
+        self.controller.update_row(index.row(), **fields)
+        return True
+
+    def row_inserted(self, row):
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._rows.insert(row, self.controller.get_rows()[row])
+        self.endInsertRows()
+
+    def row_updated(self, row):
+        self.dataChanged.emit(self.index(row, 0), self.index(row, REMOVE_COLUMN - 1))
+
+    def row_removed(self, row):
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self._rows[row]
+        self.endRemoveRows()
+
+
+class PurchaseLineDelegate(QStyledItemDelegate):
+    # Editors exist only while a cell is being edited, so a purchase with
+    # many lines holds one editor instead of a combo, spin box and line
+    # edit per line. Product combos share the window's product list.
+
+    def __init__(self, product_list, parent=None):
+        super().__init__(parent)
+        self.product_list = product_list
+
+    def createEditor(self, parent, option, index):
+        col = index.column()
+        if col == PRODUCT_COLUMN:
+            editor = QComboBox(parent)
+            editor.setObjectName("control")
+            editor.setEditable(True)
+            # Typed new names must not be added to the shared list.
+            editor.setInsertPolicy(QComboBox.NoInsert)
+            editor.setModel(self.product_list)
+            editor.view().setMinimumWidth(500)
+            # Otherwise the popup list measures every product when shown.
+            editor.view().setUniformItemSizes(True)
+            return editor
+        if col == QTY_COLUMN:
+            editor = QSpinBox(parent)
+            editor.setRange(1, 100000)
+            return editor
+        if col == PRICE_COLUMN:
+            editor = QLineEdit(parent)
+            editor.setObjectName("control")
+            editor.setPlaceholderText("Price")
+            editor.setValidator(QRegExpValidator(QRegExp(PRICE_PATTERN), editor))
+            return editor
+        return None
+
+    def setEditorData(self, editor, index):
+        value = index.data(Qt.EditRole)
+        col = index.column()
+        if col == PRODUCT_COLUMN:
+            editor.setEditText(value)
+        elif col == QTY_COLUMN:
+            editor.setValue(value)
+        else:
+            editor.setText(value)
+
+    def setModelData(self, editor, model, index):
+        col = index.column()
+        if col == PRODUCT_COLUMN:
+            model.setData(index, editor.currentText())
+        elif col == QTY_COLUMN:
+            editor.interpretText()
+            model.setData(index, editor.value())
+        else:
+            model.setData(index, editor.text())
+
 
 class AddPurchaseWindow(QWidget):
     def __init__(self, on_success=None, actor=None):
@@ -17,7 +160,7 @@ class AddPurchaseWindow(QWidget):
 
         self.setWindowTitle("Add Purchase")
         self.setFixedSize(980, 620)
-        self.setStyleSheet("background: #eef1f6;")
+        theme.page(self)
 
         self.setup_ui()
         self.load_shops()
@@ -29,141 +172,94 @@ class AddPurchaseWindow(QWidget):
         main.setSpacing(20)
         main.setAlignment(Qt.AlignTop)
 
-        header = QFrame()
-        header.setStyleSheet("QFrame { background: white; border-radius: 16px; }")
-
-        shadow = QGraphicsDropShadowEffect()
-        shadow.setBlurRadius(18)
-        shadow.setYOffset(4)
-        shadow.setColor(QColor(0, 0, 0, 60))
-        header.setGraphicsEffect(shadow)
+        header = theme.card(blur=18)
 
         header_layout = QHBoxLayout(header)
         header_layout.setContentsMargins(30, 26, 30, 26)
 
         title = QLabel("Add Purchase")
-        title.setFont(QFont("Segoe UI", 22, QFont.Bold))
-        title.setStyleSheet("color: #222;")
+        title.setObjectName("title")
+        title.setFont(theme.font(22, QFont.Bold))
         header_layout.addWidget(title)
 
         header_layout.addStretch()
 
         shop_label = QLabel("Shop")
-        shop_label.setFont(QFont("Segoe UI", 11))
+        shop_label.setFont(theme.font(11))
         header_layout.addWidget(shop_label)
 
         self.shop_combo = QComboBox()
+        self.shop_combo.setObjectName("shopPicker")
         self.shop_combo.setMinimumWidth(220)
         self.shop_combo.setMinimumHeight(40)
-        self.shop_combo.setStyleSheet("""
-            QComboBox {
-                padding: 6px 12px;
-                border-radius: 8px;
-                border: 1px solid #c9c9c9;
-                background: white;
-                font-size: 13px;
-                color: #222;
-            }
-            QComboBox QAbstractItemView {
-                background: white;
-                color: #222;
-                selection-background-color: #808080;
-                selection-color: #ffffff;
-                outline: 0;
-            }
-            QComboBox QAbstractItemView::item:selected {
-                background: #808080;
-                color: #ffffff;
-            }
-        """)
         header_layout.addWidget(self.shop_combo)
 
         add_row_btn = QPushButton("Add Row")
+        add_row_btn.setObjectName("primary")
         add_row_btn.setMinimumHeight(40)
         add_row_btn.setCursor(Qt.PointingHandCursor)
-        add_row_btn.setStyleSheet("""
-            QPushButton {
-                background: #4A90E2;
-                color: white;
-                border-radius: 8px;
-                padding: 8px 16px;
-                font-weight: bold;
-            }
-            QPushButton:hover { background: #3b7ac7; }
-        """)
         add_row_btn.clicked.connect(self.add_row)
         header_layout.addWidget(add_row_btn)
 
         main.addWidget(header)
 
-        table_card = QFrame()
-        table_card.setStyleSheet("QFrame { background: white; border-radius: 16px; }")
-        table_card.setGraphicsEffect(shadow)
+        table_card = theme.card(blur=18)
 
         table_layout = QVBoxLayout(table_card)
         table_layout.setContentsMargins(20, 20, 20, 20)
 
-        self.table = QTableWidget(0, 4)
-        self.table.setHorizontalHeaderLabels(
-            ["Product", "Quantity", "Price", "Remove"]
-        )
+        self.lines_model = PurchaseLinesModel(self.controller, self)
+        for signal in (
+            self.lines_model.rowsInserted, self.lines_model.rowsRemoved,
+            self.lines_model.dataChanged
+        ):
+            signal.connect(self.recalculate)
+
+        self.remove_delegate = RemoveButtonDelegate(self)
+        self.remove_delegate.remove_clicked.connect(self.remove_row)
+
+        self.table = QTableView()
+        self.table.setObjectName("dataTable")
+        self.table.setModel(self.lines_model)
+        self.table.setItemDelegateForColumn(REMOVE_COLUMN, self.remove_delegate)
+        self.table.setMouseTracking(True)
         self.table.verticalHeader().setVisible(False)
+        self.table.verticalHeader().setDefaultSectionSize(44)
+        self.table.setEditTriggers(
+            QTableView.CurrentChanged | QTableView.SelectedClicked
+            | QTableView.DoubleClicked | QTableView.AnyKeyPressed
+        )
         self.table.setAlternatingRowColors(True)
-        self.table.setStyleSheet("""
-            QTableWidget {
-                border: none;
-                font-size: 13px;
-                alternate-background-color: #f6f8fb;
-            }
-            QHeaderView::section {
-                background: #f0f3f8;
-                padding: 10px;
-                font-weight: bold;
-                border: none;
-            }
-        """)
 
         header = self.table.horizontalHeader()
-        header.setSectionResizeMode(0, QHeaderView.Fixed)
-        self.table.setColumnWidth(0, 380)
-        header.setSectionResizeMode(1, QHeaderView.ResizeToContents)
-        header.setSectionResizeMode(2, QHeaderView.Fixed)
-        self.table.setColumnWidth(2, 180)
-        header.setSectionResizeMode(3, QHeaderView.ResizeToContents)
-
-        self.table.setColumnWidth(3, 90)
+        header.setSectionResizeMode(PRODUCT_COLUMN, QHeaderView.Fixed)
+        self.table.setColumnWidth(PRODUCT_COLUMN, 380)
+        header.setSectionResizeMode(QTY_COLUMN, QHeaderView.Stretch)
+        header.setSectionResizeMode(PRICE_COLUMN, QHeaderView.Fixed)
+        self.table.setColumnWidth(PRICE_COLUMN, 180)
+        header.setSectionResizeMode(REMOVE_COLUMN, QHeaderView.Fixed)
+        self.table.setColumnWidth(REMOVE_COLUMN, 90)
 
         table_layout.addWidget(self.table)
         main.addWidget(table_card, stretch=1)
 
-        footer = QFrame()
-        footer.setStyleSheet("QFrame { background: white; border-radius: 16px; }")
-        footer.setGraphicsEffect(shadow)
+        footer = theme.card(blur=18)
 
         footer_layout = QHBoxLayout(footer)
         footer_layout.setContentsMargins(30, 24, 30, 24)
 
         self.total_label = QLabel("Grand Total: 0.00")
-        self.total_label.setFont(QFont("Segoe UI", 14, QFont.Bold))
-        self.total_label.setStyleSheet("color: #222;")
+        self.total_label.setObjectName("title")
+        self.total_label.setFont(theme.font(14, QFont.Bold))
         footer_layout.addWidget(self.total_label)
 
         footer_layout.addStretch()
 
         save_btn = QPushButton("Save Purchase")
+        save_btn.setObjectName("primary")
         save_btn.setMinimumHeight(46)
         save_btn.setCursor(Qt.PointingHandCursor)
-        save_btn.setStyleSheet("""
-            QPushButton {
-                background: #4A90E2;
-                color: white;
-                border-radius: 10px;
-                padding: 10px 24px;
-                font-size: 15px;
-                font-weight: bold;
-            }
-            QPushButton:hover { background: #3b7ac7; }
-        """)
+        save_btn.setFont(theme.font(11, QFont.Bold))
         save_btn.clicked.connect(self.save_purchase)
         footer_layout.addWidget(save_btn)
 
@@ -175,126 +271,44 @@ class AddPurchaseWindow(QWidget):
             self.shop_combo.addItem(name, sid)
 
     def load_products(self):
+        # One list model shared by every product editor, instead of copying
+        # the whole catalogue into each line.
         self.products = self.controller.get_products()
+        self.product_list = QStandardItemModel(self)
+        for pid, name in self.products:
+            item = QStandardItem(name)
+            item.setData(pid, Qt.UserRole)
+            self.product_list.appendRow(item)
+        self.table.setItemDelegate(PurchaseLineDelegate(self.product_list, self.table))
 
     def add_row(self):
-        row = self.table.rowCount()
-        self.table.insertRow(row)
-
-        product_combo = QComboBox()
-        product_combo.setEditable(True)
-        product_combo.setMinimumHeight(36)
-        product_combo.setSizePolicy(
-            product_combo.sizePolicy().Expanding,
-            product_combo.sizePolicy().Fixed
-        )
-        product_combo.setMinimumContentsLength(30)
-        product_combo.setSizeAdjustPolicy(QComboBox.AdjustToContentsOnFirstShow)
-        product_combo.view().setMinimumWidth(500)
-        product_combo.setStyleSheet("""
-            QComboBox {
-                padding: 5px 8px;
-                border-radius: 6px;
-                border: 1px solid #c9c9c9;
-                background: white;
-                color: #222;
-            }
-            QComboBox QAbstractItemView {
-                background: white;
-                color: #222;
-                selection-background-color: #808080;
-                selection-color: #ffffff;
-                outline: 0;
-            }
-        """)
-
-        for pid, name in self.products:
-            product_combo.addItem(name, pid)
-
-        product_combo.currentTextChanged.connect(self.recalculate)
-        self.table.setCellWidget(row, 0, product_combo)
-
-        qty_spin = QSpinBox()
-        qty_spin.setRange(1, 100000)
-        qty_spin.setMinimumHeight(36)
-        qty_spin.valueChanged.connect(self.recalculate)
-        self.table.setCellWidget(row, 1, qty_spin)
-
-        price_input = QLineEdit()
-        price_input.setPlaceholderText("Price")
-        price_input.setMinimumHeight(36)
-        price_input.textChanged.connect(self.recalculate)
-        self.table.setCellWidget(row, 2, price_input)
-
-        remove_btn = QPushButton("✕")
-        remove_btn.setCursor(Qt.PointingHandCursor)
-        remove_btn.setStyleSheet("""
-            QPushButton {
-                background: #e04b4b;
-                color: white;
-                border-radius: 6px;
-                font-weight: bold;
-            }
-            QPushButton:hover { background: #c53e3e; }
-        """)
-        remove_btn.clicked.connect(
-            lambda _, btn=remove_btn: self.remove_row_by_button(btn)
-        )
-        self.table.setCellWidget(row, 3, remove_btn)
+        self.controller.add_row()
+        index = self.lines_model.index(self.lines_model.rowCount() - 1, PRODUCT_COLUMN)
+        # Opens the product editor through the CurrentChanged edit trigger.
+        self.table.setCurrentIndex(index)
 
     def remove_row(self, row):
-        self.table.removeRow(row)
-        self.recalculate()
-
-    def remove_row_by_button(self, button):
-        for row in range(self.table.rowCount()):
-            if self.table.cellWidget(row, 3) is button:
-                self.remove_row(row)
-                return
+        self.controller.remove_row(row)
 
     def recalculate(self):
-        rows = []
-        total = 0
-
-        for r in range(self.table.rowCount()):
-            product_combo = self.table.cellWidget(r, 0)
-            qty = self.table.cellWidget(r, 1).value()
-            price_text = self.table.cellWidget(r, 2).text().strip()
-            try:
-                price = float(price_text) if price_text else 0
-            except ValueError:
-                price = 0
-
-            total += qty * price
-            rows.append({
-                "name": product_combo.currentText(),
-                "qty": qty,
-                "price": price
-            })
-
-        self.controller.rows = rows
-        self.total_label.setText(f"Grand Total: {total:.2f}")
+        total_cents = self.controller.calculate_totals()
+        self.total_label.setText(f"Grand Total: {format_money(total_cents)}")
 
     def save_purchase(self):
-        if self.table.rowCount() == 0:
+        # Moving off the current cell commits an editor still open on it.
+        self.table.setCurrentIndex(QModelIndex())
+        rows = self.controller.get_rows()
+        if not rows:
             QMessageBox.warning(self, "Error", "Add at least one product row.")
             return
 
-        for r in range(self.table.rowCount()):
-            price_text = self.table.cellWidget(r, 2).text().strip()
-            if not price_text:
+        # The price editor only accepts non-negative amounts, so a line is
+        # either priced or still empty.
+        for r, row in enumerate(rows):
+            if row["price_cents"] is None:
                 QMessageBox.warning(self, "Error", f"Row {r + 1}: price is required.")
                 return
-            try:
-                price = float(price_text)
-            except ValueError:
-                QMessageBox.warning(self, "Error", f"Row {r + 1}: price must be numeric.")
-                return
-            if price < 0:
-                QMessageBox.warning(self, "Error", f"Row {r + 1}: price cannot be negative.")
-                return
 
-        self.recalculate()
         shop_id = self.shop_combo.currentData()
 
         try:
@@ -1,12 +1,81 @@
 from PyQt5.QtWidgets import (
     QWidget, QLabel, QVBoxLayout, QHBoxLayout, QComboBox, QLineEdit,
-    QPushButton, QTableWidget, QTableWidgetItem, QMessageBox, QSpinBox,
-    QFrame, QGraphicsDropShadowEffect
+    QPushButton, QTableView, QMessageBox, QSpinBox
 )
-from PyQt5.QtCore import Qt
-from PyQt5.QtGui import QFont, QColor
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex
+from PyQt5.QtGui import QFont
 
 from app.controllers.sale_controller import SaleController
+from app.utils.money import format_money, to_cents
+from app.views import theme
+from app.views.remove_button_delegate import RemoveButtonDelegate
+
+CART_COLUMNS = (
+    "Product ID", "Product", "Unit Price",
+    "Quantity", "Subtotal", "Remove"
+)
+
+REMOVE_COLUMN = 5
+
+
+class CartTableModel(QAbstractTableModel):
+    # Mirrors a SaleController cart as one of its observers, so each cart
+    # mutation becomes a single row insert / update / removal instead of a
+    # rebuild of the whole table.
+
+    def __init__(self, controller, parent=None):
+        super().__init__(parent)
+        self.controller = controller
+        self._rows = list(controller.get_cart())
+        controller.add_cart_observer(self)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(CART_COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return CART_COLUMNS[section]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or role != Qt.DisplayRole:
+            return None
+        item = self._rows[index.row()]
+        col = index.column()
+
+        if col == 0:
+            return str(item["product_id"])
+        if col == 1:
+            return item["name"]
+        if col == 2:
+            return format_money(item["price_cents"])
+        if col == 3:
+            return str(item["qty"])
+        if col == 4:
+            return format_money(item["subtotal_cents"])
+        return "Remove"
+
+    def cart_inserted(self, row):
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._rows.insert(row, self.controller.get_cart()[row])
+        self.endInsertRows()
+
+    def cart_updated(self, row):
+        self.dataChanged.emit(self.index(row, 0), self.index(row, REMOVE_COLUMN - 1))
+
+    def cart_removed(self, row):
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self._rows[row]
+        self.endRemoveRows()
+
+    def cart_reset(self):
+        self.beginResetModel()
+        self._rows = list(self.controller.get_cart())
+        self.endResetModel()
+
 
 class AddSaleWindow(QWidget):
     def __init__(self, parent=None, on_success=None, actor=None):
@@ -17,7 +86,7 @@ class AddSaleWindow(QWidget):
 
         self.setWindowTitle("Add Sale (Invoice)")
         self.setFixedSize(1000, 650)
-        self.setStyleSheet("background: #eef1f6;")
+        theme.page(self)
 
         self.setup_ui()
         self.load_shops()
@@ -28,68 +97,33 @@ class AddSaleWindow(QWidget):
         main.setSpacing(20)
         main.setAlignment(Qt.AlignTop)
 
-        header = QFrame()
-        header.setStyleSheet("""
-            QFrame {
-                background: white;
-                border-radius: 16px;
-            }
-        """)
-
-        shadow = QGraphicsDropShadowEffect()
-        shadow.setBlurRadius(18)
-        shadow.setYOffset(4)
-        shadow.setColor(QColor(0, 0, 0, 60))
-        header.setGraphicsEffect(shadow)
+        header = theme.card(blur=18)
 
         header_layout = QHBoxLayout(header)
         header_layout.setContentsMargins(30, 26, 30, 26)
 
         title = QLabel("New Sale Invoice")
-        title.setFont(QFont("Segoe UI", 22, QFont.Bold))
+        title.setObjectName("title")
+        title.setFont(theme.font(22, QFont.Bold))
         title.setMinimumHeight(44)
-        title.setStyleSheet("color: #222; padding-top: 4px;")
         header_layout.addWidget(title)
 
         header_layout.addStretch()
 
         shop_label = QLabel("Shop")
-        shop_label.setFont(QFont("Segoe UI", 11))
+        shop_label.setFont(theme.font(11))
         header_layout.addWidget(shop_label)
 
         self.shop_combo = QComboBox()
+        self.shop_combo.setObjectName("shopPicker")
         self.shop_combo.setMinimumWidth(220)
         self.shop_combo.setMinimumHeight(40)
         self.shop_combo.currentIndexChanged.connect(self.on_shop_changed)
-        self.shop_combo.setStyleSheet("""
-            QComboBox {
-                padding: 6px 12px;
-                border-radius: 8px;
-                border: 1px solid #c9c9c9;
-                background: white;
-                font-size: 13px;
-                color: #222;
-            }
-            QComboBox QAbstractItemView {
-                background: white;
-                color: #222;
-                selection-background-color: #808080;
-                selection-color: #ffffff;
-                outline: 0;
-            }
-        """)
         header_layout.addWidget(self.shop_combo)
 
         main.addWidget(header)
 
-        entry = QFrame()
-        entry.setStyleSheet("""
-            QFrame {
-                background: white;
-                border-radius: 16px;
-            }
-        """)
-        entry.setGraphicsEffect(shadow)
+        entry = theme.card(blur=18)
 
         entry_layout = QHBoxLayout(entry)
         entry_layout.setContentsMargins(30, 24, 30, 24)
@@ -98,30 +132,12 @@ class AddSaleWindow(QWidget):
         entry_layout.addWidget(QLabel("Product"))
 
         self.product_combo = QComboBox()
+        self.product_combo.setObjectName("control")
         self.product_combo.setMinimumHeight(38)
-        self.product_combo.setStyleSheet("""
-            QComboBox {
-                padding: 6px 10px;
-                border-radius: 8px;
-                border: 1px solid #c9c9c9;
-                background: white;
-                color: #222;
-                font-size: 13px;
-            }
-            QComboBox:focus {
-                border: 1.4px solid #4A90E2;
-            }
-            QComboBox QAbstractItemView {
-                background: white;
-                color: #222;
-                selection-background-color: #808080;
-                selection-color: #ffffff;
-                outline: 0;
-            }
-        """)
         entry_layout.addWidget(self.product_combo, stretch=2)
 
         self.price_input = QLineEdit()
+        self.price_input.setObjectName("control")
         self.price_input.setPlaceholderText("Sale Price")
         self.price_input.setMinimumHeight(38)
         entry_layout.addWidget(self.price_input)
@@ -134,117 +150,66 @@ class AddSaleWindow(QWidget):
         entry_layout.addWidget(self.qty_spin)
 
         add_btn = QPushButton("Add to Cart")
+        add_btn.setObjectName("primary")
         add_btn.setCursor(Qt.PointingHandCursor)
         add_btn.setMinimumHeight(40)
-        add_btn.setStyleSheet("""
-            QPushButton {
-                background: #4A90E2;
-                color: white;
-                border-radius: 8px;
-                padding: 8px 16px;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background: #3b7ac7;
-            }
-        """)
         add_btn.clicked.connect(self.add_to_cart)
         entry_layout.addWidget(add_btn)
 
         main.addWidget(entry)
 
-        table_card = QFrame()
-        table_card.setStyleSheet("""
-            QFrame {
-                background: white;
-                border-radius: 16px;
-            }
-        """)
-        table_card.setGraphicsEffect(shadow)
+        table_card = theme.card(blur=18)
 
         table_layout = QVBoxLayout(table_card)
         table_layout.setContentsMargins(20, 20, 20, 20)
 
-        self.table = QTableWidget(0, 6)
-        self.table.setHorizontalHeaderLabels([
-            "Product ID", "Product", "Unit Price",
-            "Quantity", "Subtotal", "Remove"
-        ])
+        self.cart_model = CartTableModel(self.controller, self)
+        for signal in (
+            self.cart_model.rowsInserted, self.cart_model.rowsRemoved,
+            self.cart_model.dataChanged, self.cart_model.modelReset
+        ):
+            signal.connect(self.update_total)
+
+        self.remove_delegate = RemoveButtonDelegate(self)
+        self.remove_delegate.remove_clicked.connect(self.remove_item)
+
+        self.table = QTableView()
+        self.table.setObjectName("dataTable")
+        self.table.setModel(self.cart_model)
+        self.table.setItemDelegateForColumn(REMOVE_COLUMN, self.remove_delegate)
+        self.table.setMouseTracking(True)
         self.table.verticalHeader().setVisible(False)
         self.table.setEditTriggers(self.table.NoEditTriggers)
         self.table.setAlternatingRowColors(True)
-        self.table.setStyleSheet("""
-            QTableWidget {
-                border: none;
-                font-size: 13px;
-                alternate-background-color: #f6f8fb;
-            }
-            QHeaderView::section {
-                background: #f0f3f8;
-                padding: 10px;
-                font-weight: bold;
-                border: none;
-            }
-        """)
 
         table_layout.addWidget(self.table)
         main.addWidget(table_card, stretch=1)
 
-        footer = QFrame()
-        footer.setStyleSheet("""
-            QFrame {
-                background: white;
-                border-radius: 16px;
-            }
-        """)
-        footer.setGraphicsEffect(shadow)
+        footer = theme.card(blur=18)
 
         footer_layout = QHBoxLayout(footer)
         footer_layout.setContentsMargins(30, 24, 30, 24)
 
         self.total_label = QLabel("Total: 0.00")
-        self.total_label.setFont(QFont("Segoe UI", 14, QFont.Bold))
-        self.total_label.setStyleSheet("color: #222;")
+        self.total_label.setObjectName("title")
+        self.total_label.setFont(theme.font(14, QFont.Bold))
         footer_layout.addWidget(self.total_label)
 
         footer_layout.addStretch()
 
         save_btn = QPushButton("Save Sale")
+        save_btn.setObjectName("primary")
         save_btn.setCursor(Qt.PointingHandCursor)
         save_btn.setMinimumHeight(46)
-        save_btn.setStyleSheet("""
-            QPushButton {
-                background: #4A90E2;
-                color: white;
-                border-radius: 10px;
-                padding: 10px 24px;
-                font-size: 15px;
-                font-weight: bold;
-                margin-top: 6px;
-            }
-            QPushButton:hover {
-                background: #3b7ac7;
-            }
-        """)
+        save_btn.setFont(theme.font(11, QFont.Bold))
         save_btn.clicked.connect(self.save_sale)
         footer_layout.addWidget(save_btn)
 
         cancel_btn = QPushButton("Cancel")
+        cancel_btn.setObjectName("muted")
         cancel_btn.setCursor(Qt.PointingHandCursor)
         cancel_btn.setMinimumHeight(46)
-        cancel_btn.setStyleSheet("""
-            QPushButton {
-                background: #dcdcdc;
-                color: #333;
-                border-radius: 10px;
-                padding: 10px 24px;
-                font-size: 14px;
-                margin-top: 6px;
-            }
-            QPushButton:hover {
-                background: #cfcfcf;
-            }
-        """)
+        cancel_btn.setFont(theme.font(11))
         cancel_btn.clicked.connect(self.close)
         footer_layout.addWidget(cancel_btn)
 
@@ -286,7 +251,7 @@ class AddSaleWindow(QWidget):
             return
 
         try:
-            price = float(self.price_input.text().strip())
+            price_cents = to_cents(self.price_input.text().strip())
         except ValueError:
             QMessageBox.warning(self, "Error", "Enter valid sale price.")
             return
@@ -297,7 +262,7 @@ class AddSaleWindow(QWidget):
             self.controller.add_to_cart(
                 product_id=data["product_id"],
                 name=data["product_name"],
-                price=price,
+                price_cents=price_cents,
                 qty=qty,
                 stock=data["quantity"]
             )
@@ -305,43 +270,14 @@ class AddSaleWindow(QWidget):
             QMessageBox.warning(self, "Error", str(e))
             return
 
-        self.refresh_table()
-
     def remove_item(self, index):
         self.controller.remove_from_cart(index)
-        self.refresh_table()
-
-    def refresh_table(self):
-        cart = self.controller.get_cart()
-        self.table.setRowCount(len(cart))
-
-        for r, item in enumerate(cart):
-            self.table.setItem(r, 0, QTableWidgetItem(str(item["product_id"])))
-            self.table.setItem(r, 1, QTableWidgetItem(item["name"]))
-            self.table.setItem(r, 2, QTableWidgetItem(f"{item['price']:.2f}"))
-            self.table.setItem(r, 3, QTableWidgetItem(str(item["qty"])))
-            self.table.setItem(r, 4, QTableWidgetItem(f"{item['subtotal']:.2f}"))
-
-            btn = QPushButton("Remove")
-            btn.setStyleSheet("""
-                QPushButton {
-                    background: #e04b4b;
-                    color: white;
-                    border-radius: 6px;
-                    font-weight: bold;
-                }
-                QPushButton:hover {
-                    background: #c53e3e;
-                }
-            """)
-            btn.clicked.connect(lambda _, i=r: self.remove_item(i))
-            self.table.setCellWidget(r, 5, btn)
-
-        self.total_label.setText(f"Total: {self.controller.get_total():.2f}")
+
+    def update_total(self, *args):
+        self.total_label.setText(f"Total: {format_money(self.controller.get_total())}")
 
     def clear_cart(self):
         self.controller.clear_cart()
-        self.refresh_table()
 
     def save_sale(self):
         shop_id = self.shop_combo.currentData()
@@ -7,7 +7,7 @@ from PyQt5.QtCore import Qt
 from PyQt5.QtGui import QFont, QColor
 
 from app.models.stock_model import StockModel
-from app.models.audit_log_model import AuditLogModel
+from app.controllers.product_controller import ProductController
 
 class AdjustStockWindow(QWidget):
     def __init__(self, product_id, shop_id, product_name, on_success=None, actor=None):
@@ -161,17 +161,9 @@ class AdjustStockWindow(QWidget):
         main.addWidget(card)
 
     def save(self):
-        old_qty = StockModel.get_quantity(self.product_id, self.shop_id)
-        new_qty = self.qty_spin.value()
-        StockModel.set_quantity(self.product_id, self.shop_id, new_qty)
-        AuditLogModel.log(
-            action="STOCK_ADJUST",
-            entity_type="Stock",
-            shop_id=self.shop_id,
-            product_id=self.product_id,
-            user_id=self.actor.get("user_id"),
-            username=self.actor.get("username"),
-            details=f"{self.product_name}: {old_qty} -> {new_qty}",
+        ProductController().adjust_stock(
+            self.product_id, self.shop_id, self.product_name,
+            self.qty_spin.value(), actor=self.actor
         )
 
         QMessageBox.information(self, "Saved", "Stock updated successfully.")
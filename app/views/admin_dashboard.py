@@ -1,40 +1,45 @@
 import sys
-import os
-from app.utils.resource_paths import get_assets_dir
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
-    QComboBox, QTableWidget, QTableWidgetItem, QMessageBox,
-    QFrame, QGraphicsDropShadowEffect, QStyle, QHeaderView,
+    QComboBox, QMessageBox, QStyle,
     QLineEdit, QToolButton
 )
-from PyQt5.QtGui import QFont, QColor, QIcon
+from PyQt5.QtGui import QFont
 from PyQt5.QtCore import ( Qt, QPropertyAnimation)
 from app.controllers.dashboard_controller import DashboardController
-from app.views.add_product_window import AddProductWindow
-from app.views.edit_product_window import EditProductWindow
-from app.views.adjust_stock_window import AdjustStockWindow
-from app.views.add_sale_window import AddSaleWindow
-from app.views.add_purchase_window import AddPurchaseWindow
-from app.views.show_sales_window import ShowSalesWindow
-from app.views.profit_report_window import ProfitReportWindow
-from app.views.weekly_profit_window import WeeklyProfitWindow
-from app.views.staff_management_window import StaffManagementWindow
-from app.views.audit_log_window import AuditLogWindow
-from app.views.shop_management_window import ShopManagementWindow
+from app.views import theme
+from app.views.data_loader import DataLoader
+from app.utils.event_bus import (
+    bus, STOCK_CHANGED, PRICES_CHANGED, PRODUCTS_CREATED, PRODUCT_RENAMED
+)
+from app.views.product_grid import ProductGrid
+from app.utils.search_index import SearchIndex
+from app.views.window_registry import window_class
 from app.controllers.backup_controller import BackupController
 
 class AdminDashboard(QWidget):
     def __init__(self, user_info=None):
         super().__init__()
-        self.all_products = []
         self.user_info = user_info or {}
         self.controller = DashboardController()
 
         self.setWindowTitle("Admin Dashboard - Inventory")
+        theme.page(self)
         self.showMaximized()
-        self.setStyleSheet("background: #eef1f6;")
 
         self.setup_ui()
+        self.loader = DataLoader(self, busy_widgets=[self.table])
+        self.loader.loaded.connect(self.on_products_loaded)
+        self.loader.failed.connect(self.on_load_failed)
+        # Saves elsewhere announce what they changed; only those rows are
+        # re-read and patched into the grid.
+        self.patch_loader = DataLoader(self)
+        self.patch_loader.loaded.connect(self.on_patch_loaded)
+        self.patch_loader.failed.connect(self.on_load_failed)
+        self.pending_patch = set()
+        for event in (STOCK_CHANGED, PRICES_CHANGED, PRODUCTS_CREATED):
+            bus.subscribe(event, self.on_products_changed)
+        bus.subscribe(PRODUCT_RENAMED, self.on_product_renamed)
         self.load_shops()
 
     def setup_ui(self):
@@ -42,68 +47,32 @@ class AdminDashboard(QWidget):
         main_layout.setContentsMargins(30, 30, 30, 30)
         main_layout.setSpacing(20)
 
-        header = QFrame()
-        header.setStyleSheet("""
-            QFrame {
-                background: white;
-                border-radius: 14px;
-            }
-        """)
-        header_shadow = QGraphicsDropShadowEffect()
-        header_shadow.setBlurRadius(20)
-        header_shadow.setYOffset(3)
-        header_shadow.setColor(QColor(0, 0, 0, 60))
-        header.setGraphicsEffect(header_shadow)
+        header = theme.card(blur=20)
 
         header_layout = QHBoxLayout(header)
         header_layout.setContentsMargins(24, 18, 24, 18)
 
         title = QLabel("Admin Dashboard")
-        title.setFont(QFont("Segoe UI Semibold", 22))
-        title.setStyleSheet("color: #222;")
+        title.setFont(theme.font(22, family="Segoe UI Semibold"))
+        title.setObjectName("title")
         header_layout.addWidget(title)
 
         header_layout.addStretch()
 
         shop_label = QLabel("Shop:")
-        shop_label.setFont(QFont("Segoe UI", 11))
+        shop_label.setFont(theme.font(11))
         header_layout.addWidget(shop_label)
 
         self.shop_combo = QComboBox()
         self.shop_combo.setMinimumWidth(220)
         self.shop_combo.currentIndexChanged.connect(self.on_shop_changed)
-        self.shop_combo.setStyleSheet("""
-            QComboBox {
-                padding: 8px 12px;
-                border-radius: 8px;
-                border: 1px solid #c9c9c9;
-                background: white;
-                font-size: 13px;
-                color: #222;
-            }
-            QComboBox QAbstractItemView {
-                background: white;
-                color: #222;
-                selection-background-color: #808080;
-                selection-color: #ffffff;
-                outline: 0;
-            }
-        """)
+        self.shop_combo.setObjectName("shopPicker")
         header_layout.addWidget(self.shop_combo)
 
         self.search_btn = QToolButton()
-        icon = QIcon.fromTheme("edit-find")
-        if icon.isNull():
-            assets_dir = get_assets_dir()
-            icon = QIcon(os.path.join(assets_dir, "search.png"))
-
-        self.search_btn.setIcon(icon)
+        self.search_btn.setIcon(theme.icon("search.png", "edit-find"))
         self.search_btn.setCursor(Qt.PointingHandCursor)
-        self.search_btn.setStyleSheet("""
-            QToolButton {
-                border: none;
-            }
-        """)
+        self.search_btn.setObjectName("searchToggle")
         self.search_btn.clicked.connect(self.toggle_search)
         header_layout.addWidget(self.search_btn)
 
@@ -114,15 +83,7 @@ class AdminDashboard(QWidget):
         self.search_input.setMinimumHeight(36)
         self.search_input.setClearButtonEnabled(True)
         self.search_input.textChanged.connect(self.apply_search_filter)
-        self.search_input.setStyleSheet("""
-            QLineEdit {
-                padding: 6px 12px;
-                border-radius: 8px;
-                border: 1px solid #c9c9c9;
-                background: white;
-                font-size: 13px;
-            }
-        """)
+        self.search_input.setObjectName("search")
         header_layout.addWidget(self.search_input)
 
         refresh_btn = self.action_button("Refresh", QStyle.SP_BrowserReload)
@@ -140,56 +101,12 @@ class AdminDashboard(QWidget):
 
         main_layout.addWidget(header)
 
-        table_card = QFrame()
-        table_card.setStyleSheet("""
-            QFrame {
-                background: white;
-                border-radius: 14px;
-            }
-        """)
-        table_card.setGraphicsEffect(header_shadow)
+        table_card = theme.card(blur=20)
 
         table_layout = QVBoxLayout(table_card)
         table_layout.setContentsMargins(20, 20, 20, 20)
 
-        self.table = QTableWidget()
-        self.table.setColumnCount(7)
-        self.table.setHorizontalHeaderLabels([
-            "ID", "Product", "Quantity",
-            "Avg Cost", "Last Purchase",
-            "Last Sale", "Profit"
-        ])
-        self.table.setEditTriggers(self.table.NoEditTriggers)
-        self.table.setSelectionBehavior(self.table.SelectRows)
-        self.table.setAlternatingRowColors(True)
-        self.table.verticalHeader().setVisible(False)
-        self.table.setSortingEnabled(True)
-        self.table.verticalHeader().setDefaultSectionSize(44)
-        header_font = QFont("Segoe UI Semibold", 11)
-        self.table.horizontalHeader().setFont(header_font)
-        self.table.horizontalHeader().setFixedHeight(48)
-        self.table.horizontalHeader().setStretchLastSection(True)
-        self.table.horizontalHeader().setSectionResizeMode(
-            QHeaderView.Stretch
-        )
-        table_font = QFont("Segoe UI", 11)
-        self.table.setFont(table_font)
-        self.table.setStyleSheet("""
-            QTableWidget {
-                border: none;
-                font-size: 11pt;
-                background: white;
-                alternate-background-color: #f6f8fb;
-            }
-            QHeaderView::section {
-                background: #f0f3f8;
-                padding: 12px;
-                font-weight: bold;
-                border: none;
-                color: #333;
-            }
-        """)
-
+        self.table = ProductGrid(show_profit=True)
         table_layout.addWidget(self.table)
         main_layout.addWidget(table_card, stretch=1)
 
@@ -221,23 +138,11 @@ class AdminDashboard(QWidget):
 
     def action_button(self, text, icon, slot=None):
         b = QPushButton(text)
-        b.setIcon(self.style().standardIcon(icon))
+        b.setObjectName("action")
+        b.setIcon(theme.standard_icon(icon))
         b.setCursor(Qt.PointingHandCursor)
         b.setMinimumHeight(48)
-        b.setFont(QFont("Segoe UI", 11, QFont.Bold))
-        b.setStyleSheet("""
-            QPushButton {
-                background: #4A90E2;
-                color: white;
-                padding: 10px 16px;
-                border-radius: 8px;
-                font-size: 13px;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background: #3b7ac7;
-            }
-        """)
+        b.setFont(theme.font(11, QFont.Bold))
         if slot:
             b.clicked.connect(slot)
         return b
@@ -276,126 +181,122 @@ class AdminDashboard(QWidget):
         for s in shops:
             self.shop_combo.addItem(s["shop_name"], s["shop_id"])
         if shops:
-            self.load_products_for_current_shop()
+            self.load_products_for_current_shop(reset=True)
 
     def on_shop_changed(self):
-        self.load_products_for_current_shop()
+        self.load_products_for_current_shop(reset=True)
 
     def reload_current_shop(self):
         self.load_products_for_current_shop()
         # QMessageBox.information(self, "Refreshed", "Data refreshed successfully.")
 
     def apply_search_filter(self, text):
-        text = text.strip().lower()
+        self.table.set_search_text(text)
 
-        if not text:
-            rows = self.all_products
-        else:
-            rows = [
-                p for p in self.all_products
-                if text in p["product_name"].lower()
-            ]
-
-        self.populate_table(rows)
-
-    def populate_table(self, rows):
-        self.table.setRowCount(len(rows))
-
-        for r, p in enumerate(rows):
-            self.table.setItem(r, 0, QTableWidgetItem(str(p["product_id"])))
-            self.table.setItem(r, 1, QTableWidgetItem(p["product_name"]))
-            self.table.setItem(r, 2, QTableWidgetItem(str(p["quantity"])))
-            self.table.setItem(r, 3, QTableWidgetItem(
-                f"{p['avg_cost']:.2f}" if p["avg_cost"] else "-"
-            ))
-            self.table.setItem(r, 4, QTableWidgetItem(
-                f"{p['last_purchase']:.2f}" if p["last_purchase"] else "-"
-            ))
-            self.table.setItem(r, 5, QTableWidgetItem(
-                f"{p['last_sale']:.2f}" if p["last_sale"] else "-"
-            ))
-
-            profit = QTableWidgetItem(
-                "N/A" if p["profit"] is None else f"{p['profit']:.2f}"
-            )
-            if p["profit"] is not None:
-                profit.setForeground(
-                    QColor("#1a9c4b") if p["profit"] > 0 else QColor("#d64545")
-                )
-            self.table.setItem(r, 6, profit)
-
-    def load_products_for_current_shop(self):
+    def load_products_for_current_shop(self, reset=False):
         shop_id = self.shop_combo.currentData()
-        rows = self.controller.get_products_for_shop(shop_id) if shop_id else []
-        self.all_products = rows
-        self.populate_table(self.all_products)
+        if reset:
+            self.patch_loader.cancel()
+            self.pending_patch.clear()
+        if not shop_id:
+            self.loader.cancel()
+            self.table.set_products([], reset=True)
+            return
+        self.loader.load(self.fetch_products, shop_id, reset)
+
+    def fetch_products(self, shop_id, reset):
+        # Runs on a worker thread, so the search index is built here too.
+        rows = self.controller.get_products_for_shop(shop_id)
+        index = SearchIndex((p["product_id"], p["product_name"]) for p in rows)
+        return reset, rows, index
+
+    def on_products_loaded(self, result):
+        reset, rows, index = result
+        self.table.set_products(rows, reset=reset, index=index)
+
+    def on_products_changed(self, shop_id, product_ids):
+        if shop_id != self.shop_combo.currentData():
+            return
+        # A newer patch load supersedes an older one, so it covers every id
+        # still waiting.
+        self.pending_patch.update(product_ids)
+        self.patch_loader.load(self.fetch_product_rows, shop_id, frozenset(self.pending_patch))
+
+    def on_product_renamed(self, product_id, name):
+        if self.table.product_model.has_product(product_id):
+            self.on_products_changed(self.shop_combo.currentData(), [product_id])
+
+    def fetch_product_rows(self, shop_id, product_ids):
+        # Runs on a worker thread.
+        return shop_id, product_ids, self.controller.get_products_for_shop(shop_id, product_ids)
+
+    def on_patch_loaded(self, result):
+        shop_id, product_ids, rows = result
+        self.pending_patch -= product_ids
+        if shop_id == self.shop_combo.currentData():
+            self.table.patch_products(rows)
+
+    def on_load_failed(self, message):
+        QMessageBox.critical(self, "Error", f"Failed to load products:\n{message}")
 
     def add_product(self):
-            self.add_product_window = AddProductWindow(
-                on_success=self.reload_current_shop
-            )
+            self.add_product_window = window_class("add_product")()
             self.add_product_window.show()
 
     def edit_product(self):
-        sel = self.table.currentRow()
-        if sel < 0:
+        product = self.table.selected_product()
+        if product is None:
             QMessageBox.warning(self, "Select", "Select a product first.")
             return
-        pid = int(self.table.item(sel, 0).text())
-        self.edit_product_window = EditProductWindow(pid, on_success=self.reload_current_shop)
+        self.edit_product_window = window_class("edit_product")(product["product_id"])
         self.edit_product_window.show()
 
     def adjust_stock(self):
-        sel = self.table.currentRow()
-        if sel < 0:
+        product = self.table.selected_product()
+        if product is None:
             QMessageBox.warning(self, "Select", "Select a product first.")
             return
-        pid = int(self.table.item(sel, 0).text())
         shop_id = self.shop_combo.currentData()
-        name = self.table.item(sel, 1).text()
-        self.adjust_stock_window = AdjustStockWindow(
-            pid, shop_id, name,
-            on_success=self.reload_current_shop,
+        self.adjust_stock_window = window_class("adjust_stock")(
+            product["product_id"], shop_id, product["product_name"],
             actor=self.user_info
         )
         self.adjust_stock_window.show()
 
     def add_purchase(self):
-        self.add_purchase_window = AddPurchaseWindow(
-            on_success=self.reload_current_shop,
+        self.add_purchase_window = window_class("add_purchase")(
             actor=self.user_info
         )
         self.add_purchase_window.show()
 
     def add_sale(self):
-        self.add_sale_window = AddSaleWindow(
-            on_success=self.reload_current_shop,
+        self.add_sale_window = window_class("add_sale")(
             actor=self.user_info
         )
         self.add_sale_window.show()
 
     def open_show_sales(self):
-        self.sales_window = ShowSalesWindow()
+        self.sales_window = window_class("show_sales")()
         self.sales_window.show()
 
     def open_profit_report(self):
-        self.profit_window = ProfitReportWindow()
+        self.profit_window = window_class("profit_report")()
         self.profit_window.show()
 
     def open_weekly_profit(self):
-        self.weekly_profit_window = WeeklyProfitWindow()
+        self.weekly_profit_window = window_class("weekly_profit")()
         self.weekly_profit_window.show()
 
     def open_staff_management(self):
-        self.staff_mgmt = StaffManagementWindow(actor=self.user_info)
+        self.staff_mgmt = window_class("staff_management")(actor=self.user_info)
         self.staff_mgmt.show()
 
     def open_audit_logs(self):
-        self.audit_window = AuditLogWindow()
+        self.audit_window = window_class("audit_logs")()
         self.audit_window.show()
 
     def open_shop_management(self):
-        self.shop_management_window = ShopManagementWindow(on_updated=self.load_shops)
+        self.shop_management_window = window_class("shop_management")(on_updated=self.load_shops)
         self.shop_management_window.exec_()
 
     def backup_db(self):
@@ -409,6 +310,7 @@ class AdminDashboard(QWidget):
 if __name__ == "__main__":
     from PyQt5.QtWidgets import QApplication
     app = QApplication(sys.argv)
+    theme.apply_theme(app)
     w = AdminDashboard()
     w.show()
     sys.exit(app.exec_())
@@ -1,12 +1,53 @@
+from html import escape
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QComboBox,
     QPushButton, QLineEdit, QTableWidget, QTableWidgetItem,
-    QFrame, QGraphicsDropShadowEffect, QHeaderView
+    QHeaderView, QMessageBox, QStyle, QStyledItemDelegate
 )
-from PyQt5.QtCore import Qt
-from PyQt5.QtGui import QFont, QColor
+from PyQt5.QtCore import Qt, QRectF
+from PyQt5.QtGui import QFont, QColor, QPalette, QTextDocument
 
-from app.models.audit_log_model import AuditLogModel
+from app.models.audit_archive import AuditArchive
+from app.models.audit_log_model import AuditLogModel, HIGHLIGHT_START, HIGHLIGHT_END
+from app.views import theme
+from app.views.data_loader import DataLoader
+
+
+class HighlightDelegate(QStyledItemDelegate):
+    # Paints search matches marked in the item's Qt.UserRole text (see
+    # AuditLogModel.get_logs) on a highlighter background. Items without
+    # marked text paint as usual.
+
+    MATCH_STYLE = "background: #fde68a; font-weight: bold;"
+
+    def paint(self, painter, option, index):
+        marked = index.data(Qt.UserRole)
+        if not marked:
+            super().paint(painter, option, index)
+            return
+
+        self.initStyleOption(option, index)
+        option.text = ""
+        style = option.widget.style()
+        style.drawControl(QStyle.CE_ItemViewItem, option, painter, option.widget)
+
+        selected = option.state & QStyle.State_Selected
+        color = option.palette.color(QPalette.HighlightedText if selected else QPalette.Text)
+        html = (
+            escape(marked)
+            .replace(HIGHLIGHT_START, f'<span style="{self.MATCH_STYLE}">')
+            .replace(HIGHLIGHT_END, "</span>")
+        )
+        doc = QTextDocument()
+        doc.setDocumentMargin(0)
+        doc.setDefaultFont(option.font)
+        doc.setHtml(f'<div style="white-space: pre; color: {color.name()};">{html}</div>')
+
+        rect = style.subElementRect(QStyle.SE_ItemViewItemText, option, option.widget)
+        painter.save()
+        painter.translate(rect.left(), rect.top() + (rect.height() - doc.size().height()) / 2)
+        doc.drawContents(painter, QRectF(0, 0, rect.width(), rect.height()))
+        painter.restore()
 
 
 class AuditLogWindow(QWidget):
@@ -14,8 +55,16 @@ class AuditLogWindow(QWidget):
         super().__init__()
         self.setWindowTitle("Audit Logs")
         self.resize(1200, 620)
-        self.setStyleSheet("background: #eef1f6;")
+        theme.page(self)
         self.setup_ui()
+        self.filters_loader = DataLoader(self)
+        self.filters_loader.loaded.connect(self.show_filters)
+        self.filters_loader.failed.connect(self.on_load_failed)
+        self.logs_loader = DataLoader(self, busy_widgets=[self.table])
+        self.logs_loader.loaded.connect(self.show_logs)
+        self.logs_loader.failed.connect(self.on_load_failed)
+        self.logs_loader.busy_changed.connect(self.on_busy_changed)
+        self.show_periods()
         self.load_filters()
         self.load_logs()
 
@@ -24,21 +73,28 @@ class AuditLogWindow(QWidget):
         main.setContentsMargins(24, 24, 24, 24)
         main.setSpacing(16)
 
-        header = self._card()
+        header = theme.card()
         h = QHBoxLayout(header)
         h.setContentsMargins(24, 16, 24, 16)
         title = QLabel("Audit Log Viewer")
-        title.setFont(QFont("Segoe UI", 20, QFont.Bold))
-        title.setStyleSheet("color: #222;")
+        title.setFont(theme.font(20, QFont.Bold))
+        title.setObjectName("title")
         h.addWidget(title)
         h.addStretch()
         main.addWidget(header)
 
-        filters = self._card()
+        filters = theme.card()
         f = QHBoxLayout(filters)
         f.setContentsMargins(20, 14, 20, 14)
         f.setSpacing(12)
 
+        f.addWidget(QLabel("Period"))
+        self.period_combo = QComboBox()
+        self.period_combo.setMinimumWidth(150)
+        self.period_combo.setMinimumHeight(36)
+        self.period_combo.activated.connect(self.on_period_changed)
+        f.addWidget(self.period_combo)
+
         f.addWidget(QLabel("User"))
         self.user_combo = QComboBox()
         self.user_combo.setMinimumWidth(180)
@@ -53,28 +109,28 @@ class AuditLogWindow(QWidget):
 
         f.addWidget(QLabel("Search"))
         self.search_input = QLineEdit()
-        self.search_input.setPlaceholderText("details/action/entity")
+        self.search_input.setPlaceholderText("words in details/action/entity")
         self.search_input.setMinimumWidth(260)
         self.search_input.setMinimumHeight(36)
         self.search_input.returnPressed.connect(self.load_logs)
         f.addWidget(self.search_input)
 
-        refresh_btn = QPushButton("Refresh")
-        refresh_btn.setCursor(Qt.PointingHandCursor)
-        refresh_btn.setStyleSheet(self._btn_style("#4A90E2", "#3b7ac7"))
-        refresh_btn.clicked.connect(self.load_logs)
-        f.addWidget(refresh_btn)
+        self.refresh_btn = QPushButton("Refresh")
+        self.refresh_btn.setCursor(Qt.PointingHandCursor)
+        self.refresh_btn.setObjectName("primary")
+        self.refresh_btn.clicked.connect(self.refresh)
+        f.addWidget(self.refresh_btn)
 
         clear_btn = QPushButton("Clear")
         clear_btn.setCursor(Qt.PointingHandCursor)
-        clear_btn.setStyleSheet(self._btn_style("#6b7280", "#4b5563"))
+        clear_btn.setObjectName("muted")
         clear_btn.clicked.connect(self.clear_filters)
         f.addWidget(clear_btn)
 
         f.addStretch()
         main.addWidget(filters)
 
-        table_card = self._card()
+        table_card = theme.card()
         t = QVBoxLayout(table_card)
         t.setContentsMargins(16, 16, 16, 16)
 
@@ -96,54 +152,93 @@ class AuditLogWindow(QWidget):
         self.table.horizontalHeader().setSectionResizeMode(5, QHeaderView.ResizeToContents)
         self.table.horizontalHeader().setSectionResizeMode(6, QHeaderView.ResizeToContents)
         self.table.horizontalHeader().setSectionResizeMode(7, QHeaderView.Stretch)
-        self.table.setStyleSheet("""
-            QTableWidget {
-                border: none;
-                font-size: 13px;
-                alternate-background-color: #f6f8fb;
-                selection-background-color: #dbeafe;
-                selection-color: #1f2937;
-            }
-            QHeaderView::section {
-                background: #f0f3f8;
-                padding: 8px;
-                font-weight: bold;
-                border: none;
-            }
-        """)
+        self.table.setItemDelegateForColumn(7, HighlightDelegate(self.table))
+        self.table.setObjectName("dataTable")
         t.addWidget(self.table)
         main.addWidget(table_card, stretch=1)
 
-        self.user_combo.setStyleSheet(self._control_style())
-        self.action_combo.setStyleSheet(self._control_style())
-        self.search_input.setStyleSheet(self._control_style())
+        self.period_combo.setObjectName("control")
+        self.user_combo.setObjectName("control")
+        self.action_combo.setObjectName("control")
+        self.search_input.setObjectName("control")
+
+    def show_periods(self):
+        # Recent rows live in app.db; older months are read from their
+        # archive file when selected.
+        selected = self.period_combo.currentData()
+        self.period_combo.clear()
+        self.period_combo.addItem("Recent", "")
+        for month in AuditArchive.months():
+            self.period_combo.addItem(f"{month} (archive)", month)
+        self.period_combo.setCurrentIndex(max(self.period_combo.findData(selected), 0))
 
-    def load_filters(self):
-        rows = AuditLogModel.get_logs(limit=1000)
-        users = sorted({r["username"] for r in rows if r["username"]})
-        actions = sorted({r["action"] for r in rows if r["action"]})
+    def on_period_changed(self):
+        self.load_filters()
+        self.load_logs()
+
+    def load_filters(self, refresh=False):
+        month = self.period_combo.currentData()
+        if month:
+            self.filters_loader.load(AuditArchive.get_facets, month)
+        else:
+            self.filters_loader.load(AuditLogModel.get_facets, refresh)
+
+    def show_filters(self, facets):
+        users = facets["username"]
+        actions = facets["action"]
+
+        selected_user = self.user_combo.currentData()
+        selected_action = self.action_combo.currentData()
 
         self.user_combo.clear()
         self.user_combo.addItem("All", "")
         for user in users:
             self.user_combo.addItem(user, user)
+        self.user_combo.setCurrentIndex(max(self.user_combo.findData(selected_user), 0))
 
         self.action_combo.clear()
         self.action_combo.addItem("All", "")
         for action in actions:
             self.action_combo.addItem(action, action)
+        self.action_combo.setCurrentIndex(max(self.action_combo.findData(selected_action), 0))
 
     def load_logs(self):
         username = self.user_combo.currentData()
         action = self.action_combo.currentData()
         query = self.search_input.text().strip()
-        logs = AuditLogModel.get_logs(
+        month = self.period_combo.currentData()
+        if month:
+            self.logs_loader.load(
+                AuditArchive.get_logs,
+                month,
+                limit=1000,
+                username=username or None,
+                action=action or None,
+                query=query or None,
+            )
+            return
+        self.logs_loader.load(
+            AuditLogModel.get_logs,
             limit=1000,
             username=username or None,
             action=action or None,
             query=query or None,
         )
 
+    def refresh(self):
+        # Also picks up users and actions logged by other processes, and
+        # months archived since the window opened.
+        self.show_periods()
+        self.load_filters(refresh=True)
+        self.load_logs()
+
+    def on_busy_changed(self, busy):
+        self.refresh_btn.setText("Loading..." if busy else "Refresh")
+
+    def on_load_failed(self, message):
+        QMessageBox.critical(self, "Error", f"Failed to load audit logs:\n{message}")
+
+    def show_logs(self, logs):
         self.table.setRowCount(len(logs))
         for i, row in enumerate(logs):
             self.table.setItem(i, 0, QTableWidgetItem(row["created_at"] or ""))
@@ -155,6 +250,7 @@ class AuditLogWindow(QWidget):
             self.table.setItem(i, 6, QTableWidgetItem(str(row["product_id"] or "-")))
             details_item = QTableWidgetItem(row["details"] or "")
             details_item.setForeground(QColor("#374151"))
+            details_item.setData(Qt.UserRole, row["details_highlight"])
             self.table.setItem(i, 7, details_item)
 
     def clear_filters(self):
@@ -162,53 +258,3 @@ class AuditLogWindow(QWidget):
         self.action_combo.setCurrentIndex(0)
         self.search_input.clear()
         self.load_logs()
-
-    def _card(self):
-        frame = QFrame()
-        frame.setStyleSheet("""
-            QFrame {
-                background: white;
-                border-radius: 14px;
-            }
-        """)
-        shadow = QGraphicsDropShadowEffect()
-        shadow.setBlurRadius(16)
-        shadow.setYOffset(3)
-        shadow.setColor(QColor(0, 0, 0, 60))
-        frame.setGraphicsEffect(shadow)
-        return frame
-
-    def _control_style(self):
-        return """
-            QComboBox, QLineEdit {
-                padding: 6px 10px;
-                border-radius: 8px;
-                border: 1px solid #c9c9c9;
-                background: white;
-                font-size: 13px;
-            }
-            QComboBox:focus, QLineEdit:focus {
-                border: 1.5px solid #4A90E2;
-            }
-            QComboBox QAbstractItemView {
-                background: white;
-                color: #222;
-                selection-background-color: #808080;
-                selection-color: #ffffff;
-                outline: 0;
-            }
-        """
-
-    def _btn_style(self, bg, hover):
-        return f"""
-            QPushButton {{
-                background: {bg};
-                color: white;
-                padding: 7px 18px;
-                border-radius: 8px;
-                font-weight: bold;
-            }}
-            QPushButton:hover {{
-                background: {hover};
-            }}
-        """
@@ -0,0 +1,108 @@
+from PyQt5.QtCore import Qt, QObject, QRunnable, QThread, QThreadPool, pyqtSignal
+
+_pool = None
+
+
+def loader_pool():
+    # Loads get their own pool rather than QThreadPool.globalInstance():
+    # Qt splits image work (e.g. drop shadow blurs) across the global pool
+    # and waits for it on the GUI thread, so a slow load occupying it (on a
+    # one or two core till) would freeze painting until the load finished.
+    # Its threads never expire: each keeps a pooled database connection,
+    # which a thread retired after Qt's default 30 s idle would leave open.
+    global _pool
+    if _pool is None:
+        _pool = QThreadPool()
+        _pool.setMaxThreadCount(max(2, QThread.idealThreadCount()))
+        _pool.setExpiryTimeout(-1)
+    return _pool
+
+
+class _LoaderSignals(QObject):
+    finished = pyqtSignal(int, object)
+    failed = pyqtSignal(int, str)
+
+
+class _LoadTask(QRunnable):
+
+    def __init__(self, loader, generation, fn, args, kwargs):
+        super().__init__()
+        self.loader = loader
+        self.generation = generation
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.signals = loader._signals
+
+    def run(self):
+        # Skip work for a request that was superseded while it sat queued.
+        if self.loader.generation != self.generation:
+            return
+        try:
+            result = self.fn(*self.args, **self.kwargs)
+        except Exception as e:
+            self._emit("failed", str(e))
+        else:
+            self._emit("finished", result)
+
+    def _emit(self, signal_name, value):
+        try:
+            getattr(self.signals, signal_name).emit(self.generation, value)
+        except RuntimeError:
+            # The owning window was closed and deleted meanwhile.
+            pass
+
+
+class DataLoader(QObject):
+    # Runs model/controller calls on the loader pool and hands the
+    # result back on the GUI thread through `loaded`. Every load() starts a
+    # new generation: results of older requests (e.g. from rapid shop
+    # switching) are dropped, and ones still queued are never run.
+    # Database access is safe from pool threads because the connection
+    # manager keeps one connection per thread.
+
+    loaded = pyqtSignal(object)
+    failed = pyqtSignal(str)
+    busy_changed = pyqtSignal(bool)
+
+    def __init__(self, parent=None, busy_widgets=(), pool=None):
+        super().__init__(parent)
+        self.pool = pool or loader_pool()
+        self.busy_widgets = list(busy_widgets)
+        self.generation = 0
+        self.busy = False
+        self._signals = _LoaderSignals(self)
+        self._signals.finished.connect(self._on_finished)
+        self._signals.failed.connect(self._on_failed)
+
+    def load(self, fn, *args, **kwargs):
+        self.generation += 1
+        self.pool.start(_LoadTask(self, self.generation, fn, args, kwargs))
+        self._set_busy(True)
+
+    def cancel(self):
+        self.generation += 1
+        self._set_busy(False)
+
+    def _on_finished(self, generation, result):
+        if generation != self.generation:
+            return
+        self._set_busy(False)
+        self.loaded.emit(result)
+
+    def _on_failed(self, generation, message):
+        if generation != self.generation:
+            return
+        self._set_busy(False)
+        self.failed.emit(message)
+
+    def _set_busy(self, busy):
+        if busy == self.busy:
+            return
+        self.busy = busy
+        for widget in self.busy_widgets:
+            if busy:
+                widget.setCursor(Qt.BusyCursor)
+            else:
+                widget.unsetCursor()
+        self.busy_changed.emit(busy)
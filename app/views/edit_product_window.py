@@ -7,6 +7,7 @@ from PyQt5.QtCore import Qt
 from PyQt5.QtGui import QFont, QColor
 
 from app.models.product_model import ProductModel
+from app.controllers.product_controller import ProductController
 
 class EditProductWindow(QWidget):
     def __init__(self, product_id, on_success=None):
@@ -130,11 +131,12 @@ class EditProductWindow(QWidget):
             QMessageBox.warning(self, "Error", "Product name is required.")
             return
 
-        if ProductModel.exists_name(new_name, exclude_product_id=self.product_id):
-            QMessageBox.warning(self, "Error", "A product with this name already exists.")
+        try:
+            ProductController().rename_product(self.product_id, new_name)
+        except ValueError as e:
+            QMessageBox.warning(self, "Error", str(e))
             return
 
-        ProductModel.update_name(self.product_id, new_name)
         QMessageBox.information(self, "Success", "Product updated successfully.")
         if self.on_success:
             self.on_success()
@@ -0,0 +1,109 @@
+import threading
+from PyQt5.QtCore import Qt, QObject, QRunnable, pyqtSignal
+from PyQt5.QtWidgets import QMessageBox, QProgressDialog
+
+from app.controllers.export_controller import ExportCancelled
+from app.views.data_loader import loader_pool
+
+
+class _ExportSignals(QObject):
+    progress = pyqtSignal(int, object)
+    finished = pyqtSignal(int)
+    failed = pyqtSignal(str)
+    cancelled = pyqtSignal()
+
+
+class _ExportTask(QRunnable):
+
+    def __init__(self, signals, cancel_event, fn, path, args):
+        super().__init__()
+        self.signals = signals
+        self.cancel_event = cancel_event
+        self.fn = fn
+        self.path = path
+        self.args = args
+
+    def run(self):
+        try:
+            count = self.fn(
+                self.path, *self.args,
+                progress=lambda written, total: self._emit("progress", written, total),
+                cancelled=self.cancel_event.is_set,
+            )
+        except ExportCancelled:
+            self._emit("cancelled")
+        except Exception as e:
+            self._emit("failed", str(e))
+        else:
+            self._emit("finished", count)
+
+    def _emit(self, signal_name, *values):
+        try:
+            getattr(self.signals, signal_name).emit(*values)
+        except RuntimeError:
+            # The owning window was closed and deleted meanwhile.
+            self.cancel_event.set()
+
+
+class ExportRunner(QObject):
+    # Runs an ExportController export on the loader pool behind a window-
+    # modal progress dialog whose Cancel stops it between chunks, then
+    # reports the outcome on `parent`. One export at a time per window.
+
+    def __init__(self, parent):
+        super().__init__(parent)
+        self.parent_widget = parent
+        self.dialog = None
+        self.cancel_event = None
+        self.path = None
+        self._signals = _ExportSignals(self)
+        self._signals.progress.connect(self._on_progress)
+        self._signals.finished.connect(self._on_finished)
+        self._signals.failed.connect(self._on_failed)
+        self._signals.cancelled.connect(self._close)
+
+    @property
+    def running(self):
+        return self.dialog is not None
+
+    def start(self, fn, path, *args):
+        if self.running:
+            return
+        self.path = path
+        self.cancel_event = threading.Event()
+
+        self.dialog = QProgressDialog("Exporting...", "Cancel", 0, 0, self.parent_widget)
+        self.dialog.setWindowTitle("Export CSV")
+        self.dialog.setWindowModality(Qt.WindowModal)
+        self.dialog.setAutoClose(False)
+        self.dialog.setAutoReset(False)
+        self.dialog.setMinimumDuration(300)
+        self.dialog.canceled.connect(self.cancel_event.set)
+        self.dialog.setValue(0)
+
+        loader_pool().start(_ExportTask(self._signals, self.cancel_event, fn, path, args))
+
+    def _on_progress(self, written, total):
+        if self.dialog is None:
+            return
+        if total:
+            self.dialog.setMaximum(total)
+            self.dialog.setValue(min(written, total))
+        self.dialog.setLabelText(f"Exported {written:,} rows...")
+
+    def _on_finished(self, count):
+        self._close()
+        QMessageBox.information(
+            self.parent_widget, "Export Complete", f"Saved {count:,} rows to:\n{self.path}"
+        )
+
+    def _on_failed(self, message):
+        self._close()
+        QMessageBox.critical(self.parent_widget, "Export Failed", message)
+
+    def _close(self):
+        if self.dialog is not None:
+            self.dialog.canceled.disconnect()
+            self.dialog.close()
+            self.dialog.deleteLater()
+            self.dialog = None
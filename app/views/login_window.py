@@ -8,6 +8,7 @@ from PyQt5.QtWidgets import (
 from PyQt5.QtCore import Qt
 from PyQt5.QtGui import QFont, QColor, QIcon
 from app.controllers.auth_controller import AuthController
+from app.views.data_loader import DataLoader
 
 class LoginWindow(QWidget):
     def __init__(self, on_login_success):
@@ -15,6 +16,11 @@ class LoginWindow(QWidget):
         self.on_login_success = on_login_success
         self.is_logging_in = False
         self.setup_ui()
+        # PBKDF2 verification takes a noticeable fraction of a second, so it
+        # runs on a pool thread and the window keeps painting meanwhile.
+        self.login_loader = DataLoader(self)
+        self.login_loader.loaded.connect(self.on_login_finished)
+        self.login_loader.failed.connect(self.on_login_failed)
 
     def setup_ui(self):
         self.setWindowTitle("Login - Inventory System")
@@ -193,13 +199,9 @@ class LoginWindow(QWidget):
             return
 
         self.set_login_busy(True)
-        try:
-            user = AuthController.login(username, password)
-        except Exception as e:
-            self.set_error(f"Login error: {e}")
-            self.set_login_busy(False)
-            return
+        self.login_loader.load(AuthController.login, username, password)
 
+    def on_login_finished(self, user):
         self.set_login_busy(False)
         if user:
             self.on_login_success(user)
@@ -208,3 +210,7 @@ class LoginWindow(QWidget):
             self.set_error("Invalid username or password.")
             self.password_input.selectAll()
             self.password_input.setFocus()
+
+    def on_login_failed(self, message):
+        self.set_login_busy(False)
+        self.set_error(f"Login error: {message}")
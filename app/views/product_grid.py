@@ -0,0 +1,404 @@
+from array import array
+from bisect import bisect_left
+from PyQt5.QtWidgets import QTableView, QHeaderView
+from PyQt5.QtGui import QColor
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, QTimer
+from app.utils.money import format_money
+from app.utils.search_index import SearchIndex
+from app.views import theme
+
+COLUMNS = (
+    "ID", "Product", "Quantity",
+    "Avg Cost", "Last Purchase",
+    "Last Sale", "Profit"
+)
+
+PROFIT_COLUMN = 6
+PROFIT_UP = QColor("#1a9c4b")
+PROFIT_DOWN = QColor("#d64545")
+PROFIT_HIDDEN = QColor("#999")
+
+SEARCH_DEBOUNCE_MS = 150
+
+
+class ProductTableModel(QAbstractTableModel):
+    # Rows are kept as parallel column arrays (ints in array('q'), optional
+    # money values in plain lists) instead of one dict or item per cell.
+    # Text is formatted in data(), so only the rows the view actually paints
+    # are ever turned into strings.
+    #
+    # Sorting and searching never touch the column arrays: the model shows
+    # `_view`, the list of data rows that match the search, in sort order.
+    # Matches come from a SearchIndex over the product names, so a keystroke
+    # costs one index lookup instead of a Python filter call per row.
+
+    COLUMN_ATTRS = (
+        "_ids", "_names", "_lower_names", "_qty",
+        "_avg_cost", "_last_purchase", "_last_sale", "_profit"
+    )
+
+    def __init__(self, show_profit=True, parent=None):
+        super().__init__(parent)
+        self.show_profit = show_profit
+        self._sort = None
+        self._search = ""
+        self._clear()
+
+    def _clear(self):
+        self._ids = array("q")
+        self._names = []
+        self._lower_names = []
+        self._qty = array("q")
+        self._avg_cost = []
+        self._last_purchase = []
+        self._last_sale = []
+        self._profit = []
+        self._row_of = {}
+        self._index = None
+        self._order = None
+        self._rank = None
+        self._view = array("q")
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._view)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return COLUMNS[section]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row, col = self._view[index.row()], index.column()
+
+        if role == Qt.DisplayRole:
+            if col == 0:
+                return str(self._ids[row])
+            if col == 1:
+                return self._names[row]
+            if col == 2:
+                return str(self._qty[row])
+            if col == 3:
+                return self._money_or_dash(self._avg_cost[row])
+            if col == 4:
+                return self._money_or_dash(self._last_purchase[row])
+            if col == 5:
+                return self._money_or_dash(self._last_sale[row])
+            if not self.show_profit:
+                return "-"
+            profit = self._profit[row]
+            return "N/A" if profit is None else format_money(profit)
+
+        if role == Qt.ForegroundRole and col == PROFIT_COLUMN:
+            if not self.show_profit:
+                return PROFIT_HIDDEN
+            profit = self._profit[row]
+            if profit is not None:
+                return PROFIT_UP if profit > 0 else PROFIT_DOWN
+        return None
+
+    @staticmethod
+    def _money_or_dash(cents):
+        return format_money(cents) if cents else "-"
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        self._sort = (column, order) if column >= 0 else None
+        self._apply_sort()
+        self._set_view(self._compute_view())
+
+    def set_search_text(self, text):
+        text = text.strip().lower()
+        if text == self._search:
+            return
+        self._search = text
+        self._set_view(self._compute_view())
+
+    def _apply_sort(self):
+        # One keyed sorted() pass over the raw column values (numbers
+        # compare numerically, missing prices sort first). `_rank` maps a
+        # data row to its sort position so search results can be put in
+        # order without sorting on the column values again.
+        if self._sort is None:
+            self._order = self._rank = None
+            return
+        column, order = self._sort
+        keys = self._sort_keys(column)
+        self._order = array("q", sorted(
+            range(len(keys)),
+            key=keys.__getitem__,
+            reverse=order == Qt.DescendingOrder,
+        ))
+        self._rank = rank = array("q", bytes(8 * len(self._order)))
+        for position, row in enumerate(self._order):
+            rank[row] = position
+
+    def _sort_keys(self, col):
+        if col == 0:
+            return self._ids
+        if col == 1:
+            return self._lower_names
+        if col == 2:
+            return self._qty
+        if col == PROFIT_COLUMN and not self.show_profit:
+            # Hidden column: sorting must not reveal the profit ordering.
+            return [0] * len(self._ids)
+        values = (
+            self._avg_cost, self._last_purchase, self._last_sale, self._profit
+        )[col - 3]
+        return [(v is not None, v or 0) for v in values]
+
+    def _compute_view(self):
+        if not self._search:
+            if self._order is not None:
+                return array("q", self._order)
+            return array("q", range(len(self._ids)))
+
+        if self._index is None:
+            self._index = SearchIndex(zip(self._ids, self._names))
+        row_of = self._row_of
+        rows = [row_of[pid] for pid in self._index.search(self._search)]
+        if self._rank is not None:
+            rows.sort(key=self._rank.__getitem__)
+        else:
+            rows.sort()
+        return array("q", rows)
+
+    def _set_view(self, view):
+        # A different row count resets the model (ProductGrid restores the
+        # selection); a reorder of the same count remaps persistent indexes
+        # so the selection follows its product.
+        if len(view) != len(self._view):
+            self.beginResetModel()
+            self._view = view
+            self.endResetModel()
+            return
+
+        self.layoutAboutToBeChanged.emit()
+        old_view = self._view
+        self._view = view
+        persistent = self.persistentIndexList()
+        moved = []
+        for index in persistent:
+            try:
+                moved.append(self.index(view.index(old_view[index.row()]), index.column()))
+            except ValueError:
+                moved.append(QModelIndex())
+        self.changePersistentIndexList(persistent, moved)
+        self.layoutChanged.emit()
+
+    def product_at(self, row):
+        row = self._view[row]
+        return {
+            "product_id": self._ids[row],
+            "product_name": self._names[row],
+            "quantity": self._qty[row],
+        }
+
+    def has_product(self, product_id):
+        return product_id in self._row_of
+
+    def row_for_product(self, product_id):
+        row = self._row_of.get(product_id)
+        if row is None:
+            return None
+        try:
+            return self._view.index(row)
+        except ValueError:
+            return None
+
+    def set_products(self, rows, index=None):
+        # `index` is a SearchIndex over these rows' (product_id, name), built
+        # by the caller off the GUI thread; without one it is built on the
+        # first search.
+        self.beginResetModel()
+        self._clear()
+        for p in rows:
+            self._append(p)
+        self._index = index
+        self._apply_sort()
+        self._view = self._compute_view()
+        self.endResetModel()
+
+    def update_products(self, rows, index=None, partial=False):
+        # Incremental refresh keyed by product_id: changed rows emit
+        # dataChanged (or re-sort / re-filter), so the view keeps its scroll
+        # position, selection and sort. Added or removed products reset the
+        # model; ProductGrid reselects the same product afterwards.
+        # With `partial`, `rows` only covers some products (a change
+        # notification) and nothing else is dropped. An empty grid (e.g. a
+        # new shop) simply takes whatever rows arrive.
+        if not self._ids:
+            if rows or not partial:
+                self.set_products(rows, index)
+            return
+
+        incoming = {p["product_id"]: p for p in rows}
+
+        gone = 0 if partial else sum(1 for pid in self._row_of if pid not in incoming)
+        if gone > len(self._ids) // 2:
+            # Mostly a different catalog (e.g. another shop): reset instead.
+            self.set_products(rows, index)
+            return
+        if gone or any(pid not in self._row_of for pid in incoming):
+            self.beginResetModel()
+            if gone:
+                keep = [r for r, pid in enumerate(self._ids) if pid in incoming]
+                for attr in self.COLUMN_ATTRS:
+                    values = getattr(self, attr)
+                    kept = [values[r] for r in keep]
+                    if isinstance(values, array):
+                        kept = array(values.typecode, kept)
+                    setattr(self, attr, kept)
+                self._row_of = {pid: r for r, pid in enumerate(self._ids)}
+            for pid, p in incoming.items():
+                row = self._row_of.get(pid)
+                if row is None:
+                    self._append(p)
+                else:
+                    self._store(row, p)
+            self._index = index
+            self._apply_sort()
+            self._view = self._compute_view()
+            self.endResetModel()
+            return
+
+        changed = []
+        renamed = False
+        for pid, p in incoming.items():
+            row = self._row_of[pid]
+            name_changed = self._names[row] != p["product_name"]
+            if self._store(row, p):
+                changed.append(row)
+                renamed = renamed or name_changed
+
+        if index is not None:
+            self._index = index
+        elif renamed:
+            self._index = None
+
+        if not changed:
+            return
+        if self._sort or (renamed and self._search):
+            self._apply_sort()
+            self._set_view(self._compute_view())
+            return
+        # Unsorted, so the view lists data rows in ascending order.
+        last_col = len(COLUMNS) - 1
+        for row in changed:
+            position = bisect_left(self._view, row)
+            if position < len(self._view) and self._view[position] == row:
+                self.dataChanged.emit(
+                    self.index(position, 0), self.index(position, last_col)
+                )
+
+    def _append(self, p):
+        self._row_of[p["product_id"]] = len(self._ids)
+        self._ids.append(p["product_id"])
+        self._names.append(p["product_name"])
+        self._lower_names.append(p["product_name"].lower())
+        self._qty.append(p["quantity"])
+        self._avg_cost.append(p["avg_cost_cents"])
+        self._last_purchase.append(p["last_purchase_cents"])
+        self._last_sale.append(p["last_sale_cents"])
+        self._profit.append(p["profit_cents"])
+
+    def _store(self, row, p):
+        values = (
+            p["product_name"], p["quantity"], p["avg_cost_cents"],
+            p["last_purchase_cents"], p["last_sale_cents"], p["profit_cents"]
+        )
+        current = (
+            self._names[row], self._qty[row], self._avg_cost[row],
+            self._last_purchase[row], self._last_sale[row], self._profit[row]
+        )
+        if values == current:
+            return False
+        self._names[row] = p["product_name"]
+        self._lower_names[row] = p["product_name"].lower()
+        self._qty[row] = p["quantity"]
+        self._avg_cost[row] = p["avg_cost_cents"]
+        self._last_purchase[row] = p["last_purchase_cents"]
+        self._last_sale[row] = p["last_sale_cents"]
+        self._profit[row] = p["profit_cents"]
+        return True
+
+
+class ProductGrid(QTableView):
+    # Product table shared by AdminDashboard and StaffDashboard. Search
+    # text is debounced so a burst of keystrokes filters once.
+
+    def __init__(self, show_profit=True, parent=None):
+        super().__init__(parent)
+        self.product_model = ProductTableModel(show_profit=show_profit, parent=self)
+        self.setModel(self.product_model)
+        self._selected_id = None
+        self.product_model.modelAboutToBeReset.connect(self._remember_selection)
+        self.product_model.modelReset.connect(self._restore_selection)
+
+        self._search_text = ""
+        self._search_timer = QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(SEARCH_DEBOUNCE_MS)
+        self._search_timer.timeout.connect(self._apply_search)
+
+        self.setEditTriggers(self.NoEditTriggers)
+        self.setSelectionBehavior(self.SelectRows)
+        self.setSelectionMode(self.SingleSelection)
+        self.setAlternatingRowColors(True)
+        self.setSortingEnabled(True)
+        self.sortByColumn(-1, Qt.AscendingOrder)
+        self.setWordWrap(False)
+
+        vertical = self.verticalHeader()
+        vertical.setVisible(False)
+        vertical.setSectionResizeMode(QHeaderView.Fixed)
+        vertical.setDefaultSectionSize(44)
+
+        horizontal = self.horizontalHeader()
+        horizontal.setFixedHeight(48)
+        horizontal.setStretchLastSection(True)
+        horizontal.setSectionResizeMode(QHeaderView.Stretch)
+
+        self.setFont(theme.font(11))
+        self.setObjectName("productGrid")
+
+    def set_products(self, rows, reset=False, index=None):
+        if reset:
+            self.product_model.set_products(rows, index)
+        else:
+            self.product_model.update_products(rows, index)
+
+    def patch_products(self, rows):
+        self.product_model.update_products(rows, partial=True)
+
+    def set_search_text(self, text, immediate=False):
+        self._search_text = text
+        if immediate or not text.strip():
+            self._search_timer.stop()
+            self._apply_search()
+        else:
+            self._search_timer.start()
+
+    def _apply_search(self):
+        self.product_model.set_search_text(self._search_text)
+
+    def _remember_selection(self):
+        product = self.selected_product()
+        self._selected_id = product["product_id"] if product else None
+
+    def _restore_selection(self):
+        if self._selected_id is None:
+            return
+        row = self.product_model.row_for_product(self._selected_id)
+        if row is not None:
+            self.selectRow(row)
+
+    def selected_product(self):
+        index = self.currentIndex()
+        if not index.isValid():
+            return None
+        return self.product_model.product_at(index.row())
@@ -1,25 +1,33 @@
-import csv
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QComboBox,
     QPushButton, QDateEdit, QTableWidget, QTableWidgetItem,
-    QMessageBox, QFrame, QGraphicsDropShadowEffect, QHeaderView, QFileDialog
+    QMessageBox, QHeaderView, QFileDialog
 )
 from PyQt5.QtCore import QDate, Qt
-from PyQt5.QtGui import QFont, QColor
+from PyQt5.QtGui import QFont
 
+from app.controllers.export_controller import ExportController
 from app.models.shop_model import ShopModel
 from app.models.profit_report_model import ProfitReportModel
+from app.utils.money import format_money
+from app.views import theme
+from app.views.data_loader import DataLoader
+from app.views.export_runner import ExportRunner
 
 class ProfitReportWindow(QWidget):
     def __init__(self):
         super().__init__()
-        self.current_report = []
 
         self.setWindowTitle("Profit Report")
         self.resize(1000, 560)
-        self.setStyleSheet("background: #eef1f6;")
+        theme.page(self)
 
         self.setup_ui()
+        self.loader = DataLoader(self, busy_widgets=[self.table])
+        self.loader.loaded.connect(self.show_report)
+        self.loader.failed.connect(self.on_load_failed)
+        self.loader.busy_changed.connect(self.on_busy_changed)
+        self.exporter = ExportRunner(self)
         self.load_shops()
 
     def setup_ui(self):
@@ -28,20 +36,21 @@ class ProfitReportWindow(QWidget):
         main.setSpacing(16)
         main.setAlignment(Qt.AlignTop)
 
-        header = self._card()
+        header = theme.card()
         h = QHBoxLayout(header)
         h.setContentsMargins(24, 16, 24, 16)
 
         title = QLabel("Profit Report")
-        title.setFont(QFont("Segoe UI", 20, QFont.Bold))
+        title.setFont(theme.font(20, QFont.Bold))
         title.setMinimumHeight(40)
-        title.setStyleSheet("color: #222; padding-top: 2px;")
+        title.setObjectName("title")
+        title.setContentsMargins(0, 2, 0, 0)
         h.addWidget(title)
         h.addStretch()
 
         main.addWidget(header)
 
-        filters = self._card()
+        filters = theme.card()
         f = QHBoxLayout(filters)
         f.setContentsMargins(20, 14, 20, 14)
         f.setSpacing(14)
@@ -66,44 +75,22 @@ class ProfitReportWindow(QWidget):
         self.end_date.setMinimumHeight(36)
         f.addWidget(self.end_date)
 
-        load_btn = QPushButton("Load Report")
-        load_btn.setCursor(Qt.PointingHandCursor)
-        load_btn.setStyleSheet("""
-            QPushButton {
-                background: #4A90E2;
-                color: white;
-                padding: 6px 20px;
-                border-radius: 8px;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background: #3b7ac7;
-            }
-        """)
-        load_btn.clicked.connect(self.load_report)
-        f.addWidget(load_btn)
+        self.load_btn = QPushButton("Load Report")
+        self.load_btn.setCursor(Qt.PointingHandCursor)
+        self.load_btn.setObjectName("primary")
+        self.load_btn.clicked.connect(self.load_report)
+        f.addWidget(self.load_btn)
 
         export_btn = QPushButton("Export CSV")
         export_btn.setCursor(Qt.PointingHandCursor)
-        export_btn.setStyleSheet("""
-            QPushButton {
-                background: #2d9b5f;
-                color: white;
-                padding: 6px 20px;
-                border-radius: 8px;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background: #247f4d;
-            }
-        """)
+        export_btn.setObjectName("success")
         export_btn.clicked.connect(self.export_csv)
         f.addWidget(export_btn)
 
         f.addStretch()
         main.addWidget(filters)
 
-        table_card = self._card()
+        table_card = theme.card()
         t = QVBoxLayout(table_card)
         t.setContentsMargins(16, 16, 16, 16)
 
@@ -123,24 +110,10 @@ class ProfitReportWindow(QWidget):
             QHeaderView.Stretch
         )
 
-        self.table.setStyleSheet("""
-            QTableWidget {
-                border: none;
-                font-size: 13px;
-                alternate-background-color: #f6f8fb;
-                selection-background-color: #dbeafe;
-                selection-color: #1f2937;
-            }
-            QHeaderView::section {
-                background: #f0f3f8;
-                padding: 8px;
-                font-weight: bold;
-                border: none;
-            }
-        """)
-        self.shop_combo.setStyleSheet(self._control_style())
-        self.start_date.setStyleSheet(self._control_style())
-        self.end_date.setStyleSheet(self._control_style())
+        self.table.setObjectName("dataTable")
+        self.shop_combo.setObjectName("control")
+        self.start_date.setObjectName("control")
+        self.end_date.setObjectName("control")
 
         t.addWidget(self.table)
         main.addWidget(table_card, stretch=1)
@@ -160,25 +133,28 @@ class ProfitReportWindow(QWidget):
         start = self.start_date.date().toString("yyyy-MM-dd")
         end = self.end_date.date().toString("yyyy-MM-dd")
         if start > end:
+            self.loader.cancel()
             QMessageBox.warning(self, "Invalid Date Range", "From date must be on or before To date.")
             self.table.setRowCount(0)
-            self.current_report = []
             return
 
-        report = ProfitReportModel.get_profit_report(
-            shop_id, start, end
-        )
+        self.loader.load(ProfitReportModel.get_profit_report, shop_id, start, end)
+
+    def on_busy_changed(self, busy):
+        self.load_btn.setText("Loading..." if busy else "Load Report")
+
+    def on_load_failed(self, message):
+        QMessageBox.critical(self, "Error", f"Failed to load report:\n{message}")
 
+    def show_report(self, report):
         if not report:
             self.table.setRowCount(0)
-            self.current_report = []
             QMessageBox.information(
                 self, "No Data",
                 "No sales found for selected period."
             )
             return
 
-        self.current_report = report
         self.table.setRowCount(len(report))
 
         for row, item in enumerate(report):
@@ -186,13 +162,13 @@ class ProfitReportWindow(QWidget):
             self.table.setItem(row, 1, QTableWidgetItem(item["product_name"]))
             qty_item = QTableWidgetItem(str(item["qty_sold"]))
             qty_item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
-            sale_item = QTableWidgetItem(f"{item['sale_total']:.2f}")
+            sale_item = QTableWidgetItem(format_money(item["sale_total_cents"]))
             sale_item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
-            cost_item = QTableWidgetItem(f"{item['purchase_cost']:.2f}")
+            cost_item = QTableWidgetItem(format_money(item["purchase_cost_cents"]))
             cost_item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
-            ppu_item = QTableWidgetItem(f"{item['profit_per_unit']:.2f}")
+            ppu_item = QTableWidgetItem(format_money(item["profit_per_unit_cents"]))
             ppu_item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
-            profit_item = QTableWidgetItem(f"{item['total_profit']:.2f}")
+            profit_item = QTableWidgetItem(format_money(item["total_profit_cents"]))
             profit_item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
             self.table.setItem(row, 2, qty_item)
             self.table.setItem(row, 3, sale_item)
@@ -201,8 +177,15 @@ class ProfitReportWindow(QWidget):
             self.table.setItem(row, 6, profit_item)
 
     def export_csv(self):
-        if not self.current_report:
-            QMessageBox.information(self, "No Data", "No report data to export.")
+        shop_id = self.shop_combo.currentData()
+        if shop_id is None:
+            QMessageBox.warning(self, "Error", "Select a shop")
+            return
+
+        start = self.start_date.date().toString("yyyy-MM-dd")
+        end = self.end_date.date().toString("yyyy-MM-dd")
+        if start > end:
+            QMessageBox.warning(self, "Invalid Date Range", "From date must be on or before To date.")
             return
 
         path, _ = QFileDialog.getSaveFileName(
@@ -211,59 +194,4 @@ class ProfitReportWindow(QWidget):
         if not path:
             return
 
-        try:
-            with open(path, "w", newline="", encoding="utf-8") as f:
-                writer = csv.writer(f)
-                writer.writerow([
-                    "product_id", "product_name", "qty_sold", "sale_total",
-                    "purchase_cost", "profit_per_unit", "total_profit"
-                ])
-                for item in self.current_report:
-                    writer.writerow([
-                        item["product_id"],
-                        item["product_name"],
-                        item["qty_sold"],
-                        f"{item['sale_total']:.2f}",
-                        f"{item['purchase_cost']:.2f}",
-                        f"{item['profit_per_unit']:.2f}",
-                        f"{item['total_profit']:.2f}",
-                    ])
-            QMessageBox.information(self, "Export Complete", f"Saved CSV to:\n{path}")
-        except Exception as e:
-            QMessageBox.critical(self, "Export Failed", str(e))
-
-    def _card(self):
-        frame = QFrame()
-        frame.setStyleSheet("""
-            QFrame {
-                background: white;
-                border-radius: 14px;
-            }
-        """)
-        shadow = QGraphicsDropShadowEffect()
-        shadow.setBlurRadius(16)
-        shadow.setYOffset(3)
-        shadow.setColor(QColor(0, 0, 0, 60))
-        frame.setGraphicsEffect(shadow)
-        return frame
-
-    def _control_style(self):
-        return """
-            QComboBox, QDateEdit {
-                padding: 6px 10px;
-                border-radius: 8px;
-                border: 1px solid #c9c9c9;
-                background: white;
-                font-size: 13px;
-            }
-            QComboBox:focus, QDateEdit:focus {
-                border: 1.5px solid #4A90E2;
-            }
-            QComboBox QAbstractItemView {
-                background: white;
-                color: #222;
-                selection-background-color: #808080;
-                selection-color: #ffffff;
-                outline: 0;
-            }
-        """
+        self.exporter.start(ExportController.export_profit_report, path, shop_id, start, end)
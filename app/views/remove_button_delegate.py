@@ -0,0 +1,40 @@
+from PyQt5.QtWidgets import QStyle, QStyledItemDelegate
+from PyQt5.QtCore import Qt, QEvent, pyqtSignal
+from PyQt5.QtGui import QFont, QColor, QPainter
+
+
+class RemoveButtonDelegate(QStyledItemDelegate):
+    # Paints a row's Remove action as a button and reports clicks, instead
+    # of a styled QPushButton widget per row. The button text is the cell's
+    # display data.
+
+    remove_clicked = pyqtSignal(int)
+
+    BUTTON = QColor("#e04b4b")
+    BUTTON_HOVER = QColor("#c53e3e")
+
+    def paint(self, painter, option, index):
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+        rect = option.rect.adjusted(6, 4, -6, -4)
+        hovered = option.state & QStyle.State_MouseOver
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(self.BUTTON_HOVER if hovered else self.BUTTON)
+        painter.drawRoundedRect(rect, 6, 6)
+
+        font = QFont(option.font)
+        font.setBold(True)
+        painter.setFont(font)
+        painter.setPen(Qt.white)
+        painter.drawText(rect, Qt.AlignCenter, index.data())
+        painter.restore()
+
+    def editorEvent(self, event, model, option, index):
+        if (
+            event.type() == QEvent.MouseButtonRelease
+            and event.button() == Qt.LeftButton
+            and option.rect.contains(event.pos())
+        ):
+            self.remove_clicked.emit(index.row())
+            return True
+        return super().editorEvent(event, model, option, index)
@@ -3,15 +3,17 @@ from datetime import datetime
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QLabel, QHBoxLayout, QPushButton,
     QTableWidget, QTableWidgetItem, QMessageBox, QFileDialog,
-    QFrame, QGraphicsDropShadowEffect, QHeaderView
+    QFrame, QHeaderView
 )
 from PyQt5.QtCore import Qt, QRect
-from PyQt5.QtGui import QFont, QColor, QPainter, QPen
+from PyQt5.QtGui import QFont, QPainter, QPen
 from PyQt5.QtPrintSupport import QPrinter, QPrintDialog
 
 from app.models.sale_details_model import SaleDetailsModel
 from app.models.receipt_model import ReceiptModel
+from app.utils.money import format_money
 from app.db.database_init import get_data_dir
+from app.views import theme
 
 class SaleDetailsWindow(QWidget):
     def __init__(self, sale_id):
@@ -22,7 +24,7 @@ class SaleDetailsWindow(QWidget):
 
         self.setWindowTitle(f"Sale Details - Invoice #{sale_id}")
         self.resize(900, 520)
-        self.setStyleSheet("background: #eef1f6;")
+        theme.page(self)
 
         self.setup_ui()
         self.load_data()
@@ -33,34 +35,21 @@ class SaleDetailsWindow(QWidget):
         main.setSpacing(16)
         main.setAlignment(Qt.AlignTop)
 
-        header = QFrame()
-        header.setStyleSheet("""
-            QFrame {
-                background: white;
-                border-radius: 14px;
-            }
-        """)
-        header.setGraphicsEffect(self._shadow())
+        header = theme.card()
 
         header_layout = QVBoxLayout(header)
         header_layout.setContentsMargins(24, 18, 24, 18)
 
         self.header_label = QLabel("Loading sale…")
-        self.header_label.setFont(QFont("Segoe UI", 18, QFont.Bold))
+        self.header_label.setFont(theme.font(18, QFont.Bold))
         self.header_label.setMinimumHeight(36)
-        self.header_label.setStyleSheet("color: #222; padding-top: 2px;")
+        self.header_label.setObjectName("title")
+        self.header_label.setContentsMargins(0, 2, 0, 0)
         header_layout.addWidget(self.header_label)
 
         main.addWidget(header)
 
-        table_card = QFrame()
-        table_card.setStyleSheet("""
-            QFrame {
-                background: white;
-                border-radius: 14px;
-            }
-        """)
-        table_card.setGraphicsEffect(self._shadow())
+        table_card = theme.card()
 
         table_layout = QVBoxLayout(table_card)
         table_layout.setContentsMargins(16, 16, 16, 16)
@@ -79,60 +68,36 @@ class SaleDetailsWindow(QWidget):
             QHeaderView.Stretch
         )
 
-        self.table.setStyleSheet("""
-            QTableWidget {
-                border: none;
-                font-size: 13px;
-                alternate-background-color: #f6f8fb;
-            }
-            QHeaderView::section {
-                background: #f0f3f8;
-                padding: 8px;
-                font-weight: bold;
-                border: none;
-            }
-        """)
+        self.table.setObjectName("dataTable")
 
         table_layout.addWidget(self.table)
         main.addWidget(table_card, stretch=1)
 
-        summary = QFrame()
-        summary.setStyleSheet("""
-            QFrame {
-                background: white;
-                border-radius: 14px;
-            }
-        """)
-        summary.setGraphicsEffect(self._shadow())
+        summary = theme.card()
 
         summary_layout = QVBoxLayout(summary)
         summary_layout.setContentsMargins(24, 18, 24, 18)
 
         self.summary_label = QLabel("Grand Total: 0.00")
-        self.summary_label.setFont(QFont("Segoe UI", 16, QFont.Bold))
-        self.summary_label.setStyleSheet("color: #222;")
+        self.summary_label.setFont(theme.font(16, QFont.Bold))
+        self.summary_label.setObjectName("title")
         summary_layout.addWidget(self.summary_label, alignment=Qt.AlignRight)
 
         main.addWidget(summary)
 
         actions = QFrame()
-        actions.setStyleSheet("""
-            QFrame {
-                background: transparent;
-            }
-        """)
         actions_layout = QHBoxLayout(actions)
         actions_layout.setContentsMargins(0, 0, 0, 0)
 
         export_btn = QPushButton("Export Receipt PDF")
         export_btn.setCursor(Qt.PointingHandCursor)
-        export_btn.setStyleSheet(self._btn_style("#2d9b5f", "#247f4d"))
+        export_btn.setObjectName("success")
         export_btn.clicked.connect(self.export_receipt_pdf)
         actions_layout.addWidget(export_btn)
 
         print_btn = QPushButton("Print Receipt")
         print_btn.setCursor(Qt.PointingHandCursor)
-        print_btn.setStyleSheet(self._btn_style("#4A90E2", "#3b7ac7"))
+        print_btn.setObjectName("primary")
         print_btn.clicked.connect(self.print_receipt)
         actions_layout.addWidget(print_btn)
 
@@ -163,36 +128,14 @@ class SaleDetailsWindow(QWidget):
             self.table.setItem(r, 0, QTableWidgetItem(str(item["product_id"])))
             self.table.setItem(r, 1, QTableWidgetItem(item["product_name"]))
             self.table.setItem(r, 2, QTableWidgetItem(str(item["quantity"])))
-            self.table.setItem(r, 3, QTableWidgetItem(f"{item['price_per_unit']:.2f}"))
-            self.table.setItem(r, 4, QTableWidgetItem(f"{item['line_total']:.2f}"))
+            self.table.setItem(r, 3, QTableWidgetItem(format_money(item["price_per_unit_cents"])))
+            self.table.setItem(r, 4, QTableWidgetItem(format_money(item["line_total_cents"])))
 
         # Summary
         self.summary_label.setText(
-            f"Grand Total: {header['grand_total']:.2f}"
+            f"Grand Total: {format_money(header['grand_total_cents'])}"
         )
 
-    def _shadow(self):
-        s = QGraphicsDropShadowEffect()
-        s.setBlurRadius(16)
-        s.setYOffset(3)
-        s.setColor(QColor(0, 0, 0, 60))
-        return s
-
-    def _btn_style(self, bg, hover):
-        return f"""
-            QPushButton {{
-                background: {bg};
-                color: white;
-                border-radius: 8px;
-                padding: 9px 18px;
-                font-size: 13px;
-                font-weight: bold;
-            }}
-            QPushButton:hover {{
-                background: {hover};
-            }}
-        """
-
     def _draw_receipt(self, painter, page_rect):
         header = self.sale_header
         if not header:
@@ -205,13 +148,13 @@ class SaleDetailsWindow(QWidget):
         y = page_rect.top() + 36
 
         # Title
-        painter.setFont(QFont("Arial", 16, QFont.Bold))
+        painter.setFont(theme.font(16, QFont.Bold, "Arial"))
         title_h = painter.fontMetrics().height()
         painter.drawText(left, y + title_h, "KFC Inventory Receipt")
         y += title_h + 12
 
         # Meta
-        painter.setFont(QFont("Arial", 10))
+        painter.setFont(theme.font(10, family="Arial"))
         meta_h = painter.fontMetrics().height()
         painter.drawText(left, y + meta_h, f"Invoice: #{header['sale_id']}")
         y += meta_h + 6
@@ -231,7 +174,7 @@ class SaleDetailsWindow(QWidget):
         x_total = x_price + col_price
 
         # Header row
-        painter.setFont(QFont("Arial", 10, QFont.Bold))
+        painter.setFont(theme.font(10, QFont.Bold, "Arial"))
         header_row_h = painter.fontMetrics().height() + 12
         header_rect = QRect(left, y, width, header_row_h)
         product_head_rect = QRect(x_product, y, col_product, header_row_h)
@@ -250,7 +193,7 @@ class SaleDetailsWindow(QWidget):
         y += header_row_h
 
         # Data rows
-        painter.setFont(QFont("Arial", 10))
+        painter.setFont(theme.font(10, family="Arial"))
         row_h = painter.fontMetrics().height() + 12
         for item in self.sale_items:
             if y + row_h > page_rect.bottom() - 70:
@@ -270,18 +213,18 @@ class SaleDetailsWindow(QWidget):
 
             painter.drawText(product_rect.adjusted(6, 0, -6, 0), Qt.AlignVCenter | Qt.AlignLeft, str(item["product_name"]))
             painter.drawText(qty_rect.adjusted(6, 0, -6, 0), Qt.AlignVCenter | Qt.AlignRight, str(item["quantity"]))
-            painter.drawText(price_rect.adjusted(6, 0, -6, 0), Qt.AlignVCenter | Qt.AlignRight, f"{item['price_per_unit']:.2f}")
-            painter.drawText(total_rect.adjusted(6, 0, -6, 0), Qt.AlignVCenter | Qt.AlignRight, f"{item['line_total']:.2f}")
+            painter.drawText(price_rect.adjusted(6, 0, -6, 0), Qt.AlignVCenter | Qt.AlignRight, format_money(item["price_per_unit_cents"]))
+            painter.drawText(total_rect.adjusted(6, 0, -6, 0), Qt.AlignVCenter | Qt.AlignRight, format_money(item["line_total_cents"]))
             y += row_h
 
         y += 20
-        painter.setFont(QFont("Arial", 11, QFont.Bold))
+        painter.setFont(theme.font(11, QFont.Bold, "Arial"))
         total_h = painter.fontMetrics().height()
         total_rect = QRect(left, y, width, total_h + 8)
         painter.drawText(
             total_rect.adjusted(0, 0, -6, 0),
             Qt.AlignVCenter | Qt.AlignRight,
-            f"Grand Total: {header['grand_total']:.2f}"
+            f"Grand Total: {format_money(header['grand_total_cents'])}"
         )
 
     def export_receipt_pdf(self):
@@ -1,27 +1,122 @@
-import csv
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QComboBox,
-    QTableWidget, QTableWidgetItem, QDateEdit, QPushButton,
-    QFrame, QGraphicsDropShadowEffect, QHeaderView, QFileDialog, QMessageBox
+    QTableView, QDateEdit, QPushButton,
+    QHeaderView, QFileDialog, QMessageBox
 )
-from PyQt5.QtCore import QDate, Qt
-from PyQt5.QtGui import QFont, QColor
+from PyQt5.QtCore import QDate, Qt, QAbstractTableModel, QModelIndex
+from PyQt5.QtGui import QFont
 
+from app.controllers.export_controller import ExportController
 from app.models.shop_model import ShopModel
-from app.models.sale_model import SaleModel
+from app.models.sale_model import SaleModel, SALES_PAGE_SIZE, format_sale_date
+from app.utils.money import format_money
+from app.views import theme
+from app.views.data_loader import DataLoader
+from app.views.export_runner import ExportRunner
 from app.views.sale_details_window import SaleDetailsWindow
 
+COLUMNS = ("Sale ID", "Date", "Total")
+
+
+class SalesTableModel(QAbstractTableModel):
+    # Sales history filled one keyset page at a time: the view asks for the
+    # next page (canFetchMore / fetchMore) when it scrolls near the end, and
+    # `request_page(after)` loads it off the GUI thread. Rows stay raw
+    # (sale_id, iso_date, grand_total_cents) tuples; text is formatted in
+    # data(), so only the rows actually painted are ever formatted.
+
+    def __init__(self, request_page, parent=None):
+        super().__init__(parent)
+        self.request_page = request_page
+        self._rows = []
+        self._loading = False
+        self._exhausted = True
+
+    def reset(self, exhausted=False):
+        self.beginResetModel()
+        self._rows = []
+        self._loading = False
+        self._exhausted = exhausted
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return COLUMNS[section]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        sale_id, date, total_cents = self._rows[index.row()]
+        col = index.column()
+
+        if role == Qt.DisplayRole:
+            if col == 0:
+                return str(sale_id)
+            if col == 1:
+                return format_sale_date(date)
+            return format_money(total_cents)
+
+        if role == Qt.TextAlignmentRole and col == 2:
+            return int(Qt.AlignRight | Qt.AlignVCenter)
+
+        return None
+
+    def canFetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return False
+        return not (self._loading or self._exhausted)
+
+    def fetchMore(self, parent=QModelIndex()):
+        if not self.canFetchMore(parent):
+            return
+        self._loading = True
+        after = None
+        if self._rows:
+            last_sale_id, last_date, _ = self._rows[-1]
+            after = (last_date, last_sale_id)
+        self.request_page(after)
+
+    def append_page(self, rows, page_size=SALES_PAGE_SIZE):
+        self._loading = False
+        self._exhausted = len(rows) < page_size
+        if not rows:
+            return
+        first = len(self._rows)
+        self.beginInsertRows(QModelIndex(), first, first + len(rows) - 1)
+        self._rows.extend(rows)
+        self.endInsertRows()
+
+    def page_failed(self):
+        # Stop here rather than have the view retry on every scroll.
+        self._loading = False
+        self._exhausted = True
+
+    def sale_id_at(self, row):
+        return self._rows[row][0]
+
 
 class ShowSalesWindow(QWidget):
     def __init__(self):
         super().__init__()
-        self.current_sales = []
+        self.query = None
 
         self.setWindowTitle("Sales History")
         self.resize(950, 550)
-        self.setStyleSheet("background: #eef1f6;")
+        theme.page(self)
 
         self.setup_ui()
+        self.loader = DataLoader(self, busy_widgets=[self.table])
+        self.loader.loaded.connect(self.on_page_loaded)
+        self.loader.failed.connect(self.on_load_failed)
+        self.loader.busy_changed.connect(self.on_busy_changed)
+        self.exporter = ExportRunner(self)
         self.load_shops()
 
     def setup_ui(self):
@@ -30,34 +125,20 @@ class ShowSalesWindow(QWidget):
         main.setSpacing(14)
         main.setAlignment(Qt.AlignTop)
 
-        header = QFrame()
-        header.setStyleSheet("""
-            QFrame {
-                background: white;
-                border-radius: 14px;
-            }
-        """)
-        header.setGraphicsEffect(self.shadow())
+        header = theme.card()
 
         header_layout = QHBoxLayout(header)
         header_layout.setContentsMargins(24, 16, 24, 16)
 
         title = QLabel("Sales History")
-        title.setFont(QFont("Segoe UI", 20, QFont.Bold))
-        title.setStyleSheet("color: #222;")
+        title.setFont(theme.font(20, QFont.Bold))
+        title.setObjectName("title")
         header_layout.addWidget(title)
 
         header_layout.addStretch()
         main.addWidget(header)
 
-        filters = QFrame()
-        filters.setStyleSheet("""
-            QFrame {
-                background: white;
-                border-radius: 14px;
-            }
-        """)
-        filters.setGraphicsEffect(self.shadow())
+        filters = theme.card()
 
         f = QHBoxLayout(filters)
         f.setContentsMargins(20, 14, 20, 14)
@@ -84,96 +165,47 @@ class ShowSalesWindow(QWidget):
         self.end_date.setDate(QDate.currentDate())
         f.addWidget(self.end_date)
 
-        load_btn = QPushButton("Load")
-        load_btn.setCursor(Qt.PointingHandCursor)
-        load_btn.setStyleSheet("""
-            QPushButton {
-                background: #4A90E2;
-                color: white;
-                padding: 6px 18px;
-                border-radius: 8px;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background: #3b7ac7;
-            }
-        """)
-        load_btn.clicked.connect(self.load_sales)
-        f.addWidget(load_btn)
+        self.load_btn = QPushButton("Load")
+        self.load_btn.setCursor(Qt.PointingHandCursor)
+        self.load_btn.setObjectName("primary")
+        self.load_btn.clicked.connect(self.load_sales)
+        f.addWidget(self.load_btn)
 
         export_btn = QPushButton("Export CSV")
         export_btn.setCursor(Qt.PointingHandCursor)
-        export_btn.setStyleSheet("""
-            QPushButton {
-                background: #2d9b5f;
-                color: white;
-                padding: 6px 18px;
-                border-radius: 8px;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background: #247f4d;
-            }
-        """)
+        export_btn.setObjectName("success")
         export_btn.clicked.connect(self.export_csv)
         f.addWidget(export_btn)
 
         f.addStretch()
         main.addWidget(filters)
 
-        table_card = QFrame()
-        table_card.setStyleSheet("""
-            QFrame {
-                background: white;
-                border-radius: 14px;
-            }
-        """)
-        table_card.setGraphicsEffect(self.shadow())
+        table_card = theme.card()
 
         t_layout = QVBoxLayout(table_card)
         t_layout.setContentsMargins(16, 16, 16, 16)
 
-        self.table = QTableWidget(0, 3)
-        self.table.setHorizontalHeaderLabels(["Sale ID", "Date", "Total"])
+        self.sales_model = SalesTableModel(self.request_page, self)
+        self.table = QTableView()
+        self.table.setModel(self.sales_model)
         self.table.setEditTriggers(self.table.NoEditTriggers)
         self.table.verticalHeader().setVisible(False)
         self.table.setSelectionBehavior(self.table.SelectRows)
         self.table.setSelectionMode(self.table.SingleSelection)
         self.table.setAlternatingRowColors(True)
-        self.table.cellDoubleClicked.connect(self.open_sale_details)
+        self.table.doubleClicked.connect(self.open_sale_details)
         self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeToContents)
         self.table.horizontalHeader().setSectionResizeMode(1, QHeaderView.Stretch)
         self.table.horizontalHeader().setSectionResizeMode(2, QHeaderView.ResizeToContents)
 
-        self.table.setStyleSheet("""
-            QTableWidget {
-                border: none;
-                font-size: 13px;
-                alternate-background-color: #f6f8fb;
-                selection-background-color: #dbeafe;
-                selection-color: #1f2937;
-            }
-            QHeaderView::section {
-                background: #f0f3f8;
-                padding: 8px;
-                font-weight: bold;
-                border: none;
-            }
-        """)
-        self.shop_combo.setStyleSheet(self._control_style())
-        self.start_date.setStyleSheet(self._control_style())
-        self.end_date.setStyleSheet(self._control_style())
+        self.table.setObjectName("dataTable")
+        self.shop_combo.setObjectName("control")
+        self.start_date.setObjectName("control")
+        self.end_date.setObjectName("control")
 
         t_layout.addWidget(self.table)
         main.addWidget(table_card, stretch=1)
 
-    def shadow(self):
-        s = QGraphicsDropShadowEffect()
-        s.setBlurRadius(16)
-        s.setYOffset(3)
-        s.setColor(QColor(0, 0, 0, 60))
-        return s
-
     def load_shops(self):
         self.shop_combo.clear()
         shops = ShopModel.get_all()
@@ -188,76 +220,61 @@ class ShowSalesWindow(QWidget):
     def load_sales(self):
         shop_id = self.shop_combo.currentData()
         if shop_id is None:
-            self.table.setRowCount(0)
+            self.loader.cancel()
+            self.query = None
+            self.sales_model.reset(exhausted=True)
             return
 
         start = self.start_date.date().toString("yyyy-MM-dd")
         end = self.end_date.date().toString("yyyy-MM-dd")
         if start > end:
+            self.loader.cancel()
             QMessageBox.warning(self, "Invalid Date Range", "From date must be on or before To date.")
-            self.table.setRowCount(0)
-            self.current_sales = []
+            self.query = None
+            self.sales_model.reset(exhausted=True)
             return
 
-        sales = SaleModel.get_sales_by_shop_and_date(shop_id, start, end)
-        self.current_sales = sales
-        self.table.setRowCount(len(sales))
+        # A new filter starts a new generation in the loader, so a page
+        # still in flight for the old one is dropped.
+        self.query = (shop_id, start, end)
+        self.sales_model.reset()
+        self.sales_model.fetchMore()
+
+    def request_page(self, after):
+        shop_id, start, end = self.query
+        self.loader.load(SaleModel.get_sales_page, shop_id, start, end, after)
+
+    def on_busy_changed(self, busy):
+        self.load_btn.setText("Loading..." if busy else "Load")
+
+    def on_load_failed(self, message):
+        self.sales_model.page_failed()
+        QMessageBox.critical(self, "Error", f"Failed to load sales:\n{message}")
 
-        for row, sale in enumerate(sales):
-            self.table.setItem(row, 0, QTableWidgetItem(str(sale["sale_id"])))
-            self.table.setItem(row, 1, QTableWidgetItem(sale["date"]))
-            total_item = QTableWidgetItem(f"{sale['grand_total']:.2f}")
-            total_item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
-            self.table.setItem(row, 2, total_item)
+    def on_page_loaded(self, rows):
+        self.sales_model.append_page(rows)
 
-    def open_sale_details(self, row, col):
-        sale_id = int(self.table.item(row, 0).text())
+    def open_sale_details(self, index):
+        sale_id = self.sales_model.sale_id_at(index.row())
         self.details_window = SaleDetailsWindow(sale_id)
         self.details_window.show()
 
     def export_csv(self):
-        if not self.current_sales:
+        shop_id = self.shop_combo.currentData()
+        if shop_id is None:
             QMessageBox.information(self, "No Data", "No sales data to export.")
             return
 
+        start = self.start_date.date().toString("yyyy-MM-dd")
+        end = self.end_date.date().toString("yyyy-MM-dd")
+        if start > end:
+            QMessageBox.warning(self, "Invalid Date Range", "From date must be on or before To date.")
+            return
+
         path, _ = QFileDialog.getSaveFileName(
             self, "Export Sales CSV", "sales_history.csv", "CSV Files (*.csv)"
         )
         if not path:
             return
 
-        try:
-            with open(path, "w", newline="", encoding="utf-8") as f:
-                writer = csv.writer(f)
-                writer.writerow(["sale_id", "date", "grand_total"])
-                for sale in self.current_sales:
-                    writer.writerow([sale["sale_id"], sale["date"], f"{sale['grand_total']:.2f}"])
-            QMessageBox.information(self, "Export Complete", f"Saved CSV to:\n{path}")
-        except Exception as e:
-            QMessageBox.critical(self, "Export Failed", str(e))
-
-    def _control_style(self):
-        return """
-            QComboBox, QDateEdit {
-                padding: 6px 10px;
-                border-radius: 8px;
-                border: 1px solid #c9c9c9;
-                background: white;
-                font-size: 13px;
-                color: #222;
-            }
-            QComboBox:focus, QDateEdit:focus {
-                border: 1.5px solid #4A90E2;
-            }
-            QComboBox QAbstractItemView {
-                background: white;
-                color: #222;
-                selection-background-color: #808080;
-                selection-color: #ffffff;
-                outline: 0;
-            }
-            QComboBox QAbstractItemView::item:selected {
-                background: #808080;
-                color: #ffffff;
-            }
-        """
+        self.exporter.start(ExportController.export_sales, path, shop_id, start, end)
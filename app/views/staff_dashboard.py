@@ -1,18 +1,19 @@
 import sys
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
-    QComboBox, QTableWidget, QTableWidgetItem, QMessageBox,
-    QFrame, QGraphicsDropShadowEffect, QStyle
+    QComboBox, QMessageBox, QStyle
 )
-from PyQt5.QtGui import QFont, QColor
+from PyQt5.QtGui import QFont
 from PyQt5.QtCore import Qt
 
 from app.controllers.dashboard_controller import DashboardController
-from app.views.add_sale_window import AddSaleWindow
-from app.views.add_purchase_window import AddPurchaseWindow
-from app.views.show_sales_window import ShowSalesWindow
-from app.views.profit_report_window import ProfitReportWindow
-from app.views.weekly_profit_window import WeeklyProfitWindow
+from app.views import theme
+from app.views.data_loader import DataLoader
+from app.utils.event_bus import (
+    bus, STOCK_CHANGED, PRICES_CHANGED, PRODUCTS_CREATED, PRODUCT_RENAMED
+)
+from app.views.product_grid import ProductGrid
+from app.views.window_registry import window_class
 
 class StaffDashboard(QWidget):
     def __init__(self, user_info=None):
@@ -21,10 +22,22 @@ class StaffDashboard(QWidget):
         self.controller = DashboardController()
 
         self.setWindowTitle("Staff Dashboard - Inventory")
+        theme.page(self)
         self.showMaximized()
-        self.setStyleSheet("background: #eef1f6;")
 
         self.setup_ui()
+        self.loader = DataLoader(self, busy_widgets=[self.table])
+        self.loader.loaded.connect(self.on_products_loaded)
+        self.loader.failed.connect(self.on_load_failed)
+        # Saves elsewhere announce what they changed; only those rows are
+        # re-read and patched into the grid.
+        self.patch_loader = DataLoader(self)
+        self.patch_loader.loaded.connect(self.on_patch_loaded)
+        self.patch_loader.failed.connect(self.on_load_failed)
+        self.pending_patch = set()
+        for event in (STOCK_CHANGED, PRICES_CHANGED, PRODUCTS_CREATED):
+            bus.subscribe(event, self.on_products_changed)
+        bus.subscribe(PRODUCT_RENAMED, self.on_product_renamed)
         self.load_shops()
 
     def has_permission(self, key):
@@ -36,54 +49,27 @@ class StaffDashboard(QWidget):
         main_layout.setContentsMargins(30, 30, 30, 30)
         main_layout.setSpacing(20)
 
-        header = QFrame()
-        header.setStyleSheet("""
-            QFrame {
-                background: white;
-                border-radius: 14px;
-            }
-        """)
-
-        shadow = QGraphicsDropShadowEffect()
-        shadow.setBlurRadius(20)
-        shadow.setYOffset(3)
-        shadow.setColor(QColor(0, 0, 0, 60))
-        header.setGraphicsEffect(shadow)
+        header = theme.card(blur=20)
 
         header_layout = QHBoxLayout(header)
         header_layout.setContentsMargins(24, 18, 24, 18)
 
         title = QLabel("Staff Dashboard")
-        title.setFont(QFont("Segoe UI Semibold", 22))
+        title.setFont(theme.font(22, family="Segoe UI Semibold"))
         header_layout.addWidget(title)
 
         header_layout.addStretch()
 
         shop_label = QLabel("Shop:")
-        shop_label.setFont(QFont("Segoe UI", 11))
+        shop_label.setFont(theme.font(11))
         header_layout.addWidget(shop_label)
 
         self.shop_combo = QComboBox()
         self.shop_combo.setMinimumWidth(220)
         self.shop_combo.setMinimumHeight(40)
-        self.shop_combo.setFont(QFont("Segoe UI", 11))
+        self.shop_combo.setFont(theme.font(11))
         self.shop_combo.currentIndexChanged.connect(self.on_shop_changed)
-        self.shop_combo.setStyleSheet("""
-            QComboBox {
-                padding: 8px 12px;
-                border-radius: 8px;
-                border: 1px solid #c9c9c9;
-                background: white;
-                font-size: 13px;
-            }
-            QComboBox QAbstractItemView {
-                background: white;
-                color: #222;
-                selection-background-color: #808080;
-                selection-color: #ffffff;
-                outline: 0;
-            }
-        """)
+        self.shop_combo.setObjectName("shopPicker")
         header_layout.addWidget(self.shop_combo)
 
         refresh_btn = self.action_button("Refresh", QStyle.SP_BrowserReload, self.reload_current_shop)
@@ -91,55 +77,12 @@ class StaffDashboard(QWidget):
 
         main_layout.addWidget(header)
 
-        table_card = QFrame()
-        table_card.setStyleSheet("""
-            QFrame {
-                background: white;
-                border-radius: 14px;
-            }
-        """)
-        table_card.setGraphicsEffect(shadow)
+        table_card = theme.card(blur=20)
 
         table_layout = QVBoxLayout(table_card)
         table_layout.setContentsMargins(20, 20, 20, 20)
 
-        self.table = QTableWidget()
-        self.table.setColumnCount(7)
-        self.table.setHorizontalHeaderLabels([
-            "ID", "Product", "Quantity",
-            "Avg Cost", "Last Purchase",
-            "Last Sale", "Profit"
-        ])
-        self.table.setEditTriggers(self.table.NoEditTriggers)
-        self.table.setSelectionBehavior(self.table.SelectRows)
-        self.table.setAlternatingRowColors(True)
-        self.table.verticalHeader().setVisible(False)
-        self.table.setStyleSheet("""
-            QTableWidget {
-                border: none;
-                font-size: 11pt;
-                background: white;
-                alternate-background-color: #f6f8fb;
-            }
-            QHeaderView::section {
-                background: #f0f3f8;
-                padding: 12px;
-                font-weight: bold;
-                border: none;
-                color: #333;
-            }
-        """)
-        self.table.setFont(QFont("Segoe UI", 11))
-        self.table.verticalHeader().setDefaultSectionSize(44)
-
-        header_font = QFont("Segoe UI Semibold", 11)
-        self.table.horizontalHeader().setFont(header_font)
-        self.table.horizontalHeader().setFixedHeight(48)
-
-        self.table.horizontalHeader().setStretchLastSection(True)
-        self.table.horizontalHeader().setSectionResizeMode(
-            self.table.horizontalHeader().Stretch
-        )
+        self.table = ProductGrid(show_profit=False)
 
         table_layout.addWidget(self.table)
         main_layout.addWidget(table_card, stretch=1)
@@ -163,23 +106,11 @@ class StaffDashboard(QWidget):
 
     def action_button(self, text, icon, slot=None):
         b = QPushButton(text)
-        b.setIcon(self.style().standardIcon(icon))
+        b.setObjectName("action")
+        b.setIcon(theme.standard_icon(icon))
         b.setCursor(Qt.PointingHandCursor)
         b.setMinimumHeight(48)
-        b.setFont(QFont("Segoe UI", 11, QFont.Bold))
-        b.setStyleSheet("""
-            QPushButton {
-                background: #4A90E2;
-                color: white;
-                padding: 10px 16px;
-                border-radius: 8px;
-                font-size: 13px;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background: #3b7ac7;
-            }
-        """)
+        b.setFont(theme.font(11, QFont.Bold))
         if slot:
             b.clicked.connect(slot)
         return b
@@ -190,39 +121,64 @@ class StaffDashboard(QWidget):
         for s in shops:
             self.shop_combo.addItem(s["shop_name"], s["shop_id"])
         if shops:
-            self.load_products_for_current_shop()
+            self.load_products_for_current_shop(reset=True)
 
     def on_shop_changed(self):
-        self.load_products_for_current_shop()
+        self.load_products_for_current_shop(reset=True)
 
     def reload_current_shop(self):
         self.load_products_for_current_shop()
         # QMessageBox.information(self, "Refreshed", "Data refreshed successfully.")
 
-    def load_products_for_current_shop(self):
+    def load_products_for_current_shop(self, reset=False):
         shop_id = self.shop_combo.currentData()
-        rows = self.controller.get_products_for_shop(shop_id) if shop_id else []
-        self.table.setRowCount(len(rows))
+        if reset:
+            self.patch_loader.cancel()
+            self.pending_patch.clear()
+        if not shop_id:
+            self.loader.cancel()
+            self.table.set_products([], reset=True)
+            return
+        self.loader.load(self.fetch_products, shop_id, reset)
+
+    def fetch_products(self, shop_id, reset):
+        # Runs on a worker thread.
+        return reset, self.controller.get_products_for_shop(shop_id)
+
+    def on_products_loaded(self, result):
+        reset, rows = result
+        self.table.set_products(rows, reset=reset)
+
+    def on_products_changed(self, shop_id, product_ids):
+        if shop_id != self.shop_combo.currentData():
+            return
+        # A newer patch load supersedes an older one, so it covers every id
+        # still waiting.
+        self.pending_patch.update(product_ids)
+        self.patch_loader.load(self.fetch_product_rows, shop_id, frozenset(self.pending_patch))
+
+    def on_product_renamed(self, product_id, name):
+        if self.table.product_model.has_product(product_id):
+            self.on_products_changed(self.shop_combo.currentData(), [product_id])
 
-        for r, p in enumerate(rows):
-            self.table.setItem(r, 0, QTableWidgetItem(str(p["product_id"])))
-            self.table.setItem(r, 1, QTableWidgetItem(p["product_name"]))
-            self.table.setItem(r, 2, QTableWidgetItem(str(p["quantity"])))
-            self.table.setItem(r, 3, QTableWidgetItem(f"{p['avg_cost']:.2f}" if p["avg_cost"] else "-"))
-            self.table.setItem(r, 4, QTableWidgetItem(f"{p['last_purchase']:.2f}" if p["last_purchase"] else "-"))
-            self.table.setItem(r, 5, QTableWidgetItem(f"{p['last_sale']:.2f}" if p["last_sale"] else "-"))
+    def fetch_product_rows(self, shop_id, product_ids):
+        # Runs on a worker thread.
+        return shop_id, product_ids, self.controller.get_products_for_shop(shop_id, product_ids)
 
-            profit = QTableWidgetItem("-")
-            profit.setForeground(QColor("#999"))
-            self.table.setItem(r, 6, profit)
+    def on_patch_loaded(self, result):
+        shop_id, product_ids, rows = result
+        self.pending_patch -= product_ids
+        if shop_id == self.shop_combo.currentData():
+            self.table.patch_products(rows)
 
+    def on_load_failed(self, message):
+        QMessageBox.critical(self, "Error", f"Failed to load products:\n{message}")
 
     def add_sale(self):
         if not self.has_permission("add_sale"):
             QMessageBox.warning(self, "Access Denied", "You do not have permission to add sales.")
             return
-        self.sale_window = AddSaleWindow(
-            on_success=self.reload_current_shop,
+        self.sale_window = window_class("add_sale")(
             actor=self.user_info
         )
         self.sale_window.show()
@@ -231,8 +187,7 @@ class StaffDashboard(QWidget):
         if not self.has_permission("add_purchase"):
             QMessageBox.warning(self, "Access Denied", "You do not have permission to add purchases.")
             return
-        self.purchase_window = AddPurchaseWindow(
-            on_success=self.reload_current_shop,
+        self.purchase_window = window_class("add_purchase")(
             actor=self.user_info
         )
         self.purchase_window.show()
@@ -241,27 +196,28 @@ class StaffDashboard(QWidget):
         if not self.has_permission("show_sales"):
             QMessageBox.warning(self, "Access Denied", "You do not have permission to view sales.")
             return
-        self.sales_window = ShowSalesWindow()
+        self.sales_window = window_class("show_sales")()
         self.sales_window.show()
 
     def open_profit_report(self):
         if not self.has_permission("view_profit_report"):
             QMessageBox.warning(self, "Access Denied", "You do not have permission to view profit report.")
             return
-        self.profit_window = ProfitReportWindow()
+        self.profit_window = window_class("profit_report")()
         self.profit_window.show()
 
     def open_weekly_profit(self):
         if not self.has_permission("view_weekly_profit"):
             QMessageBox.warning(self, "Access Denied", "You do not have permission to view weekly profit.")
             return
-        self.weekly_window = WeeklyProfitWindow()
+        self.weekly_window = window_class("weekly_profit")()
         self.weekly_window.show()
 
 
 if __name__ == "__main__":
     from PyQt5.QtWidgets import QApplication
     app = QApplication(sys.argv)
+    theme.apply_theme(app)
     w = StaffDashboard({"username": "staff"})
     w.show()
     sys.exit(app.exec_())
@@ -0,0 +1,195 @@
+import os
+from functools import lru_cache
+from PyQt5.QtWidgets import QApplication, QFrame, QGraphicsDropShadowEffect
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QColor, QFont, QIcon
+
+from app.utils.resource_paths import get_assets_dir
+
+# The shared look of the dashboards and report windows. The stylesheet is
+# set once on the QApplication, and widgets opt in by object name, so opening
+# a window no longer parses a stylesheet string for every card, control and
+# button.
+#
+#   page                       window background, see page()
+#   card                       white rounded panel, see card()
+#   title                      window heading
+#   control                    combo boxes, date edits and line edits
+#   shopPicker                 the dashboards' shop combo box
+#   search, searchToggle       the dashboard search box and its button
+#   primary, success, muted    filled buttons
+#   action                     large dashboard buttons
+#   dataTable                  read-only report tables
+#   productGrid                the dashboards' ProductGrid
+#
+# A widget's own stylesheet always beats the application one, whatever the
+# selectors, so a themed window must not set a blanket stylesheet of its own.
+APP_STYLESHEET = """
+    QWidget#page {
+        background: #eef1f6;
+    }
+
+    QFrame#card {
+        background: white;
+        border-radius: 14px;
+    }
+
+    QLabel#title {
+        color: #222;
+    }
+
+    QComboBox#control, QDateEdit#control, QLineEdit#control {
+        padding: 6px 10px;
+        border-radius: 8px;
+        border: 1px solid #c9c9c9;
+        background: white;
+        font-size: 13px;
+        color: #222;
+    }
+    QComboBox#control:focus, QDateEdit#control:focus, QLineEdit#control:focus {
+        border: 1.5px solid #4A90E2;
+    }
+    QComboBox#control QAbstractItemView {
+        background: white;
+        color: #222;
+        selection-background-color: #808080;
+        selection-color: #ffffff;
+        outline: 0;
+    }
+    QComboBox#control QAbstractItemView::item:selected {
+        background: #808080;
+        color: #ffffff;
+    }
+
+    QComboBox#shopPicker {
+        padding: 8px 12px;
+        border-radius: 8px;
+        border: 1px solid #c9c9c9;
+        background: white;
+        font-size: 13px;
+        color: #222;
+    }
+    QComboBox#shopPicker QAbstractItemView {
+        background: white;
+        color: #222;
+        selection-background-color: #808080;
+        selection-color: #ffffff;
+        outline: 0;
+    }
+
+    QLineEdit#search {
+        padding: 6px 12px;
+        border-radius: 8px;
+        border: 1px solid #c9c9c9;
+        background: white;
+        font-size: 13px;
+    }
+    QToolButton#searchToggle {
+        border: none;
+    }
+
+    QPushButton#primary, QPushButton#success, QPushButton#muted {
+        color: white;
+        padding: 7px 18px;
+        border-radius: 8px;
+        font-weight: bold;
+    }
+    QPushButton#primary { background: #4A90E2; }
+    QPushButton#primary:hover { background: #3b7ac7; }
+    QPushButton#success { background: #2d9b5f; }
+    QPushButton#success:hover { background: #247f4d; }
+    QPushButton#muted { background: #6b7280; }
+    QPushButton#muted:hover { background: #4b5563; }
+
+    QPushButton#action {
+        background: #4A90E2;
+        color: white;
+        padding: 10px 16px;
+        border-radius: 8px;
+        font-size: 13px;
+        font-weight: bold;
+    }
+    QPushButton#action:hover {
+        background: #3b7ac7;
+    }
+
+    QTableWidget#dataTable, QTableView#dataTable {
+        border: none;
+        font-size: 13px;
+        alternate-background-color: #f6f8fb;
+        selection-background-color: #dbeafe;
+        selection-color: #1f2937;
+    }
+    QTableWidget#dataTable QHeaderView::section, QTableView#dataTable QHeaderView::section {
+        background: #f0f3f8;
+        padding: 8px;
+        font-weight: bold;
+        border: none;
+    }
+
+    QTableView#productGrid {
+        border: none;
+        font-size: 11pt;
+        background: white;
+        alternate-background-color: #f6f8fb;
+    }
+    QTableView#productGrid QHeaderView {
+        font-family: "Segoe UI Semibold";
+        font-size: 11pt;
+    }
+    QTableView#productGrid QHeaderView::section {
+        background: #f0f3f8;
+        padding: 12px;
+        font-weight: bold;
+        border: none;
+        color: #333;
+    }
+"""
+
+
+def apply_theme(app=None):
+    (app or QApplication.instance()).setStyleSheet(APP_STYLESHEET)
+
+
+@lru_cache(maxsize=None)
+def font(size, weight=QFont.Normal, family="Segoe UI"):
+    # Shared instances: setFont() copies, but never modify the returned font.
+    return QFont(family, size, weight)
+
+
+@lru_cache(maxsize=None)
+def icon(filename, theme_name=None):
+    if theme_name:
+        themed = QIcon.fromTheme(theme_name)
+        if not themed.isNull():
+            return themed
+    return QIcon(os.path.join(get_assets_dir(), filename))
+
+
+@lru_cache(maxsize=None)
+def standard_icon(pixmap):
+    return QApplication.style().standardIcon(pixmap)
+
+
+def shadow(blur=16):
+    # One effect per widget: installing an effect on a second widget
+    # removes it from the first.
+    effect = QGraphicsDropShadowEffect()
+    effect.setBlurRadius(blur)
+    effect.setYOffset(3)
+    effect.setColor(QColor(0, 0, 0, 60))
+    return effect
+
+
+def page(window):
+    # A plain QWidget only paints a stylesheet background when asked to.
+    window.setObjectName("page")
+    window.setAttribute(Qt.WA_StyledBackground, True)
+    return window
+
+
+def card(blur=16):
+    frame = QFrame()
+    frame.setObjectName("card")
+    frame.setGraphicsEffect(shadow(blur))
+    return frame
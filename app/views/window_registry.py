@@ -0,0 +1,25 @@
+from importlib import import_module
+
+# Secondary windows by name. Their modules (and the controllers and models
+# they pull in) are only imported the first time a window is opened, so
+# starting the app and showing a dashboard does not load every screen.
+WINDOWS = {
+    "admin_dashboard": ("app.views.admin_dashboard", "AdminDashboard"),
+    "staff_dashboard": ("app.views.staff_dashboard", "StaffDashboard"),
+    "add_product": ("app.views.add_product_window", "AddProductWindow"),
+    "edit_product": ("app.views.edit_product_window", "EditProductWindow"),
+    "adjust_stock": ("app.views.adjust_stock_window", "AdjustStockWindow"),
+    "add_sale": ("app.views.add_sale_window", "AddSaleWindow"),
+    "add_purchase": ("app.views.add_purchase_window", "AddPurchaseWindow"),
+    "show_sales": ("app.views.show_sales_window", "ShowSalesWindow"),
+    "profit_report": ("app.views.profit_report_window", "ProfitReportWindow"),
+    "weekly_profit": ("app.views.weekly_profit_window", "WeeklyProfitWindow"),
+    "staff_management": ("app.views.staff_management_window", "StaffManagementWindow"),
+    "audit_logs": ("app.views.audit_log_window", "AuditLogWindow"),
+    "shop_management": ("app.views.shop_management_window", "ShopManagementWindow"),
+}
+
+
+def window_class(name):
+    module_name, class_name = WINDOWS[name]
+    return getattr(import_module(module_name), class_name)
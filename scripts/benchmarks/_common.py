@@ -0,0 +1,106 @@
+# Shared helpers for the benchmark scripts in this folder.
+#
+# Benchmarks never touch the real app.db: import this module *before* any
+# app module so the data dir is redirected to a throwaway temp folder.
+# Worker processes inherit the folder through BENCH_DIR_ENV_VAR so they all
+# open the same database.
+import os
+import random
+import sys
+import tempfile
+import time
+
+BENCH_DIR_ENV_VAR = "INVENTORY_BENCH_DIR"
+
+_TEMP_DIR = os.environ.get(BENCH_DIR_ENV_VAR) or tempfile.mkdtemp(prefix="inventory-bench-")
+os.environ[BENCH_DIR_ENV_VAR] = _TEMP_DIR
+os.environ["LOCALAPPDATA"] = _TEMP_DIR
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from app.db.database_init import db, initialize_database  # noqa: E402
+
+
+def fresh_database():
+    initialize_database()
+    return db
+
+
+def best_of(fn, repeat=3):
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def report(label, seconds, extra=""):
+    print(f"{label:<44} {seconds * 1000:10.1f} ms {extra}")
+
+
+def seed_catalog(n_products, shop_id=1, purchases_per_product=3, sales=0,
+                 lines_per_sale=5, days=1, seed=42):
+    rng = random.Random(seed)
+    with db.transaction() as conn:
+        cur = conn.cursor()
+        cur.execute("SELECT COALESCE(MAX(product_id), 0) FROM Products")
+        first_id = cur.fetchone()[0] + 1
+        product_ids = list(range(first_id, first_id + n_products))
+
+        cur.executemany(
+            "INSERT INTO Products (product_id, name) VALUES (?, ?)",
+            [(pid, f"Product {pid:06d}") for pid in product_ids],
+        )
+        cur.executemany(
+            "INSERT INTO Stock (product_id, shop_id, quantity) VALUES (?, ?, ?)",
+            [(pid, shop_id, 1_000_000) for pid in product_ids],
+        )
+
+        purchases = []
+        for pid in product_ids:
+            for _ in range(purchases_per_product):
+                qty = rng.randint(1, 50)
+                price_cents = rng.randint(100, 10_000)
+                day = _day(rng.randrange(days))
+                purchases.append((pid, shop_id, qty, price_cents, qty * price_cents, day))
+        purchases.sort(key=lambda r: r[5])
+        cur.executemany(
+            """
+            INSERT INTO Purchases (product_id, shop_id, quantity, price_cents, total_cents, date)
+            VALUES (?, ?, ?, ?, ?, ?)
+            """,
+            purchases,
+        )
+
+        sale_days = sorted(rng.randrange(days) for _ in range(sales))
+        for day_index in sale_days:
+            stamp = f"{_day(day_index)}T{rng.randint(8, 21):02d}:{rng.randint(0, 59):02d}:00"
+            lines = []
+            for pid in rng.sample(product_ids, min(lines_per_sale, len(product_ids))):
+                qty = rng.randint(1, 5)
+                price_cents = rng.randint(100, 15_000)
+                lines.append((pid, qty, price_cents, qty * price_cents))
+            cur.execute(
+                "INSERT INTO Sales (shop_id, date, grand_total_cents) VALUES (?, ?, ?)",
+                (shop_id, stamp, sum(line[3] for line in lines)),
+            )
+            sale_id = cur.lastrowid
+            cur.executemany(
+                """
+                INSERT INTO SaleItems (sale_id, product_id, quantity, price_per_unit_cents, line_total_cents)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                [(sale_id, *line) for line in lines],
+            )
+
+        # Seeding bypasses the models, so derive the summary like an upgrade would.
+        from app.models.price_summary_model import PriceSummaryModel
+        PriceSummaryModel.rebuild_with_cursor(cur)
+    return product_ids
+
+
+def _day(index):
+    return time.strftime("%Y-%m-%d", time.gmtime(1704067200 + index * 86400))
@@ -0,0 +1,72 @@
+# Audit log retention: seeds two years of audit rows, then archives
+# everything outside a one-year retention period to per-month
+# compressed files and compacts app.db. Reports the database size, how long
+# the exit-time backup check takes and how fast the viewer's queries are before and
+# after, plus what reading an archived month costs.
+#
+#   python -m scripts.benchmarks.audit_archive [n_rows]
+import os
+import sys
+import time
+
+from scripts.benchmarks._common import best_of, fresh_database, report
+from scripts.benchmarks.audit_search import seed_audit_rows
+
+from app.controllers.backup_controller import BackupController
+from app.db.database_init import DB_PATH, db
+from app.models.audit_archive import ARCHIVE_DIR, RETENTION_ENV_VAR, AuditArchive
+from app.models.audit_log_model import AuditLogModel
+
+DAYS = 730
+LIMIT = 1000
+
+
+def database_state(label):
+    db.checkpoint("TRUNCATE")
+    backup_time, _ = best_of(BackupController.backup_if_changed)
+    report(f"{label}: backup check", backup_time, f"app.db {os.path.getsize(DB_PATH) / 1e6:.1f} MB")
+    newest, _ = best_of(lambda: AuditLogModel.get_logs(limit=LIMIT))
+    report(f"{label}: newest {LIMIT} rows", newest)
+    search, rows = best_of(lambda: AuditLogModel.get_logs(limit=LIMIT, query="stock"))
+    report(f"{label}: search 'stock'", search, f"{len(rows)} rows")
+
+
+def main():
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    os.environ[RETENTION_ENV_VAR] = "365"
+    fresh_database()
+    seed_audit_rows(
+        n_rows,
+        first_stamp=int(time.time()) - DAYS * 86400,
+        step_seconds=DAYS * 86400 / n_rows,
+    )
+    database_state("before")
+
+    start = time.perf_counter()
+    moved = AuditArchive.archive_expired()
+    report("archive rows older than a year", time.perf_counter() - start,
+           f"{moved} rows to {len(AuditArchive.months())} month files")
+    start = time.perf_counter()
+    with db.connection() as conn:
+        conn.execute("VACUUM")
+    report("VACUUM", time.perf_counter() - start)
+    archive_bytes = sum(
+        os.path.getsize(os.path.join(ARCHIVE_DIR, name)) for name in os.listdir(ARCHIVE_DIR)
+    )
+    print(f"archive files: {archive_bytes / 1e6:.1f} MB")
+    database_state("after")
+
+    month = AuditArchive.months()[0]
+    start = time.perf_counter()
+    rows = AuditArchive.get_logs(month, limit=LIMIT)
+    report(f"archive {month}: first open", time.perf_counter() - start)
+    cached, _ = best_of(lambda: AuditArchive.get_logs(month, limit=LIMIT))
+    report(f"archive {month}: newest {LIMIT} rows", cached)
+    search, rows = best_of(lambda: AuditArchive.get_logs(month, limit=LIMIT, query="stock"))
+    report(f"archive {month}: search 'stock'", search, f"{len(rows)} rows")
+    search, rows = best_of(lambda: AuditArchive.get_logs(month, limit=LIMIT, query="deactivated"))
+    report(f"archive {month}: search 'deactivated'", search, f"{len(rows)} rows")
+
+
+if __name__ == "__main__":
+    main()
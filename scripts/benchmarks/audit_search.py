@@ -0,0 +1,101 @@
+# Audit log search: the previous substring scan (details / entity type /
+# action LIKE '%q%' over the whole table) vs the FTS5 index, for a rare,
+# an uncommon and a very common search word, through AuditLogModel.get_logs
+# with the limit AuditLogWindow uses.
+#
+#   python -m scripts.benchmarks.audit_search [n_rows]
+import random
+import sys
+import time
+
+from scripts.benchmarks._common import best_of, fresh_database, report
+
+from app.db.database_init import db
+from app.models.audit_log_model import AuditLogModel
+
+LIMIT = 1000
+BATCH = 50_000
+
+LIKE_SQL = """
+    SELECT audit_id, user_id, username, action, entity_type, entity_id,
+           shop_id, product_id, details, created_at
+    FROM AuditLogs
+    WHERE (details LIKE ? OR entity_type LIKE ? OR action LIKE ?)
+    ORDER BY audit_id DESC LIMIT ?
+"""
+
+SEARCHES = (
+    ("rare", "Product 004321"),
+    ("uncommon", "deactivated"),
+    ("common", "stock"),
+)
+
+
+def seed_audit_rows(n_rows, seed=42, first_stamp=1704067200, step_seconds=6):
+    rng = random.Random(seed)
+    users = [f"staff{i:02d}" for i in range(20)]
+
+    def entry(i):
+        pick = rng.random()
+        pid = rng.randint(1, 5000)
+        name = f"Product {pid:06d}"
+        user = rng.choice(users)
+        stamp = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(first_stamp + int(i * step_seconds)))
+        if pick < 0.85:
+            qty = rng.randint(1, 5)
+            before = rng.randint(qty, 500)
+            return (None, user, "SALE_ADD", "Sale", i, 1, pid,
+                    f"{name}: qty={qty}, sale_price={rng.randint(1, 150)}.00, "
+                    f"stock {before} -> {before - qty}", stamp)
+        if pick < 0.97:
+            qty = rng.randint(1, 50)
+            before = rng.randint(0, 500)
+            return (None, user, "PURCHASE_ADD", "Purchase", i, 1, pid,
+                    f"{name}: qty={qty}, unit_price={rng.randint(1, 100)}.00, "
+                    f"stock {before} -> {before + qty}", stamp)
+        if pick < 0.9999:
+            before = rng.randint(0, 500)
+            return (None, "admin", "STOCK_ADJUST", "Stock", None, 1, pid,
+                    f"{name}: {before} -> {rng.randint(0, 500)}", stamp)
+        return (None, "admin", "USER_DEACTIVATE", "User", rng.randint(2, 50), None, None,
+                f"Deactivated user '{user}'", stamp)
+
+    with db.transaction() as conn:
+        for start in range(0, n_rows, BATCH):
+            conn.executemany(
+                """
+                INSERT INTO AuditLogs
+                (user_id, username, action, entity_type, entity_id, shop_id, product_id, details, created_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                [entry(i) for i in range(start, min(start + BATCH, n_rows))],
+            )
+
+
+def like_search(query):
+    like = f"%{query}%"
+    with db.connection() as conn:
+        return conn.execute(LIKE_SQL, (like, like, like, LIMIT)).fetchall()
+
+
+def main():
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    fresh_database()
+    start = time.perf_counter()
+    seed_audit_rows(n_rows)
+    report(f"seed {n_rows} audit rows (with index)", time.perf_counter() - start)
+
+    for label, query in SEARCHES:
+        like_time, like_rows = best_of(lambda: like_search(query))
+        fts_time, fts_rows = best_of(
+            lambda: AuditLogModel.get_logs(limit=LIMIT, query=query)
+        )
+        report(f"{label} '{query}', LIKE scan", like_time, f"{len(like_rows)} rows")
+        report(
+            f"{label} '{query}', full-text", fts_time,
+            f"{len(fts_rows)} rows, {like_time / fts_time:.1f}x the speed",
+        )
+
+
+if __name__ == "__main__":
+    main()
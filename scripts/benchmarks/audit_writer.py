@@ -0,0 +1,83 @@
+# Audit log throughput: synchronous AuditLogModel.log (one transaction per
+# entry, on the caller's thread) vs the buffered AuditLogWriter (the caller
+# only queues; a background thread writes in batches). Reports how long
+# callers are held up and how long until every entry is committed, for a
+# single burst and for entries logged from several threads at once.
+#
+#   python -m scripts.benchmarks.audit_writer [n_entries] [n_threads]
+import sys
+import threading
+import time
+
+from scripts.benchmarks._common import fresh_database, report
+
+from app.db.database_init import db
+from app.models.audit_log_model import AuditLogModel
+from app.models.audit_log_writer import AuditLogWriter
+
+
+def entry(i):
+    return dict(
+        action="STAFF_PERMISSIONS_UPDATE",
+        entity_type="User",
+        entity_id=i,
+        user_id=1,
+        username="admin",
+        details=f"Permissions for 'staff{i}' changed from [add_sale] to [add_sale, show_sales]",
+    )
+
+
+def burst(log, n_entries, n_threads):
+    per_thread = n_entries // n_threads
+
+    def work(first):
+        for i in range(first, first + per_thread):
+            log(**entry(i))
+
+    threads = [threading.Thread(target=work, args=(t * per_thread,)) for t in range(n_threads)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return time.perf_counter() - start, per_thread * n_threads
+
+
+def audit_rows():
+    with db.connection() as conn:
+        return conn.execute("SELECT COUNT(*) FROM AuditLogs").fetchone()[0]
+
+
+def run(label, n_entries, n_threads):
+    before = audit_rows()
+    commits = db.stats()["commits"]
+    held, total = burst(AuditLogModel.log, n_entries, n_threads)
+    assert audit_rows() - before == total
+    report(f"{label}: synchronous, callers held", held,
+           f"{total / held:,.0f} entries/s, {db.stats()['commits'] - commits} commits")
+
+    writer = AuditLogWriter(db)
+    writer.start()
+    before = audit_rows()
+    commits = db.stats()["commits"]
+    start = time.perf_counter()
+    held, total = burst(writer.log, n_entries, n_threads)
+    writer.flush()
+    committed = time.perf_counter() - start
+    writer.stop()
+    assert audit_rows() - before == total
+    report(f"{label}: buffered, callers held", held, f"{held / total * 1e6:.1f} us per entry")
+    report(f"{label}: buffered, all committed", committed,
+           f"{total / committed:,.0f} entries/s, {db.stats()['commits'] - commits} commits")
+
+
+def main():
+    n_entries = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    n_threads = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    fresh_database()
+    run("1 thread", n_entries, 1)
+    run(f"{n_threads} threads", n_entries, n_threads)
+
+
+if __name__ == "__main__":
+    main()
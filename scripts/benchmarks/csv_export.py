@@ -0,0 +1,57 @@
+# Sales CSV export: the previous approach (every sale of the range fetched
+# into a list of formatted dicts, then written) vs ExportController, which
+# streams fetchmany() chunks straight to disk. Reports wall time and the
+# peak Python heap each one needed (tracemalloc).
+#
+#   python -m scripts.benchmarks.csv_export [n_sales]
+import csv
+import os
+import sys
+import tracemalloc
+
+from scripts.benchmarks._common import BENCH_DIR_ENV_VAR, best_of, fresh_database, report, seed_catalog
+
+from app.controllers.export_controller import ExportController
+from app.models.sale_model import SaleModel
+from app.utils.money import format_money
+
+START, END = "2024-01-01", "2026-12-31"
+
+
+def materialized(path):
+    sales = SaleModel.get_sales_by_shop_and_date(1, START, END)
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["sale_id", "date", "grand_total"])
+        for sale in sales:
+            writer.writerow([sale["sale_id"], sale["date"], format_money(sale["grand_total_cents"])])
+    return len(sales)
+
+
+def streamed(path):
+    return ExportController.export_sales(path, 1, START, END)
+
+
+def peak_memory(fn, path):
+    tracemalloc.start()
+    fn(path)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+def main():
+    n_sales = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    fresh_database()
+    seed_catalog(200, purchases_per_product=1, sales=n_sales, lines_per_sale=1, days=3 * 365)
+    path = os.path.join(os.environ[BENCH_DIR_ENV_VAR], "sales.csv")
+
+    print(f"{n_sales} sales in shop 1 over three years")
+    for label, fn in (("fetch all, then write", materialized), ("streamed in chunks", streamed)):
+        seconds, rows = best_of(lambda: fn(path))
+        peak = peak_memory(fn, path)
+        report(f"{label} ({rows} rows)", seconds, f"peak heap {peak / 2**20:.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
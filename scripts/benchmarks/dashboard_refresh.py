@@ -0,0 +1,71 @@
+# Dashboard refresh: per-product history lookups (3N+1 queries, the old
+# DashboardController path) vs ProductModel.get_shop_summary, which reads
+# the maintained ProductPriceSummary table.
+#
+#   python -m scripts.benchmarks.dashboard_refresh [n_products]
+import sys
+
+from scripts.benchmarks._common import best_of, fresh_database, report, seed_catalog
+
+from app.controllers.dashboard_controller import DashboardController
+from app.db.database_init import db
+from app.models.product_model import ProductModel
+from app.utils.money import divide_cents
+
+
+def per_product_refresh(shop_id):
+    rows = []
+    for p in ProductModel.get_by_shop(shop_id):
+        pid = p["product_id"]
+        with db.connection() as conn:
+            total_cost, total_qty = conn.execute(
+                "SELECT SUM(quantity * price_cents), SUM(quantity) FROM Purchases "
+                "WHERE product_id=? AND shop_id=?",
+                (pid, shop_id),
+            ).fetchone()
+        with db.connection() as conn:
+            last_purchase = conn.execute(
+                "SELECT price_cents FROM Purchases WHERE product_id=? AND shop_id=? "
+                "ORDER BY purchase_id DESC LIMIT 1",
+                (pid, shop_id),
+            ).fetchone()
+        with db.connection() as conn:
+            last_sale = conn.execute(
+                "SELECT si.price_per_unit_cents FROM SaleItems si "
+                "JOIN Sales s ON s.sale_id = si.sale_id "
+                "WHERE si.product_id=? AND s.shop_id=? "
+                "ORDER BY si.sale_item_id DESC LIMIT 1",
+                (pid, shop_id),
+            ).fetchone()
+        rows.append((
+            pid,
+            divide_cents(total_cost, total_qty) if total_qty else None,
+            last_purchase[0] if last_purchase else None,
+            last_sale[0] if last_sale else None,
+        ))
+    return rows
+
+
+def main():
+    n_products = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    fresh_database()
+    seed_catalog(n_products, purchases_per_product=3, sales=n_products // 2)
+
+    controller = DashboardController()
+    set_based, rows = best_of(lambda: controller.get_products_for_shop(1))
+    per_product, legacy = best_of(lambda: per_product_refresh(1), repeat=1)
+
+    by_id = {r["product_id"]: r for r in rows}
+    for pid, avg_cost, last_purchase, last_sale in legacy:
+        row = by_id[pid]
+        assert (row["last_purchase_cents"], row["last_sale_cents"]) == (last_purchase, last_sale)
+        assert avg_cost == row["avg_cost_cents"]
+
+    print(f"{n_products} products, shop 1")
+    report("per-product lookups (3N+1 queries)", per_product)
+    report("get_products_for_shop (price summary)", set_based,
+           f"x{per_product / set_based:.0f} faster")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+# Building a large invoice line by line. Sale cart: the previous
+# refresh_table (every row's items and a styled QPushButton rebuilt on each
+# add) vs CartTableModel, which inserts one row per add and paints Remove
+# with a delegate. Purchase rows: the previous per-row combo (filled item by
+# item and styled), spin box, line edit and button vs PurchaseLinesModel,
+# whose delegate opens one editor at a time. Runs offscreen.
+#
+#   python -m scripts.benchmarks.invoice_entry [cart_lines] [purchase_rows] [n_products]
+import os
+import sys
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from scripts.benchmarks._common import best_of, fresh_database, report, seed_catalog
+
+from PyQt5.QtWidgets import (
+    QApplication, QComboBox, QLineEdit, QPushButton, QSpinBox, QTableWidget, QTableWidgetItem
+)
+
+from app.utils.money import format_money
+from app.views.add_purchase_window import AddPurchaseWindow
+from app.views.add_sale_window import AddSaleWindow
+
+COMBO_STYLE = """
+    QComboBox {
+        padding: 5px 8px;
+        border-radius: 6px;
+        border: 1px solid #c9c9c9;
+        background: white;
+        color: #222;
+    }
+"""
+
+
+def legacy_cart(app, lines):
+    table = QTableWidget(0, 6)
+    table.resize(940, 300)
+    table.show()
+    cart = []
+    for pid in range(1, lines + 1):
+        cart.append({"product_id": pid, "name": f"Product {pid}", "price_cents": 250,
+                     "qty": 1, "subtotal_cents": 250})
+        table.setRowCount(len(cart))
+        for r, item in enumerate(cart):
+            table.setItem(r, 0, QTableWidgetItem(str(item["product_id"])))
+            table.setItem(r, 1, QTableWidgetItem(item["name"]))
+            table.setItem(r, 2, QTableWidgetItem(format_money(item["price_cents"])))
+            table.setItem(r, 3, QTableWidgetItem(str(item["qty"])))
+            table.setItem(r, 4, QTableWidgetItem(format_money(item["subtotal_cents"])))
+            btn = QPushButton("Remove")
+            btn.setStyleSheet("QPushButton { background: #e04b4b; color: white; }")
+            table.setCellWidget(r, 5, btn)
+        app.processEvents()
+    table.close()
+    table.deleteLater()
+
+
+def model_cart(app, lines):
+    window = AddSaleWindow()
+    window.show()
+    for pid in range(1, lines + 1):
+        window.controller.add_to_cart(pid, f"Product {pid}", 250, 1, 1)
+        app.processEvents()
+    window.close()
+    window.deleteLater()
+
+
+def legacy_purchase(app, products, rows):
+    table = QTableWidget(0, 4)
+    table.resize(940, 300)
+    table.show()
+    for _ in range(rows):
+        row = table.rowCount()
+        table.insertRow(row)
+        combo = QComboBox()
+        combo.setEditable(True)
+        combo.setStyleSheet(COMBO_STYLE)
+        for pid, name in products:
+            combo.addItem(name, pid)
+        table.setCellWidget(row, 0, combo)
+        spin = QSpinBox()
+        spin.setRange(1, 100000)
+        table.setCellWidget(row, 1, spin)
+        table.setCellWidget(row, 2, QLineEdit())
+        btn = QPushButton("✕")
+        btn.setStyleSheet("QPushButton { background: #e04b4b; color: white; }")
+        table.setCellWidget(row, 3, btn)
+    app.processEvents()
+    table.close()
+    table.deleteLater()
+
+
+def model_purchase(app, window, rows):
+    for _ in range(rows):
+        window.add_row()
+    app.processEvents()
+    for row in reversed(range(rows)):
+        window.remove_row(row)
+
+
+def main():
+    lines = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    purchase_rows = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    n_products = int(sys.argv[3]) if len(sys.argv) > 3 else 5_000
+    fresh_database()
+    seed_catalog(n_products, purchases_per_product=1)
+    app = QApplication(sys.argv)
+
+    legacy_s, _ = best_of(lambda: legacy_cart(app, lines), repeat=1)
+    model_s, _ = best_of(lambda: model_cart(app, lines))
+    print(f"sale cart, {lines} lines added one at a time")
+    report("rebuild table + buttons per add", legacy_s)
+    report("model row insert + delegate", model_s, f"x{legacy_s / model_s:.0f} faster")
+
+    window = AddPurchaseWindow()
+    window.show()
+    legacy_s, _ = best_of(lambda: legacy_purchase(app, window.products, purchase_rows), repeat=1)
+    model_s, _ = best_of(lambda: model_purchase(app, window, purchase_rows))
+    print(f"purchase, {purchase_rows} rows, {n_products} products")
+    report("widgets per row", legacy_s)
+    report("model lines + delegate editors", model_s, f"x{legacy_s / model_s:.0f} faster")
+
+
+if __name__ == "__main__":
+    main()
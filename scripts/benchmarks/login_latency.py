@@ -0,0 +1,106 @@
+# Login latency: how long PBKDF2 verification takes at a few iteration
+# counts, and how long the GUI event loop stalls while a login is checked
+# on the GUI thread (the previous LoginWindow) vs on the worker pool. The
+# stall is the longest gap between ticks of a 5 ms timer. Runs offscreen.
+#
+#   python -m scripts.benchmarks.login_latency [attempts]
+import hashlib
+import os
+import sys
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from scripts.benchmarks._common import best_of, fresh_database, report
+
+from PyQt5.QtWidgets import QApplication
+from PyQt5.QtCore import QTimer
+
+from app.controllers.auth_controller import AuthController
+from app.models.user_model import PBKDF2_ITERATIONS
+from app.views.login_window import LoginWindow
+
+USERNAME = "admin"
+PASSWORD = "admin123"
+TICK_MS = 5
+
+
+class StallMeter:
+
+    def __init__(self):
+        self.timer = QTimer()
+        self.timer.setInterval(TICK_MS)
+        self.timer.timeout.connect(self.tick)
+
+    def start(self):
+        self.last = time.perf_counter()
+        self.worst = 0.0
+        self.timer.start()
+
+    def tick(self):
+        now = time.perf_counter()
+        self.worst = max(self.worst, now - self.last)
+        self.last = now
+
+    def stop(self):
+        self.timer.stop()
+        self.tick()
+        return self.worst
+
+
+def run_until(app, done):
+    while not done():
+        app.processEvents()
+        time.sleep(0.001)
+
+
+def sync_login(app, meter):
+    # What handle_login used to do: verify on the GUI thread.
+    result = {}
+    meter.start()
+    QTimer.singleShot(
+        0, lambda: result.setdefault("user", AuthController.login(USERNAME, PASSWORD)))
+    run_until(app, lambda: "user" in result)
+    return meter.stop()
+
+
+def window_login(app, meter):
+    result = {}
+    window = LoginWindow(lambda user: result.setdefault("user", user))
+    window.show()
+    window.username_input.setText(USERNAME)
+    window.password_input.setText(PASSWORD)
+    app.processEvents()
+    meter.start()
+    window.handle_login()
+    run_until(app, lambda: "user" in result)
+    stall = meter.stop()
+    window.close()
+    return stall
+
+
+def main():
+    attempts = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    fresh_database()
+    app = QApplication(sys.argv)
+    meter = StallMeter()
+
+    for iterations in (PBKDF2_ITERATIONS, 2 * PBKDF2_ITERATIONS, 3 * PBKDF2_ITERATIONS):
+        seconds, _ = best_of(
+            lambda: hashlib.pbkdf2_hmac("sha256", b"password", b"salt", iterations),
+            repeat=attempts,
+        )
+        report(f"PBKDF2-SHA256 {iterations} iterations", seconds)
+
+    login_s, user = best_of(lambda: AuthController.login(USERNAME, PASSWORD), repeat=attempts)
+    assert user and user["username"] == USERNAME
+    report("AuthController.login", login_s)
+
+    sync_stall = max(sync_login(app, meter) for _ in range(attempts))
+    async_stall = max(window_login(app, meter) for _ in range(attempts))
+    report("GUI stall, login on GUI thread", sync_stall)
+    report("GUI stall, LoginWindow (worker pool)", async_stall)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+# Oversell stress test: several processes (separate tills) sell the same
+# few low-stock products at once through SaleModel.create_sale. Afterwards
+# no stock row may be negative and, per product, the units that left the
+# stock must equal both the recorded SaleItems and what the tills were told
+# they sold (no oversell, no lost updates). Exits 1 on any violation.
+#
+#   python -m scripts.benchmarks.oversell_stress [processes] [attempts_per_process]
+import multiprocessing
+import random
+import sqlite3
+import sys
+import time
+from datetime import datetime
+
+from scripts.benchmarks._common import fresh_database, report, seed_catalog
+
+from app.db.database_init import db
+
+HOT_PRODUCTS = 5
+STARTING_STOCK = 200
+
+
+def till(args):
+    worker, attempts, product_ids = args
+    from app.models.sale_model import SaleModel
+
+    rng = random.Random(worker)
+    sold = {pid: 0 for pid in product_ids}
+    rejected = locked = 0
+    for _ in range(attempts):
+        items = []
+        for pid in rng.sample(product_ids, rng.randint(1, 3)):
+            qty = rng.randint(1, 4)
+            items.append({
+                "product_id": pid,
+                "name": f"Product {pid:06d}",
+                "price_cents": 500,
+                "qty": qty,
+                "subtotal_cents": qty * 500,
+            })
+        try:
+            SaleModel.create_sale(
+                1, datetime.now().isoformat(), items,
+                actor={"user_id": 1, "username": f"till-{worker}"},
+            )
+        except ValueError:
+            rejected += 1
+            continue
+        except sqlite3.OperationalError:
+            locked += 1
+            continue
+        for item in items:
+            sold[item["product_id"]] += item["qty"]
+    db.close_all()
+    return sold, rejected, locked
+
+
+def main():
+    processes = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    attempts = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    fresh_database()
+    product_ids = seed_catalog(HOT_PRODUCTS, purchases_per_product=1)
+    with db.transaction() as conn:
+        conn.execute("UPDATE Stock SET quantity = ?", (STARTING_STOCK,))
+    db.close_all()
+
+    start = time.perf_counter()
+    with multiprocessing.Pool(processes) as pool:
+        results = pool.map(till, [(w, attempts, product_ids) for w in range(processes)])
+    elapsed = time.perf_counter() - start
+
+    reported = {pid: 0 for pid in product_ids}
+    rejected = locked = 0
+    for sold, r, lk in results:
+        rejected += r
+        locked += lk
+        for pid, qty in sold.items():
+            reported[pid] += qty
+
+    with db.connection() as conn:
+        stock = dict(conn.execute(
+            "SELECT product_id, quantity FROM Stock WHERE shop_id = 1"
+        ).fetchall())
+        recorded = dict(conn.execute(
+            "SELECT product_id, SUM(quantity) FROM SaleItems GROUP BY product_id"
+        ).fetchall())
+
+    failures = []
+    for pid in product_ids:
+        left_stock = STARTING_STOCK - stock[pid]
+        if stock[pid] < 0:
+            failures.append(f"product {pid}: stock went negative ({stock[pid]})")
+        if not (left_stock == recorded.get(pid, 0) == reported[pid]):
+            failures.append(
+                f"product {pid}: stock moved {left_stock}, "
+                f"SaleItems {recorded.get(pid, 0)}, tills sold {reported[pid]}"
+            )
+
+    total = processes * attempts
+    print(f"{processes} tills x {attempts} sale attempts on {HOT_PRODUCTS} products "
+          f"with {STARTING_STOCK} units each")
+    print(f"committed {total - rejected - locked}, rejected for stock {rejected}, "
+          f"gave up on lock {locked}")
+    print(f"stock left: {[stock[pid] for pid in product_ids]}")
+    report("stress run", elapsed)
+    if failures:
+        print("\n".join(failures))
+        sys.exit(1)
+    print("no oversell, no lost updates")
+
+
+if __name__ == "__main__":
+    main()
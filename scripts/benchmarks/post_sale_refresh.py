@@ -0,0 +1,83 @@
+# Post-sale dashboard refresh: re-reading and diffing the whole shop (what
+# the dashboards did after every dialog's on_success) vs re-reading only the
+# products in the sale, as the dashboards now do on the STOCK_CHANGED /
+# PRICES_CHANGED events. Both include updating a ProductGrid; the sale
+# itself is not timed. Runs offscreen.
+#
+#   python -m scripts.benchmarks.post_sale_refresh [n_products] [lines_per_sale]
+import os
+import random
+import sys
+from datetime import datetime
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from scripts.benchmarks._common import best_of, fresh_database, report, seed_catalog
+
+from PyQt5.QtWidgets import QApplication
+
+from app.controllers.dashboard_controller import DashboardController
+from app.models.sale_model import SaleModel
+from app.views.product_grid import ProductGrid
+
+
+def sell(product_ids, lines, rng):
+    items = []
+    for pid in rng.sample(product_ids, lines):
+        price = rng.randint(100, 15_000)
+        items.append({
+            "product_id": pid,
+            "name": f"Product {pid}",
+            "price_cents": price,
+            "qty": 1,
+            "subtotal_cents": price,
+        })
+    SaleModel.create_sale(1, datetime.now().isoformat(), items)
+    return [item["product_id"] for item in items]
+
+
+def main():
+    n_products = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    lines = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    fresh_database()
+    product_ids = seed_catalog(n_products, purchases_per_product=1)
+    app = QApplication(sys.argv)
+    rng = random.Random(7)
+    controller = DashboardController()
+
+    grid = ProductGrid()
+    grid.resize(1200, 800)
+    grid.show()
+    grid.set_products(controller.get_products_for_shop(1), reset=True)
+    app.processEvents()
+
+    def full_refresh(sold):
+        grid.set_products(controller.get_products_for_shop(1))
+        app.processEvents()
+
+    def patch_refresh(sold):
+        grid.patch_products(controller.get_products_for_shop(1, sold))
+        app.processEvents()
+
+    timings = {full_refresh: [], patch_refresh: []}
+    for _ in range(3):
+        for refresh, seconds in timings.items():
+            sold = sell(product_ids, lines, rng)
+            seconds.append(best_of(lambda: refresh(sold), repeat=1)[0])
+
+    shown = {
+        grid.model().index(r, 0).data(): grid.model().index(r, 2).data()
+        for r in range(grid.model().rowCount())
+    }
+    for p in controller.get_products_for_shop(1):
+        assert shown[str(p["product_id"])] == str(p["quantity"])
+
+    full_s = min(timings[full_refresh])
+    patch_s = min(timings[patch_refresh])
+    print(f"{n_products} products, {lines}-line sale, shop 1")
+    report("full shop reload + grid diff", full_s)
+    report("sold products only + grid patch", patch_s, f"x{full_s / patch_s:.0f} faster")
+
+
+if __name__ == "__main__":
+    main()
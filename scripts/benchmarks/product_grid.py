@@ -0,0 +1,157 @@
+# Product grid: the previous QTableWidget fill (7 QTableWidgetItems per
+# product, sorting left enabled, repopulated on every search keystroke) vs
+# ProductGrid. Search is also compared against the earlier proxy filter
+# (a Python filterAcceptsRow() call per row on every keystroke); the
+# ProductGrid search goes through its SearchIndex, with the index build
+# timed separately since the dashboard does it on the loader thread.
+# Runs offscreen; times include the repaint.
+#
+#   python -m scripts.benchmarks.product_grid [n_rows]
+import os
+import random
+import sys
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from scripts.benchmarks._common import best_of, report  # noqa: F401
+
+from PyQt5.QtWidgets import QApplication, QTableWidget, QTableWidgetItem
+from PyQt5.QtGui import QColor
+from PyQt5.QtCore import QSortFilterProxyModel
+
+from app.utils.money import format_money
+from app.utils.search_index import SearchIndex
+from app.views.product_grid import COLUMNS, ProductGrid
+
+KEYSTROKES = ("p", "pr", "pro", "prod", "produ", "product 0", "product 00")
+
+
+def make_rows(n, seed=42):
+    rng = random.Random(seed)
+    rows = []
+    for pid in range(1, n + 1):
+        last_purchase = rng.randint(100, 10_000)
+        last_sale = rng.choice([None, rng.randint(100, 15_000)])
+        rows.append({
+            "product_id": pid,
+            "product_name": f"Product {rng.randrange(10 ** 6):06d}",
+            "quantity": rng.randint(0, 500),
+            "avg_cost_cents": rng.randint(100, 10_000),
+            "last_purchase_cents": last_purchase,
+            "last_sale_cents": last_sale,
+            "profit_cents": None if last_sale is None else last_sale - last_purchase,
+        })
+    return rows
+
+
+def legacy_table():
+    table = QTableWidget()
+    table.setColumnCount(len(COLUMNS))
+    table.setHorizontalHeaderLabels(COLUMNS)
+    table.setSortingEnabled(True)
+    table.resize(1200, 800)
+    table.show()
+    return table
+
+
+def legacy_populate(table, rows):
+    table.setRowCount(len(rows))
+    for r, p in enumerate(rows):
+        table.setItem(r, 0, QTableWidgetItem(str(p["product_id"])))
+        table.setItem(r, 1, QTableWidgetItem(p["product_name"]))
+        table.setItem(r, 2, QTableWidgetItem(str(p["quantity"])))
+        table.setItem(r, 3, QTableWidgetItem(
+            format_money(p["avg_cost_cents"]) if p["avg_cost_cents"] else "-"))
+        table.setItem(r, 4, QTableWidgetItem(
+            format_money(p["last_purchase_cents"]) if p["last_purchase_cents"] else "-"))
+        table.setItem(r, 5, QTableWidgetItem(
+            format_money(p["last_sale_cents"]) if p["last_sale_cents"] else "-"))
+        profit = QTableWidgetItem(
+            "N/A" if p["profit_cents"] is None else format_money(p["profit_cents"]))
+        if p["profit_cents"] is not None:
+            profit.setForeground(
+                QColor("#1a9c4b") if p["profit_cents"] > 0 else QColor("#d64545"))
+        table.setItem(r, 6, profit)
+
+
+def legacy_filter(table, rows, text):
+    text = text.strip().lower()
+    legacy_populate(table, [p for p in rows if text in p["product_name"].lower()])
+
+
+class LegacyFilterProxy(QSortFilterProxyModel):
+
+    def __init__(self, lower_names):
+        super().__init__()
+        self.lower_names = lower_names
+        self.text = ""
+
+    def set_search_text(self, text):
+        self.text = text.strip().lower()
+        self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        return not self.text or self.text in self.lower_names[source_row]
+
+
+def timed(app, fn):
+    def run():
+        fn()
+        app.processEvents()
+    return best_of(run, repeat=1)[0]
+
+
+def main():
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    app = QApplication(sys.argv)
+    rows = make_rows(n_rows)
+    changed = [dict(p, quantity=p["quantity"] + 1) if p["product_id"] % 100 == 0 else p
+               for p in rows]
+
+    table = legacy_table()
+    legacy_fill_s = timed(app, lambda: legacy_populate(table, rows))
+    legacy_search_s = timed(app, lambda: [legacy_filter(table, rows, t) for t in KEYSTROKES])
+    legacy_refresh_s = timed(app, lambda: legacy_populate(table, changed))
+    table.close()
+
+    grid = ProductGrid()
+    grid.resize(1200, 800)
+    grid.show()
+    fill_s = timed(app, lambda: grid.set_products(rows, reset=True))
+
+    proxy = LegacyFilterProxy([p["product_name"].lower() for p in rows])
+    proxy.setSourceModel(grid.model())
+    grid.setModel(proxy)
+    proxy_keys = [timed(app, lambda t=t: proxy.set_search_text(t)) for t in KEYSTROKES]
+    proxy.set_search_text("")
+    grid.setModel(grid.product_model)
+
+    index_s, index = best_of(
+        lambda: SearchIndex((p["product_id"], p["product_name"]) for p in rows), repeat=1)
+    grid.set_products(rows, reset=True, index=index)
+    search_keys = [
+        timed(app, lambda t=t: grid.set_search_text(t, immediate=True)) for t in KEYSTROKES
+    ]
+    grid.set_search_text("")
+    sort_s = timed(app, lambda: grid.sortByColumn(3, 0))
+    refresh_s = timed(app, lambda: grid.set_products(changed))
+    assert grid.model().rowCount() == n_rows
+
+    print(f"{n_rows} products, {len(KEYSTROKES)} search keystrokes, 1% rows changed on refresh")
+    report("QTableWidget populate", legacy_fill_s)
+    report("ProductGrid populate", fill_s, f"x{legacy_fill_s / fill_s:.0f} faster")
+    report("QTableWidget search (repopulate)", legacy_search_s)
+    report("proxy filter search", sum(proxy_keys),
+           f"worst keystroke {max(proxy_keys) * 1000:.1f} ms")
+    report("ProductGrid search (index)", sum(search_keys),
+           f"worst keystroke {max(search_keys) * 1000:.1f} ms, "
+           f"x{sum(proxy_keys) / sum(search_keys):.0f} faster than the proxy")
+    report("SearchIndex build (loader thread)", index_s)
+    report("QTableWidget refresh (repopulate)", legacy_refresh_s)
+    report("ProductGrid refresh (incremental)", refresh_s,
+           f"x{legacy_refresh_s / refresh_s:.0f} faster")
+    report("ProductGrid sort by avg cost", sort_s)
+
+
+if __name__ == "__main__":
+    main()
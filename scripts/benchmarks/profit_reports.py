@@ -0,0 +1,128 @@
+# Profit reports: the previous correlated "latest purchase price" subquery
+# vs the shared as-of engine (app/models/sale_cost_model.py). Both reports
+# are checked to return the same figures before timings are printed.
+#
+#   python -m scripts.benchmarks.profit_reports [n_products] [n_sales]
+import sys
+
+from scripts.benchmarks._common import best_of, fresh_database, report, seed_catalog
+
+from app.db.database_init import db
+from app.models.profit_report_model import ProfitReportModel
+from app.models.weekly_profit_model import WeeklyProfitModel
+
+LEGACY_PROFIT_SQL = """
+    SELECT
+        si.product_id,
+        p.name AS product_name,
+        si.quantity,
+        si.price_per_unit_cents,
+        si.line_total_cents,
+        COALESCE((
+            SELECT pr.price_cents
+            FROM Purchases pr
+            WHERE pr.product_id = si.product_id
+              AND pr.shop_id = s.shop_id
+              AND date(pr.date) <= date(s.date)
+            ORDER BY date(pr.date) DESC, pr.purchase_id DESC
+            LIMIT 1
+        ), 0) AS purchase_price_cents
+    FROM SaleItems si
+    JOIN Sales s ON s.sale_id = si.sale_id
+    JOIN Products p ON p.product_id = si.product_id
+    WHERE s.shop_id = ?
+      AND date(s.date) BETWEEN date(?) AND date(?)
+    ORDER BY p.name, si.sale_item_id
+"""
+
+LEGACY_WEEKLY_SQL = """
+    SELECT
+        strftime('%Y-W%W', date(s.date, '-2 days')) AS week,
+        SUM(si.line_total_cents) AS total_sales_cents,
+        SUM(si.quantity * (
+            SELECT price_cents
+            FROM Purchases p
+            WHERE p.product_id = si.product_id
+              AND p.shop_id = s.shop_id
+              AND date(p.date) <= date(s.date)
+            ORDER BY date(p.date) DESC, p.purchase_id DESC
+            LIMIT 1
+        )) AS purchase_cost_cents
+    FROM Sales s
+    JOIN SaleItems si ON si.sale_id = s.sale_id
+    WHERE s.shop_id = ?
+      AND date(s.date) BETWEEN date(?) AND date(?)
+    GROUP BY week
+    ORDER BY week DESC
+"""
+
+
+def legacy_rows(sql, *params):
+    with db.connection() as conn:
+        return conn.execute(sql, params).fetchall()
+
+
+def legacy_profit_report(shop_id, start, end):
+    report_rows = {}
+    for pid, name, qty, sale_price, sale_total, purchase_price in legacy_rows(
+        LEGACY_PROFIT_SQL, shop_id, start, end
+    ):
+        entry = report_rows.setdefault(pid, {
+            "product_id": pid,
+            "product_name": name,
+            "qty_sold": 0,
+            "sale_total_cents": 0,
+            "purchase_cost_cents": 0,
+            "profit_per_unit_cents": sale_price - purchase_price,
+            "total_profit_cents": 0,
+        })
+        entry["qty_sold"] += qty
+        entry["sale_total_cents"] += sale_total
+        entry["purchase_cost_cents"] += purchase_price * qty
+        entry["total_profit_cents"] += (sale_price - purchase_price) * qty
+    return list(report_rows.values())
+
+
+def assert_same(expected, actual):
+    assert len(expected) == len(actual), (len(expected), len(actual))
+    for a, b in zip(expected, actual):
+        assert a == b, (a, b)
+
+
+def main():
+    n_products = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    n_sales = int(sys.argv[2]) if len(sys.argv) > 2 else 10_000
+    fresh_database()
+    seed_catalog(n_products, purchases_per_product=12, sales=n_sales,
+                 lines_per_sale=4, days=365)
+    start, end = "2024-01-01", "2024-12-31"
+
+    legacy_profit_s, legacy_profit = best_of(
+        lambda: legacy_profit_report(1, start, end), repeat=1)
+    profit_s, profit = best_of(
+        lambda: ProfitReportModel.get_profit_report(1, start, end))
+    assert_same(legacy_profit, profit)
+
+    legacy_weekly_s, legacy_weekly = best_of(
+        lambda: legacy_rows(LEGACY_WEEKLY_SQL, 1, start, end), repeat=1)
+    weekly_s, weekly = best_of(
+        lambda: WeeklyProfitModel.get_weekly_profit(1, start, end))
+    assert_same(
+        [{"week": w, "total_sales_cents": s, "purchase_cost_cents": c or 0}
+         for w, s, c in legacy_weekly],
+        [{k: r[k] for k in ("week", "total_sales_cents", "purchase_cost_cents")}
+         for r in weekly],
+    )
+
+    print(f"{n_products} products x 12 purchases, {n_sales} sales x 4 lines over 365 days")
+    print("results identical to the correlated-subquery reports")
+    report("profit report, correlated subquery", legacy_profit_s)
+    report("profit report, as-of engine", profit_s,
+           f"x{legacy_profit_s / profit_s:.0f} faster")
+    report("weekly profit, correlated subquery", legacy_weekly_s)
+    report("weekly profit, as-of engine", weekly_s,
+           f"x{legacy_weekly_s / weekly_s:.0f} faster")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+# Sale commit: the previous per-line path (stock pre-check per item on its
+# own connection, then SELECT/INSERT/UPDATE/summary/audit per line) vs the
+# batched SaleModel.create_sale. Both paths sell the same invoices; stock
+# is checked afterwards to have dropped by exactly twice what was sold.
+#
+#   python -m scripts.benchmarks.sale_commit [n_invoices] [lines_per_invoice]
+import random
+import sys
+import time
+from datetime import datetime
+
+from scripts.benchmarks._common import fresh_database, report, seed_catalog
+
+from app.db.database_init import db
+from app.models.audit_log_model import AuditLogModel
+from app.models.sale_model import SaleModel
+from app.models.stock_model import StockModel
+
+ACTOR = {"user_id": 1, "username": "admin"}
+
+
+def legacy_create_sale(shop_id, date, items):
+    for item in items:
+        if item["qty"] > StockModel.get_quantity(item["product_id"], shop_id):
+            raise ValueError(f"Insufficient stock for {item['name']}")
+
+    with db.transaction() as conn:
+        cur = conn.cursor()
+        cur.execute(
+            "INSERT INTO Sales (shop_id, date, grand_total_cents) VALUES (?, ?, ?)",
+            (shop_id, date, sum(i["subtotal_cents"] for i in items)),
+        )
+        sale_id = cur.lastrowid
+        for item in items:
+            cur.execute(
+                "SELECT quantity FROM Stock WHERE product_id = ? AND shop_id = ?",
+                (item["product_id"], shop_id),
+            )
+            old_stock = cur.fetchone()[0]
+            cur.execute(
+                """
+                INSERT INTO SaleItems
+                (sale_id, product_id, quantity, price_per_unit_cents, line_total_cents)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                (sale_id, item["product_id"], item["qty"],
+                 item["price_cents"], item["subtotal_cents"]),
+            )
+            cur.execute(
+                "UPDATE Stock SET quantity = quantity - ? WHERE product_id = ? AND shop_id = ?",
+                (item["qty"], item["product_id"], shop_id),
+            )
+            cur.execute(
+                """
+                INSERT INTO ProductPriceSummary
+                (product_id, shop_id, last_sale_price_cents, last_movement_at)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT(product_id, shop_id) DO UPDATE SET
+                    last_sale_price_cents = excluded.last_sale_price_cents,
+                    last_movement_at = excluded.last_movement_at
+                """,
+                (item["product_id"], shop_id, item["price_cents"], date),
+            )
+            AuditLogModel.create_with_cursor(
+                cursor=cur,
+                action="SALE_ADD",
+                entity_type="Sale",
+                entity_id=sale_id,
+                shop_id=shop_id,
+                product_id=item["product_id"],
+                user_id=ACTOR["user_id"],
+                username=ACTOR["username"],
+                details=f"{item['name']}: stock {old_stock} -> {old_stock - item['qty']}",
+            )
+    return sale_id
+
+
+def make_invoices(product_ids, n_invoices, lines, seed=7):
+    rng = random.Random(seed)
+    invoices = []
+    for _ in range(n_invoices):
+        items = []
+        for pid in rng.sample(product_ids, lines):
+            qty = rng.randint(1, 5)
+            price_cents = rng.randint(100, 15_000)
+            items.append({
+                "product_id": pid,
+                "name": f"Product {pid:06d}",
+                "price_cents": price_cents,
+                "qty": qty,
+                "subtotal_cents": qty * price_cents,
+            })
+        invoices.append(items)
+    return invoices
+
+
+def run(create, invoices):
+    start = time.perf_counter()
+    for items in invoices:
+        create(items)
+    return time.perf_counter() - start
+
+
+def main():
+    n_invoices = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    lines = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    fresh_database()
+    product_ids = seed_catalog(max(1000, lines), purchases_per_product=1)
+    invoices = make_invoices(product_ids, n_invoices, lines)
+    now = datetime.now().isoformat()
+
+    legacy_s = run(lambda items: legacy_create_sale(1, now, items), invoices)
+    batched_s = run(
+        lambda items: SaleModel.create_sale(1, now, items, actor=ACTOR), invoices
+    )
+
+    sold = {}
+    for items in invoices:
+        for item in items:
+            sold[item["product_id"]] = sold.get(item["product_id"], 0) + item["qty"]
+    for pid, qty in sold.items():
+        assert StockModel.get_quantity(pid, 1) == 1_000_000 - 2 * qty, pid
+
+    print(f"{n_invoices} invoices x {lines} lines, shop 1")
+    report("per-line statements", legacy_s,
+           f"{legacy_s / n_invoices * 1000:.2f} ms/invoice")
+    report("batched create_sale", batched_s,
+           f"{batched_s / n_invoices * 1000:.2f} ms/invoice, "
+           f"x{legacy_s / batched_s:.1f} faster")
+
+
+if __name__ == "__main__":
+    main()
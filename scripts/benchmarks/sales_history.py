@@ -0,0 +1,85 @@
+# Sales history: time until the window can show a range, for the previous
+# approach (every sale fetched, each date formatted in Python, one
+# QTableWidgetItem per cell) vs the first keyset page in the lazily
+# formatted SalesTableModel. Also reports the cost of walking every page,
+# which should stay flat page to page. Runs offscreen.
+#
+#   python -m scripts.benchmarks.sales_history [n_sales]
+import os
+import sys
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from scripts.benchmarks._common import best_of, fresh_database, report, seed_catalog
+
+from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import QApplication, QTableView, QTableWidget, QTableWidgetItem
+
+from app.models.sale_model import SaleModel
+from app.utils.money import format_money
+from app.views.show_sales_window import SalesTableModel
+
+START, END = "2024-01-01", "2024-12-31"
+
+
+def full_table(app, table):
+    sales = SaleModel.get_sales_by_shop_and_date(1, START, END)
+    table.setRowCount(len(sales))
+    for row, sale in enumerate(sales):
+        table.setItem(row, 0, QTableWidgetItem(str(sale["sale_id"])))
+        table.setItem(row, 1, QTableWidgetItem(sale["date"]))
+        total_item = QTableWidgetItem(format_money(sale["grand_total_cents"]))
+        total_item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+        table.setItem(row, 2, total_item)
+    app.processEvents()
+    return len(sales)
+
+
+def first_page(app, model):
+    model.reset()
+    model.fetchMore()
+    app.processEvents()
+    return model.rowCount()
+
+
+def all_pages():
+    pages, after = 0, None
+    while True:
+        rows = SaleModel.get_sales_page(1, START, END, after)
+        pages += 1
+        if len(rows) < 200:
+            return pages
+        after = (rows[-1][1], rows[-1][0])
+
+
+def main():
+    n_sales = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    fresh_database()
+    seed_catalog(200, purchases_per_product=1, sales=n_sales, lines_per_sale=1, days=365)
+    app = QApplication(sys.argv)
+
+    table = QTableWidget(0, 3)
+    table.resize(950, 500)
+    table.show()
+
+    # Synchronous pages here, so the timing is the query plus the insert.
+    model = SalesTableModel(
+        lambda after: model.append_page(SaleModel.get_sales_page(1, START, END, after))
+    )
+    view = QTableView()
+    view.setModel(model)
+    view.resize(950, 500)
+    view.show()
+
+    full_s, shown = best_of(lambda: full_table(app, table))
+    page_s, first_rows = best_of(lambda: first_page(app, model))
+    walk_s, pages = best_of(all_pages, repeat=1)
+
+    print(f"{n_sales} sales in shop 1, one year")
+    report(f"all {shown} rows fetched + formatted", full_s)
+    report(f"first page ({first_rows} rows), lazy format", page_s, f"x{full_s / page_s:.0f} faster")
+    report(f"every page ({pages} pages)", walk_s, f"{walk_s / pages * 1000:.2f} ms/page")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+# Cold start: time from interpreter start to the painted login window, for
+# the previous startup (every dashboard and window module imported up
+# front, database initialised before the login window is built) vs the
+# current one (lazy window registry, database initialised after the first
+# paint). Every run is a fresh process against an already-migrated database,
+# like a normal till start. Runs offscreen.
+#
+#   python -m scripts.benchmarks.startup [runs]
+import os
+import subprocess
+import sys
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from scripts.benchmarks._common import fresh_database, report
+
+EAGER_MODULES = (
+    "app.views.admin_dashboard", "app.views.staff_dashboard",
+    "app.views.add_product_window", "app.views.edit_product_window",
+    "app.views.adjust_stock_window", "app.views.add_sale_window",
+    "app.views.add_purchase_window", "app.views.show_sales_window",
+    "app.views.profit_report_window", "app.views.weekly_profit_window",
+    "app.views.staff_management_window", "app.views.audit_log_window",
+    "app.views.shop_management_window",
+)
+
+
+def child(mode, started):
+    from importlib import import_module
+    from PyQt5.QtWidgets import QApplication
+    from app.db.database_init import initialize_database
+    from app.views.login_window import LoginWindow
+
+    if mode == "eager":
+        for name in EAGER_MODULES:
+            import_module(name)
+    imported = time.time()
+
+    if mode == "eager":
+        initialize_database()
+    app = QApplication(sys.argv)
+    window = LoginWindow(lambda user: None)
+    window.show()
+    app.processEvents()
+    painted = time.time()
+    if mode == "lazy":
+        initialize_database()
+    ready = time.time()
+    print(imported - started, painted - started, ready - started)
+
+
+def run(mode):
+    out = subprocess.run(
+        [sys.executable, "-m", "scripts.benchmarks.startup", "--child", mode, repr(time.time())],
+        capture_output=True, text=True, check=True,
+    ).stdout
+    return [float(v) for v in out.strip().splitlines()[-1].split()]
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "--child":
+        child(sys.argv[2], float(sys.argv[3]))
+        return
+
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    fresh_database()
+    results = {}
+    for mode in ("eager", "lazy"):
+        results[mode] = min((run(mode) for _ in range(runs)), key=lambda r: r[1])
+
+    eager, lazy = results["eager"], results["lazy"]
+    print(f"best of {runs} fresh processes, times since process launch")
+    report("eager imports done", eager[0])
+    report("lazy imports done", lazy[0])
+    report("eager login window painted", eager[1])
+    report("lazy login window painted", lazy[1], f"{(eager[1] - lazy[1]) * 1000:.0f} ms sooner")
+    report("eager database ready", eager[2])
+    report("lazy database ready", lazy[2])
+
+
+if __name__ == "__main__":
+    main()
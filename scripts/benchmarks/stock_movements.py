@@ -0,0 +1,104 @@
+# Stock movement history from the audit log: regex-parsing the details text
+# of every sale / purchase / adjustment entry (the only option before the
+# typed stock columns) vs AuditLogModel.get_stock_movements, for one product
+# and for a whole shop. Also times the background backfill of the typed
+# columns from details, and its longest batch (what a live writer can wait
+# for).
+#
+#   python -m scripts.benchmarks.stock_movements [n_rows]
+import sys
+import time
+
+from scripts.benchmarks._common import best_of, fresh_database, report
+from scripts.benchmarks.audit_search import seed_audit_rows
+
+from app.db.database_init import db
+from app.models.audit_log_model import AuditLogModel
+from app.models.audit_stock_backfill import AuditStockBackfill, parse_stock_details
+
+PRODUCT_ID = 4321
+
+
+def parsed_movements(product_id=None):
+    sql = """
+        SELECT audit_id, created_at, action, product_id, details
+        FROM AuditLogs
+        WHERE shop_id = 1 AND action IN ('SALE_ADD', 'PURCHASE_ADD', 'STOCK_ADJUST')
+    """
+    params = ()
+    if product_id is not None:
+        sql += " AND product_id = ?"
+        params = (product_id,)
+    with db.connection() as conn:
+        rows = conn.execute(sql, params).fetchall()
+    movements = []
+    for audit_id, created_at, action, pid, details in rows:
+        fields = parse_stock_details(action, details)
+        if fields:
+            movements.append((pid, created_at, audit_id, action, *fields))
+    movements.sort()
+    return movements
+
+
+def parsed_totals():
+    totals = {}
+    for pid, _, _, action, qty, _, before, after in parsed_movements():
+        t = totals.setdefault(pid, [0, 0, 0, 0, 0])
+        t[0] += 1
+        if action == "SALE_ADD":
+            t[1] += qty
+        elif action == "PURCHASE_ADD":
+            t[2] += qty
+        else:
+            t[3] += after - before
+        t[4] += after - before
+    return totals
+
+
+def main():
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    fresh_database()
+    seed_audit_rows(n_rows)
+
+    # Seeded rows have no typed columns, like those of an upgraded database.
+    with db.transaction() as conn:
+        conn.execute("DELETE FROM AuditStockBackfill")
+        conn.execute("INSERT INTO AuditStockBackfill SELECT MIN(audit_id), MAX(audit_id) FROM AuditLogs")
+    filled = 0
+    longest = 0
+    start = time.perf_counter()
+    while True:
+        batch_start = time.perf_counter()
+        count = AuditStockBackfill.fill_batch()
+        if count is None:
+            break
+        longest = max(longest, time.perf_counter() - batch_start)
+        filled += count
+    report("backfill typed columns from details", time.perf_counter() - start,
+           f"{filled} of {n_rows} rows")
+    report("backfill, longest batch", longest)
+
+    parsed_time, parsed = best_of(lambda: parsed_movements(PRODUCT_ID))
+    typed_time, typed = best_of(lambda: AuditLogModel.get_stock_movements(1, PRODUCT_ID))
+    assert len(parsed) == len(typed)
+    report("one product, parse details", parsed_time, f"{len(parsed)} movements")
+    report("one product, typed columns", typed_time,
+           f"{parsed_time / typed_time:.0f}x the speed")
+
+    parsed_time, parsed = best_of(parsed_movements)
+    typed_time, typed = best_of(lambda: AuditLogModel.get_stock_movements(1))
+    assert len(parsed) == len(typed)
+    report("whole shop, parse details", parsed_time, f"{len(parsed)} movements")
+    report("whole shop, typed columns", typed_time,
+           f"{parsed_time / typed_time:.1f}x the speed")
+
+    parsed_time, parsed = best_of(parsed_totals)
+    typed_time, typed = best_of(lambda: AuditLogModel.get_stock_movement_totals(1))
+    assert parsed == {row[0]: list(row[1:]) for row in typed}
+    report("per-product totals, parse details", parsed_time, f"{len(parsed)} products")
+    report("per-product totals, typed columns", typed_time,
+           f"{parsed_time / typed_time:.0f}x the speed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+# Window open time: construct, show and paint each themed window against a
+# small seeded database, best of N runs. The application stylesheet is set
+# once up front, as app.main does. Runs offscreen.
+#
+#   python -m scripts.benchmarks.window_open [runs]
+import os
+import sys
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from scripts.benchmarks._common import fresh_database, report, seed_catalog
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    fresh_database()
+    seed_catalog(50, purchases_per_product=1, sales=20)
+
+    from PyQt5.QtWidgets import QApplication
+    from app.views.theme import apply_theme
+    from app.views.window_registry import window_class
+    from app.views.sale_details_window import SaleDetailsWindow
+
+    app = QApplication(sys.argv)
+    apply_theme(app)
+
+    windows = {
+        "admin dashboard": lambda: window_class("admin_dashboard")({"role": "admin"}),
+        "staff dashboard": lambda: window_class("staff_dashboard")(
+            {"permissions": ["add_sale", "show_sales"]}
+        ),
+        "sales history": lambda: window_class("show_sales")(),
+        "profit report": lambda: window_class("profit_report")(),
+        "weekly profit": lambda: window_class("weekly_profit")(),
+        "audit logs": lambda: window_class("audit_logs")(),
+        "sale details": lambda: SaleDetailsWindow(1),
+    }
+
+    print(f"best of {runs} opens, construct + show + first paint")
+    total = 0
+    for name, make in windows.items():
+        best = None
+        for _ in range(runs):
+            start = time.perf_counter()
+            window = make()
+            window.show()
+            app.processEvents()
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+            window.close()
+            window.deleteLater()
+            app.processEvents()
+        total += best
+        report(name, best)
+    report("all windows", total)
+
+
+if __name__ == "__main__":
+    main()
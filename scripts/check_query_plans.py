@@ -0,0 +1,107 @@
+# EXPLAIN QUERY PLAN regression check for the hot read paths.
+#
+# Runs each hot model call against a throwaway database, captures the SQL it
+# actually executes, and fails (exit 1) if any statement plans a full scan of
+# a real table. CTEs and subqueries are ignored, they are scanned by design,
+# and so are full-text lookups, which the plan reports as a virtual table
+# scan.
+#
+#   python -m scripts.check_query_plans
+import os
+import re
+import sys
+import tempfile
+
+os.environ["LOCALAPPDATA"] = tempfile.mkdtemp(prefix="inventory-plans-")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.db.database_init import db, initialize_database  # noqa: E402
+from app.models.audit_archive import AuditArchive  # noqa: E402
+from app.models.audit_log_model import AuditLogModel  # noqa: E402
+from app.controllers.dashboard_controller import DashboardController  # noqa: E402
+from app.models.profit_report_model import ProfitReportModel  # noqa: E402
+from app.models.purchase_model import PurchaseModel  # noqa: E402
+from app.models.sale_details_model import SaleDetailsModel  # noqa: E402
+from app.models.sale_model import SaleModel  # noqa: E402
+from app.models.stock_model import StockModel  # noqa: E402
+from app.models.weekly_profit_model import WeeklyProfitModel  # noqa: E402
+
+HOT_QUERIES = {
+    "dashboard products": lambda: DashboardController().get_products_for_shop(1),
+    "sales by shop and date": lambda: SaleModel.get_sales_by_shop_and_date(1, "2024-01-01", "2024-12-31"),
+    "sales page": lambda: SaleModel.get_sales_page(1, "2024-01-01", "2024-12-31"),
+    "sales page, next": lambda: SaleModel.get_sales_page(
+        1, "2024-01-01", "2024-12-31", after=("2024-06-01T12:00:00", 10)),
+    "sale items": lambda: SaleDetailsModel.get_sale_items(1),
+    "profit report": lambda: ProfitReportModel.get_profit_report(1, "2024-01-01", "2024-12-31"),
+    "weekly profit": lambda: WeeklyProfitModel.get_weekly_profit(1, "2024-01-01", "2024-12-31"),
+    "weekly profit, all time": lambda: WeeklyProfitModel.get_weekly_profit(1),
+    "last purchase price": lambda: PurchaseModel.last_price(1, 1),
+    "average cost": lambda: PurchaseModel.avg_price(1, 1),
+    "last sale price": lambda: SaleModel.last_price(1, 1),
+    "stock quantity": lambda: StockModel.get_quantity(1, 1),
+    "audit log search": lambda: AuditLogModel.get_logs(limit=1000, query="cola stock"),
+    "audit log filters": lambda: AuditLogModel.get_facets(refresh=True),
+    "audit log archive": lambda: AuditArchive.archive_before("2000-01-01"),
+    "stock movements": lambda: AuditLogModel.get_stock_movements(1, 1, "2024-01-01", "2024-12-31"),
+    "stock movements, shop": lambda: AuditLogModel.get_stock_movements(1, None, "2024-01-01", "2024-12-31"),
+    "stock movement totals": lambda: AuditLogModel.get_stock_movement_totals(1, "2024-01-01", "2024-12-31"),
+}
+
+SCAN_RE = re.compile(r"^SCAN (\S+)")
+CTE_RE = re.compile(r"(\w+)\s+AS\s*\(", re.IGNORECASE)
+FTS_SHADOW_RE = re.compile(r"FROM '\w+'\.'\w+_(config|data|idx|docsize|content)'")
+
+
+def capture_sql(call):
+    statements = []
+    with db.connection() as conn:
+        conn.set_trace_callback(statements.append)
+        try:
+            call()
+        finally:
+            conn.set_trace_callback(None)
+    # FTS5 reads its own shadow tables ('main'.'AuditLogSearch_config', ...)
+    # when it reloads the index; those are not the app's queries.
+    return [
+        s for s in statements
+        if s.lstrip().upper().startswith(("SELECT", "WITH")) and not FTS_SHADOW_RE.search(s)
+    ]
+
+
+def full_scans(sql):
+    ctes = {name.lower() for name in CTE_RE.findall(sql)}
+    with db.connection() as conn:
+        plan = conn.execute("EXPLAIN QUERY PLAN " + sql).fetchall()
+    problems = []
+    for _, _, _, detail in plan:
+        match = SCAN_RE.match(detail)
+        if not match:
+            continue
+        target = match.group(1)
+        if target.startswith("(") or target.lower() in ctes:
+            continue
+        if "VIRTUAL TABLE INDEX" in detail:
+            continue
+        problems.append(detail)
+    return problems
+
+
+def main():
+    initialize_database()
+    failures = 0
+    for name, call in HOT_QUERIES.items():
+        for sql in capture_sql(call):
+            problems = full_scans(sql)
+            status = "FULL SCAN" if problems else "ok"
+            print(f"{status:<9} {name}")
+            for detail in problems:
+                print(f"          {detail}")
+            failures += bool(problems)
+    if failures:
+        print(f"{failures} hot statement(s) fall back to a full table scan")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+# Tests run against a throwaway data folder (never the real app.db) and an
+# offscreen Qt platform. Both must be set before any app module is imported.
+import os
+import sys
+import tempfile
+import time
+
+os.environ["LOCALAPPDATA"] = tempfile.mkdtemp(prefix="inventory-tests-")
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest  # noqa: E402
+
+from app.db.database_init import initialize_database  # noqa: E402
+
+initialize_database()
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    from PyQt5.QtWidgets import QApplication
+
+    return QApplication.instance() or QApplication([])
+
+
+def wait_until(app, condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        app.processEvents()
+        time.sleep(0.01)
+    return True
@@ -0,0 +1,56 @@
+from PyQt5.QtCore import QEvent
+from PyQt5.QtWidgets import QComboBox, QLineEdit, QSpinBox
+
+from app.views.add_purchase_window import (
+    PRICE_COLUMN, PRODUCT_COLUMN, QTY_COLUMN, AddPurchaseWindow
+)
+
+
+def test_rows_are_model_lines_without_widgets_per_row(qapp):
+    window = AddPurchaseWindow()
+    window.show()
+    for _ in range(20):
+        window.add_row()
+    qapp.sendPostedEvents(None, QEvent.DeferredDelete)
+
+    assert window.lines_model.rowCount() == 20
+    assert len(window.table.findChildren(QComboBox)) <= 1
+    assert not window.table.findChildren(QSpinBox)
+    window.close()
+
+
+def test_edits_update_the_controller_rows_and_total(qapp):
+    window = AddPurchaseWindow()
+    window.add_row()
+    window.add_row()
+    model = window.lines_model
+
+    model.setData(model.index(0, PRODUCT_COLUMN), " Window Cola ")
+    model.setData(model.index(0, QTY_COLUMN), 3)
+    model.setData(model.index(0, PRICE_COLUMN), "1.25")
+    model.setData(model.index(1, PRICE_COLUMN), "2.00")
+    assert window.controller.get_rows()[0] == {"name": "Window Cola", "qty": 3, "price_cents": 125}
+    assert window.total_label.text() == "Grand Total: 5.75"
+
+    window.remove_row(0)
+    assert model.rowCount() == 1
+    assert model.index(0, PRICE_COLUMN).data() == "2.00"
+    assert window.total_label.text() == "Grand Total: 2.00"
+    window.close()
+
+
+def test_price_editor_rejects_negative_and_non_numeric_input(qapp):
+    window = AddPurchaseWindow()
+    window.show()
+    window.add_row()
+    index = window.lines_model.index(0, PRICE_COLUMN)
+    window.table.setCurrentIndex(index)
+    editor = window.table.focusWidget()
+
+    assert isinstance(editor, QLineEdit)
+    editor.insert("-1")
+    editor.insert("abc")
+    editor.insert("4.5")
+    window.table.setCurrentIndex(window.lines_model.index(0, QTY_COLUMN))
+    assert window.controller.get_rows()[0]["price_cents"] == 450
+    window.close()
@@ -0,0 +1,57 @@
+import sqlite3
+
+import pytest
+
+from app.db.database_init import db
+from app.models.audit_log_model import AuditLogModel
+
+
+def log_with_cursor(conn, action):
+    AuditLogModel.create_with_cursor(conn.cursor(), action, "Test", username="facet-user")
+
+
+def test_committed_entry_is_listed():
+    AuditLogModel.get_facets()
+    AuditLogModel.log("FACET_COMMITTED", "Test", username="facet-user")
+    assert "FACET_COMMITTED" in AuditLogModel.get_facets()["action"]
+
+
+def test_rolled_back_entry_is_not_listed():
+    AuditLogModel.get_facets()
+    with pytest.raises(RuntimeError):
+        with db.transaction() as conn:
+            log_with_cursor(conn, "FACET_ROLLED_BACK")
+            assert "FACET_ROLLED_BACK" not in AuditLogModel.get_facets()["action"]
+            raise RuntimeError("abort")
+    assert "FACET_ROLLED_BACK" not in AuditLogModel.get_facets()["action"]
+
+
+def test_entry_in_rolled_back_savepoint_is_not_listed():
+    AuditLogModel.get_facets()
+    with db.transaction() as conn:
+        log_with_cursor(conn, "FACET_OUTER")
+        with pytest.raises(RuntimeError):
+            with db.transaction() as inner:
+                log_with_cursor(inner, "FACET_INNER")
+                raise RuntimeError("abort")
+    actions = AuditLogModel.get_facets()["action"]
+    assert "FACET_OUTER" in actions
+    assert "FACET_INNER" not in actions
+
+
+def test_failed_insert_is_not_listed():
+    AuditLogModel.get_facets()
+    with db.transaction() as conn:
+        with pytest.raises(sqlite3.IntegrityError):
+            AuditLogModel.create_with_cursor(conn.cursor(), "FACET_FAILED", None)
+    assert "FACET_FAILED" not in AuditLogModel.get_facets()["action"]
+
+
+def test_refresh_drops_values_whose_rows_are_gone():
+    AuditLogModel.log("FACET_DELETED", "Test", username="facet-deleted-user")
+    assert "FACET_DELETED" in AuditLogModel.get_facets()["action"]
+    with db.transaction() as conn:
+        conn.execute("DELETE FROM AuditLogs WHERE action = 'FACET_DELETED'")
+    facets = AuditLogModel.get_facets(refresh=True)
+    assert "FACET_DELETED" not in facets["action"]
+    assert "facet-deleted-user" not in facets["username"]
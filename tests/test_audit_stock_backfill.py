@@ -0,0 +1,87 @@
+from app.db import migrations
+from app.db.connection_manager import ConnectionManager
+from app.db.database_init import db
+from app.models.audit_stock_backfill import AuditStockBackfill
+
+LEGACY_ENTRIES = [
+    ("SALE_ADD", "Cola: qty=3, sale_price=2.50, stock 10 -> 7"),
+    ("USER_DEACTIVATE", "Deactivated user 'bob'"),
+    ("PURCHASE_ADD", "Cola: qty=5, unit_price=1.25, stock 7 -> 12"),
+    ("SALE_ADD", "written by hand"),
+    ("STOCK_ADJUST", "Cola: 12 -> 9"),
+]
+
+
+def insert_legacy(conn):
+    ids = []
+    for action, details in LEGACY_ENTRIES:
+        cur = conn.execute(
+            "INSERT INTO AuditLogs (action, entity_type, details, created_at) "
+            "VALUES (?, 'Test', ?, '2024-01-01T00:00:00')",
+            (action, details),
+        )
+        ids.append(cur.lastrowid)
+    return ids
+
+
+def typed_fields(ids):
+    with db.connection() as conn:
+        return [
+            conn.execute(
+                "SELECT qty, unit_price_cents, stock_before, stock_after "
+                "FROM AuditLogs WHERE audit_id = ?",
+                (audit_id,),
+            ).fetchone()
+            for audit_id in ids
+        ]
+
+
+def test_migration_records_stock_entries_instead_of_parsing_them(tmp_path, monkeypatch):
+    manager = ConnectionManager(str(tmp_path / "app.db"))
+    monkeypatch.setattr(migrations, "MIGRATIONS", migrations.MIGRATIONS[:6])
+    monkeypatch.setattr(migrations, "SCHEMA_VERSION", 6)
+    migrations.migrate(manager, verbose=False)
+    with manager.transaction() as conn:
+        ids = insert_legacy(conn)
+    monkeypatch.undo()
+
+    migrations.migrate(manager, verbose=False)
+    with manager.connection() as conn:
+        assert conn.execute("SELECT next_id, end_id FROM AuditStockBackfill").fetchall() == [
+            (ids[0], ids[-1])
+        ]
+        assert conn.execute(
+            "SELECT COUNT(*) FROM AuditLogs WHERE stock_after IS NOT NULL"
+        ).fetchone()[0] == 0
+    manager.close_all()
+
+
+def test_backfill_fills_the_recorded_range_in_batches():
+    with db.transaction() as conn:
+        ids = insert_legacy(conn)
+        conn.execute("DELETE FROM AuditStockBackfill")
+        conn.execute(
+            "INSERT INTO AuditStockBackfill (next_id, end_id) VALUES (?, ?)",
+            (ids[0], ids[-1]),
+        )
+
+    assert AuditStockBackfill.pending() == (ids[0], ids[-1])
+    assert AuditStockBackfill.fill_batch(batch=2) == 2
+    assert AuditStockBackfill.pending() == (ids[2] + 1, ids[-1])
+    assert typed_fields(ids[3:]) == [(None, None, None, None)] * 2
+
+    filled = 0
+    while True:
+        count = AuditStockBackfill.fill_batch(batch=2)
+        if count is None:
+            break
+        filled += count
+    assert filled == 1
+    assert AuditStockBackfill.pending() is None
+    assert typed_fields(ids) == [
+        (3, 250, 10, 7),
+        (None, None, None, None),
+        (5, 125, 7, 12),
+        (None, None, None, None),
+        (None, None, 12, 9),
+    ]
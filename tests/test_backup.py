@@ -0,0 +1,103 @@
+import os
+import sqlite3
+import threading
+
+from app.controllers.backup_controller import BackupController
+from app.db.database_init import DB_PATH, db
+from app.models.audit_archive import ARCHIVE_DIR, AuditArchive
+from app.models.audit_log_model import AuditLogModel
+
+
+def add_shop(name):
+    with db.transaction() as conn:
+        conn.execute("INSERT INTO Shops (shop_name) VALUES (?)", (name,))
+
+
+def shop_names(path):
+    conn = sqlite3.connect(path)
+    try:
+        return {row[0] for row in conn.execute("SELECT shop_name FROM Shops")}
+    finally:
+        conn.close()
+
+
+def test_backup_includes_commits_still_in_the_wal():
+    # A reader on an older snapshot keeps a checkpoint from moving the new
+    # commit into app.db.
+    reader = sqlite3.connect(DB_PATH, isolation_level=None)
+    try:
+        reader.execute("BEGIN")
+        reader.execute("SELECT COUNT(*) FROM Shops").fetchone()
+        add_shop("Backup WAL shop")
+        result = db.checkpoint()
+        assert result["checkpointed_frames"] < result["wal_frames"]
+        path = BackupController.backup_forced()
+    finally:
+        reader.close()
+    assert "Backup WAL shop" in shop_names(path)
+
+
+def test_backup_if_changed_skips_an_unchanged_database():
+    add_shop("Backup changed shop")
+    first = BackupController.backup_if_changed()
+    assert first and "Backup changed shop" in shop_names(first)
+    assert BackupController.backup_if_changed() is None
+    assert not [name for name in os.listdir(BackupController.BACKUP_DIR) if name.endswith(".tmp")]
+
+    add_shop("Backup changed again")
+    second = BackupController.backup_if_changed()
+    assert second and "Backup changed again" in shop_names(second)
+
+
+def test_restore_backup_replaces_the_data_for_every_thread():
+    add_shop("Before restore")
+    path = BackupController.backup_forced()
+    add_shop("After backup")
+
+    seen = []
+    ready = threading.Event()
+    restored = threading.Event()
+
+    def other_thread():
+        with db.connection() as conn:
+            conn.execute("SELECT 1")
+        ready.set()
+        restored.wait(5)
+        with db.connection() as conn:
+            seen.extend(row[0] for row in conn.execute("SELECT shop_name FROM Shops"))
+        db.close_thread()
+
+    thread = threading.Thread(target=other_thread)
+    thread.start()
+    ready.wait(5)
+    BackupController.restore_backup(path)
+    restored.set()
+    thread.join()
+
+    assert "Before restore" in seen and "After backup" not in seen
+    assert shop_names(DB_PATH) == set(seen)
+
+
+def archive_entry(created_at, cutoff):
+    with db.transaction() as conn:
+        AuditLogModel.create_many_with_cursor(conn.cursor(), [
+            {"action": "ARCHIVE_TEST", "entity_type": "Test", "created_at": created_at},
+        ])
+    assert AuditArchive.archive_before(cutoff) == 1
+
+
+def test_backup_and_restore_carry_the_audit_archive():
+    archive_entry("2001-01-05T10:00:00", "2001-02-01")
+    path = BackupController.backup_forced()
+    archive_entry("2001-03-05T10:00:00", "2001-04-01")
+    assert {"2001-01", "2001-03"} <= set(AuditArchive.months())
+
+    BackupController.restore_backup(path)
+    assert "2001-01" in AuditArchive.months()
+    assert "2001-03" not in AuditArchive.months()
+    assert AuditArchive.get_logs("2001-01")[0]["action"] == "ARCHIVE_TEST"
+    set_aside = [
+        name for name in os.listdir(os.path.dirname(ARCHIVE_DIR))
+        if name.startswith("audit_archive_before_restore_")
+    ]
+    assert set_aside
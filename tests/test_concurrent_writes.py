@@ -0,0 +1,67 @@
+import threading
+
+from app.controllers.purchase_controller import PurchaseController
+from app.db.database_init import db
+from app.models.audit_log_model import AuditLogModel
+from app.models.audit_log_writer import AuditLogWriter
+
+
+def audit_count(action):
+    with db.connection() as conn:
+        return conn.execute(
+            "SELECT COUNT(*) FROM AuditLogs WHERE action = ?", (action,)
+        ).fetchone()[0]
+
+
+def run_threads(n_threads, work):
+    errors = []
+
+    def guarded(i):
+        try:
+            work(i)
+        except Exception as e:
+            errors.append(e)
+        finally:
+            db.close_thread()
+
+    threads = [threading.Thread(target=guarded, args=(i,)) for i in range(n_threads)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return errors
+
+
+def test_writers_do_not_fail_while_audit_writer_flushes():
+    # Each thread's first write runs on a freshly opened connection while
+    # the background writer keeps committing batches.
+    writer = AuditLogWriter(db, max_batch=20)
+    writer.start()
+    stop = threading.Event()
+
+    def keep_logging():
+        while not stop.is_set():
+            writer.log("TEST_BACKGROUND", "Test", details="background")
+
+    background = threading.Thread(target=keep_logging)
+    background.start()
+    try:
+        def log_entries(i):
+            for n in range(50):
+                AuditLogModel.log("TEST_SYNC", "Test", details=f"thread {i} entry {n}")
+
+        def save_purchases(i):
+            for n in range(25):
+                purchase = PurchaseController({"user_id": 1, "username": "admin"})
+                purchase.add_row(f"Concurrent Product {i}", 1, 100)
+                purchase.save_purchase(1)
+
+        errors = run_threads(4, log_entries) + run_threads(4, save_purchases)
+    finally:
+        stop.set()
+        background.join()
+        writer.stop()
+
+    assert errors == []
+    assert audit_count("TEST_SYNC") == 4 * 50
+    assert audit_count("PURCHASE_ADD") >= 4 * 25
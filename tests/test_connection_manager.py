@@ -0,0 +1,33 @@
+import sqlite3
+import threading
+
+import pytest
+
+from app.db.connection_manager import ConnectionManager
+from app.db.database_init import DB_PATH
+
+
+def test_close_all_leaves_a_connection_in_use_to_its_thread():
+    manager = ConnectionManager(DB_PATH)
+    entered = threading.Event()
+    closed = threading.Event()
+    results = []
+
+    def reader():
+        with manager.connection() as conn:
+            entered.set()
+            closed.wait(5)
+            results.append(conn.execute("SELECT COUNT(*) FROM Shops").fetchone()[0])
+        results.append(conn)
+
+    thread = threading.Thread(target=reader)
+    thread.start()
+    entered.wait(5)
+    manager.close_all()
+    closed.set()
+    thread.join()
+
+    count, conn = results
+    assert count >= 0
+    with pytest.raises(sqlite3.ProgrammingError):
+        conn.execute("SELECT 1")
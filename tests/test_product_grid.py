@@ -0,0 +1,53 @@
+from app.controllers.product_controller import ProductController
+from app.controllers.purchase_controller import PurchaseController
+from app.views.product_grid import ProductTableModel
+
+from conftest import wait_until
+
+
+def product_row(product_id, name, quantity=0):
+    return {
+        "product_id": product_id,
+        "product_name": name,
+        "quantity": quantity,
+        "avg_cost_cents": None,
+        "last_purchase_cents": None,
+        "last_sale_cents": None,
+        "profit_cents": None,
+    }
+
+
+def test_partial_update_fills_empty_model(qapp):
+    model = ProductTableModel()
+    model.update_products([product_row(7, "Cola", 3)], partial=True)
+
+    assert model.rowCount() == 1
+    assert model.has_product(7)
+
+
+def test_partial_update_without_rows_keeps_empty_model(qapp):
+    model = ProductTableModel()
+    model.update_products([], partial=True)
+
+    assert model.rowCount() == 0
+
+
+def test_dashboard_shows_products_added_to_empty_shop(qapp):
+    from app.views.admin_dashboard import AdminDashboard
+
+    dashboard = AdminDashboard({"role": "admin", "user_id": 1, "username": "admin"})
+    shop_index = dashboard.shop_combo.count() - 1
+    dashboard.shop_combo.setCurrentIndex(shop_index)
+    shop_id = dashboard.shop_combo.currentData()
+    model = dashboard.table.product_model
+    assert wait_until(qapp, lambda: not dashboard.loader.busy)
+    assert model.rowCount() == 0
+
+    ProductController().create_product("Empty Shop Cola", [shop_id])
+    assert wait_until(qapp, lambda: model.rowCount() == 1)
+
+    purchase = PurchaseController()
+    purchase.add_row("Empty Shop Fries", 5, 75)
+    purchase.save_purchase(shop_id)
+    assert wait_until(qapp, lambda: model.rowCount() == 2)
+    dashboard.close()